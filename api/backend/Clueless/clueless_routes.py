@@ -1,5 +1,20 @@
-from flask import Blueprint, jsonify, request
-from backend.db_connection import db
+import json
+import time
+from datetime import datetime
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from backend.db_connection import db, ids, query_stats
+from backend.cache import cache
+from backend.metrics import metrics
+from backend.Clueless.existence import first_missing
+from backend.Clueless.pagination import BadPageRequest, page_args, page_response
+from backend.analytics import engagement, popularity, rollups
+from backend.analytics.demand import demand_index
+from backend.matching.aesthetics import aesthetic_index
+from backend.matching.inventory import inventory_matcher
+from backend.matching.outfits import add_item_names, outfit_index
+from backend.ml_models import model01
+from backend.ml_models.registry import registry
+import numpy as np
 from mysql.connector import Error
 from flask import current_app
 
@@ -7,6 +22,7 @@ analytics = Blueprint('analytics', __name__)
 business = Blueprint('business', __name__)
 customer = Blueprint('customer', __name__)
 general = Blueprint('general', __name__)
+prediction = Blueprint('prediction', __name__)
 
 @general.route('/', methods=['GET'])
 def health_check():
@@ -23,9 +39,7 @@ def create_outfit():
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT MAX(OutfitId) FROM Outfit")
-        res = cursor.fetchone()
-        new_id = (res['MAX(OutfitId)'] or 400) + 1
+        new_id = ids.next_id("Outfit")
         query = """
         INSERT INTO Outfit (OutfitID, Nickname, Description)
         VALUES (%s, %s, %s)
@@ -39,6 +53,7 @@ def create_outfit():
             )
         )
         db.get_db().commit()
+        cache.invalidate("outfits")
         cursor.close()
         return (
             jsonify({"message": "Outfit created successfully", "OutfitID": new_id}),
@@ -48,13 +63,14 @@ def create_outfit():
         return jsonify({"error": str(e)}), 500
 
 @general.route("/outfits/<int:aesthetic_id>", methods=["GET"])
+@cache.cached(ttl=300, tags=["outfits", "aesthetics"])
 def search_outfits(aesthetic_id):
     try:
         cursor = db.get_db().cursor()
         #check for existance 
-        cursor.execute("SELECT * FROM Aesthetic WHERE AestheticID = %s", (aesthetic_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "Aesthetic not found"}), 404
+        missing = first_missing(cursor, ("Aesthetic", {"AestheticID": aesthetic_id}, "Aesthetic not found"))
+        if missing:
+            return jsonify({"error": missing}), 404
         #Query 
         cursor.execute("""
              SELECT o.OutfitID, o.Nickname, o.Description, a.Name AS AestheticName
@@ -73,15 +89,14 @@ def search_outfits(aesthetic_id):
 def delete_outfit(outfit_id):
     try:
         cursor = db.get_db().cursor()
-        #check for existances 
-        cursor.execute("SELECT * FROM CustomerClosetOutfits WHERE OutfitId = %s", (outfit_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "outfit not found"}), 404
-        #executes 
+        #executes (no rows deleted means the outfit was never in a closet)
         cursor.execute("""
             DELETE FROM CustomerClosetOutfits WHERE OutfitID = %s
-        """, (outfit_id))
+        """, (outfit_id,))
+        if cursor.rowcount == 0:
+            return jsonify({"error": "outfit not found"}), 404
         db.get_db().commit()
+        cache.invalidate("closet_outfits")
         cursor.close()
         return jsonify({"message": "Outfit removed", "deleted_data with id": outfit_id}), 200
     except Exception as e:
@@ -96,9 +111,7 @@ def create_clothing_item():
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT MAX(ItemId) FROM ClothingItem")
-        res = cursor.fetchone()
-        new_id = (res['MAX(ItemId)'] or 400) + 1
+        new_id = ids.next_id("ClothingItem")
         query = """
         INSERT INTO ClothingItem 
         (ItemID, ImageAddress, Name, Category, Price, Size, QualityRating, OutdatedFlag, PopularityPercentage)
@@ -117,6 +130,7 @@ def create_clothing_item():
             )
         )
         db.get_db().commit()
+        cache.invalidate("items")
         cursor.close()
         return (
            jsonify({"message": "Item created successfully", "ItemID": new_id}),
@@ -126,13 +140,14 @@ def create_clothing_item():
         return jsonify({"error": str(e)}), 500
     
 @general.route("/items/<int:aesthetic_id>", methods=["GET"])
+@cache.cached(ttl=120, tags=["items", "closet_outfits", "aesthetics"])
 def search_items(aesthetic_id):
     try:
         cursor = db.get_db().cursor()
         #check for existances 
-        cursor.execute("SELECT * FROM Aesthetic WHERE AestheticID = %s", (aesthetic_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "Aesthetic not found"}), 404
+        missing = first_missing(cursor, ("Aesthetic", {"AestheticID": aesthetic_id}, "Aesthetic not found"))
+        if missing:
+            return jsonify({"error": missing}), 404
         #query 
         cursor.execute("""
             SELECT ci.ItemID, ci.Name, ci.Price, ci.PopularityPercentage
@@ -152,9 +167,37 @@ def search_items(aesthetic_id):
         return jsonify({"error": str(e)}), 500
 
 
+# records that a clothing item was viewed; the body may name the viewer: {"customer_id": 13}
+@general.route("/items/<int:item_id>/views", methods=["POST"])
+def record_item_view(item_id):
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({"error": "the body must be a JSON object"}), 400
+        customer_id = data.get("customer_id")
+        if customer_id is not None and (isinstance(customer_id, bool) or not isinstance(customer_id, int)):
+            return jsonify({"error": "'customer_id' must be an integer"}), 400
+        cursor = db.get_db().cursor()
+        #check for existance 
+        checks = [("ClothingItem", {"ItemID": item_id}, "clothing item not found")]
+        if customer_id is not None:
+            checks.append(("Customer", {"CustomerID": customer_id}, "customer not found"))
+        missing = first_missing(cursor, *checks)
+        if missing:
+            return jsonify({"error": missing}), 404
+        engagement.record(cursor, "view", item_id, customer_id)
+        db.get_db().commit()
+        cursor.close()
+        return jsonify({"message": "View recorded", "ItemID": item_id}), 201
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# paginated with ?limit=N&after=<next_cursor>, ordered by CustomerID
 @general.route("/admin/users", methods=["GET"])
 def get_admin_users():
     try:
+        limit, after = page_args(start=[0])
         cursor = db.get_db().cursor()
         #query (no need to check for existance here)
         cursor.execute("""
@@ -162,12 +205,16 @@ def get_admin_users():
                    COUNT(DISTINCT cc.ClosetID) AS TotalClosets
             FROM Customer c
             LEFT JOIN CustomerCloset cc ON c.CustomerID = cc.CustomerID
+            WHERE c.CustomerID > %s
             GROUP BY c.CustomerID, c.FirstName, c.LastName, c.EmailAddress
             ORDER BY c.CustomerID
-        """)
+            LIMIT %s
+        """, (after[0], limit + 1))
         users = cursor.fetchall()
         cursor.close()
-        return jsonify(users), 200
+        return jsonify(page_response(users, limit, ["CustomerID"])), 200
+    except BadPageRequest as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -193,10 +240,34 @@ def get_admin_logs():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@general.route("/admin/db/pool", methods=["GET"])
+def get_db_pool_stats():
+    # stats are per API worker process, so this reports the worker that served the call
+    return jsonify(db.pool_stats() or {"message": "pool not started in this worker"}), 200
+
+@general.route("/metrics", methods=["GET"])
+def get_metrics():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+@general.route("/debug/queries", methods=["GET"])
+def get_query_stats():
+    # per-route SQL aggregates for this API worker; ?recent=true adds the
+    # statement log of the last requests it served
+    body = {"routes": query_stats.route_stats()}
+    if request.args.get("recent", "false").lower() == "true":
+        body["recent"] = query_stats.recent_requests()
+    return jsonify(body), 200
+
+@general.route("/admin/cache", methods=["GET"])
+def get_cache_stats():
+    # hit/miss counts are per API worker process
+    return jsonify(cache.stats()), 200
+
 
 # ----------- Analytics Routes -----------
 
 @analytics.route("/analytics/trend", methods=["GET"])
+@cache.cached(ttl=300, tags=["aesthetics"])
 def get_trends():
     try:
         cursor = db.get_db().cursor()
@@ -214,68 +285,150 @@ def get_trends():
     
 
 
+# growth of engagement events per item, category or aesthetic:
+# ?by=item|category|aesthetic&window=7d[&granularity=hour|day|week][&events=wear,view][&end=<UTC ISO time>][&limit=N]
+# Event writes do not invalidate it (a view on any item would empty it), so a
+# result can be up to 60 s stale; rebuilding the buckets drops the "engagement" tag
+@analytics.route("/analytics/growth", methods=["GET"])
+@cache.cached(ttl=60, tags=["engagement"])
+def get_growth():
+    try:
+        limit = min(max(int(request.args.get("limit", 10)), 1), 100)
+    except ValueError:
+        return jsonify({"error": "'limit' must be an integer"}), 400
+    try:
+        end = request.args.get("end")
+        end = datetime.fromisoformat(end) if end else None
+    except ValueError:
+        return jsonify({"error": "'end' must be an ISO date or date-time (UTC)"}), 400
+    events = request.args.get("events")
+    try:
+        cursor = db.get_db().cursor()
+        #query: reads only the EngagementBucket aggregates
+        bounds, rows = engagement.growth(
+            cursor,
+            request.args.get("by", "item"),
+            engagement.parse_window(request.args.get("window", "7d")),
+            granularity=request.args.get("granularity"),
+            event_types=events.split(",") if events else engagement.EVENT_TYPES,
+            end=end,
+            limit=limit,
+        )
+        cursor.close()
+        return jsonify({"window": bounds, "results": rows}), 200
+    except engagement.BadWindow as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @analytics.route("/analytics/items/<int:company_id>", methods=["GET"])
 def get_item_analytics(company_id):
     try:
         cursor = db.get_db().cursor()
          #check for existances 
-        cursor.execute("SELECT * FROM Business WHERE CompanyID = %s", (company_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "business not found"}), 404
-        #query 1
-        ownable = """
-            SELECT b.CompanyName, c.Name, c.ImageAddress
-            FROM Customer cu
-            JOIN CustomerCloset cc ON cu.CustomerID = cc.CustomerID
-            JOIN CustomerClosetClothingItems ci ON cc.ClosetID = ci.ClosetID
-            JOIN ClothingItem c ON ci.ClothingItemID = c.ItemID
-            JOIN BusinessInventoryItemStorage biis ON c.ItemID = biis.ItemID
-            JOIN BusinessInventory bi ON biis.InventoryID = bi.InventoryID
-            JOIN Business b ON bi.CompanyID = b.CompanyID
-            WHERE b.CompanyId = %s
-            ORDER BY c.PopularityPercentage DESC;
-        """
-        cursor.execute(ownable, (company_id))
-        most_owned = cursor.fetchall()
-        #query 2 
-        wearable = """
-            SELECT ci.Name as ClothingItemName
-            FROM CustomerClosetClothingItems cci
-            JOIN ClothingItem ci ON cci.ClothingItemID = ci.ItemID
-            JOIN BusinessInventoryItemStorage bs ON ci.ItemID = bs.ItemID
-            JOIN BusinessInventory bi ON bs.InventoryID = bi.InventoryID
-            JOIN Business b ON bi.CompanyID = b.CompanyID
-            WHERE b.CompanyID = %s
-            GROUP BY ci.ItemID
-            ORDER BY SUM(cci.NumberOfWears) DESC; 
-        """
-        cursor.execute(wearable, (company_id))
-        most_worn = cursor.fetchall() 
+        missing = first_missing(cursor, ("Business", {"CompanyID": company_id}, "business not found"))
+        if missing:
+            return jsonify({"error": missing}), 404
+        #query: read the per-item rollups (see backend/analytics/rollups.py)
+        cursor.execute("""
+            SELECT b.CompanyName, c.Name, c.ImageAddress, r.OwnerCount, r.TotalWears
+            FROM CompanyItemRollup r
+            JOIN ClothingItem c ON r.ItemID = c.ItemID
+            JOIN Business b ON r.CompanyID = b.CompanyID
+            WHERE r.CompanyID = %s
+        """, (company_id,))
+        rows = cursor.fetchall()
         cursor.close()
+        most_owned = [
+            {"CompanyName": r["CompanyName"], "Name": r["Name"], "ImageAddress": r["ImageAddress"], "OwnerCount": r["OwnerCount"]}
+            for r in sorted(rows, key=lambda r: r["OwnerCount"], reverse=True)
+            if r["OwnerCount"] > 0
+        ]
+        most_worn = [
+            {"ClothingItemName": r["Name"], "TotalWears": int(r["TotalWears"])}
+            for r in sorted(rows, key=lambda r: r["TotalWears"], reverse=True)
+            if r["OwnerCount"] > 0
+        ]
         return jsonify({"most_owned": most_owned, "most_worn": most_worn}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# most wishlisted items, ?k=N (default 10, max 100) and optional ?category=
 @analytics.route("/analytics/demand", methods=["GET"])
 def get_demand_analytics():
+    try:
+        k = min(max(int(request.args.get("k", 10)), 1), 100)
+    except ValueError:
+        return jsonify({"error": "'k' must be an integer"}), 400
     try:
         cursor = db.get_db().cursor()
-        #query (no need to check for existance here)
-        query = """
-            SELECT c.Name, COUNT(w.ItemID) as total_wishlists
-            FROM ClothingItem c
-            JOIN CustWishListClothingItem cwi ON c.ItemID = cwi.ClothingItemID
-            GROUP BY c.Name
-            ORDER BY total_wishlists DESC
-            LIMIT 10
-        """
-        cursor.execute(query)
-        demand_data = cursor.fetchall()
+        #query: served from the in-memory index over ItemWishlistDemand
+        demand_data = demand_index.top(cursor, k, request.args.get("category"))
         cursor.close()
         return jsonify(demand_data), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
+# the most wishlisted items, ?k=N (default 20, max 100), split into those some
+# business has in stock (with their top 3 suppliers) and those nobody stocks
+@analytics.route("/analytics/matching", methods=["GET"])
+def get_wishlist_matching():
+    try:
+        k = min(max(int(request.args.get("k", 20)), 1), 100)
+    except ValueError:
+        return jsonify({"error": "'k' must be an integer"}), 400
+    try:
+        cursor = db.get_db().cursor()
+        matched = []
+        unmatched = []
+        for item in demand_index.top(cursor, k):
+            suppliers = inventory_matcher.suppliers(cursor, item["ItemID"])
+            if suppliers:
+                matched.append({**item, "suppliers": suppliers[:3]})
+            else:
+                unmatched.append(item)
+        cursor.close()
+        return jsonify({"matched": matched, "unmatched": unmatched}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# businesses with the item in stock, i.e. who can fill its wishlist demand
+@analytics.route("/analytics/matching/<int:item_id>/suppliers", methods=["GET"])
+def get_item_suppliers(item_id):
+    try:
+        cursor = db.get_db().cursor()
+        suppliers = inventory_matcher.suppliers(cursor, item_id)
+        cursor.close()
+        return jsonify({"ItemID": item_id, "suppliers": suppliers}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# customer wishlists holding the item, i.e. who a restock of it would satisfy
+@analytics.route("/analytics/matching/<int:item_id>/wishlists", methods=["GET"])
+def get_item_wishlists(item_id):
+    try:
+        cursor = db.get_db().cursor()
+        wishlists = inventory_matcher.wishlists(cursor, item_id)
+        cursor.close()
+        return jsonify({"ItemID": item_id, "wishlists": wishlists}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+# recomputes the popularity columns from closet, wear, wishlist and sales data;
+# ?mode=incremental (default) only rescores what changed since the last run
+@analytics.route("/analytics/popularity", methods=["POST"])
+def recompute_popularity():
+    mode = request.args.get("mode", "incremental")
+    if mode not in ("full", "incremental"):
+        return jsonify({"error": "'mode' must be full or incremental"}), 400
+    try:
+        report = popularity.run(db.get_db(), incremental=mode == "incremental")
+        cache.invalidate("items", "aesthetics", "business")
+        return jsonify(report), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
 # ----------- Business Routes -----------
 
 @business.route("/business/<int:business_id>/notifications", methods=["POST"])
@@ -287,9 +440,7 @@ def post_business_notification(business_id):
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT MAX(NotificationID) FROM BusinessNotification")
-        res = cursor.fetchone()
-        new_id = (res['MAX(NotificationID)'] or 400) + 1
+        new_id = ids.next_id("BusinessNotification")
         query = """
         INSERT INTO BusinessNotification (NotificationID, Message, Status, CompanyID)
         VALUES (%s, %s, %s, %s)
@@ -317,9 +468,9 @@ def get_business_notifications(business_id):
     try:
         cursor = db.get_db().cursor()
         #check for existance 
-        cursor.execute("SELECT * FROM Business WHERE CompanyID = %s", (business_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "business not found"}), 404
+        missing = first_missing(cursor, ("Business", {"CompanyID": business_id}, "business not found"))
+        if missing:
+            return jsonify({"error": missing}), 404
         #query 
         cursor.execute("""
             SELECT bn.NotificationID, bn.Message, bn.Status, b.CompanyID, b.CompanyName, b.ContactEmail
@@ -339,13 +490,13 @@ def delete_business_notification(business_id, notification_id):
     try:
         cursor = db.get_db().cursor()
          #check for existance 
-        cursor.execute("SELECT * FROM Business WHERE CompanyID = %s", (business_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "business not found"}), 404
-         #check for existance 
-        cursor.execute("SELECT * FROM BusinessNotification WHERE NotificationId = %s", (notification_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "notification not found"}), 404
+        missing = first_missing(
+            cursor,
+            ("Business", {"CompanyID": business_id}, "business not found"),
+            ("BusinessNotification", {"NotificationID": notification_id}, "notification not found"),
+        )
+        if missing:
+            return jsonify({"error": missing}), 404
         #query 
         cursor.execute("""
             DELETE FROM BusinessNotification 
@@ -366,25 +517,35 @@ def add_business_inventory_item(business_id, inventory_id, item_id):
         for field in required_fields:
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
+        try:
+            quantity = int(data["QuantityInStock"])
+        except (TypeError, ValueError):
+            return jsonify({"error": "QuantityInStock must be an integer"}), 400
         
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT InventoryID FROM BusinessInventory WHERE CompanyID = %s AND InventoryID = %s", (business_id, inventory_id))
-        inv_row = cursor.fetchone()
-        if not inv_row: 
-            return jsonify({"error": "No inventory found for this business"}), 404
+        missing = first_missing(cursor, ("BusinessInventory", {"CompanyID": business_id, "InventoryID": inventory_id}, "No inventory found for this business"))
+        if missing:
+            return jsonify({"error": missing}), 404
+        # read before the INSERT, so a reload of the index cannot already hold the new
+        # stock, and no statement runs on the connection after the commit: the customer
+        # wishlists this stock can fill and the supplier's name (see backend/matching/inventory.py)
+        satisfied = inventory_matcher.wishlist_count(cursor, item_id)
+        company_name = inventory_matcher.company_name(cursor, business_id)
 
-        cursor.execute("SELECT MAX(ItemId) FROM BusinessInventoryItemStorage")
-        res = cursor.fetchone()
-        bridge_id = (res['MAX(ItemId)'] or 400) + 1
+        bridge_id = ids.next_id("BusinessInventoryItemStorage")
         cursor.execute("""
             INSERT INTO BusinessInventoryItemStorage 
             (ItemID, InventoryID, EthicallySourcedFlag, UnitsSold, QuantityInStock, ClothingItemID)
             VALUES (%s, %s, %s, 0, %s, %s)
-        """, (bridge_id, inventory_id, data["EthicallySourcedFlag"], data["QuantityInStock"], item_id))
+        """, (bridge_id, inventory_id, data["EthicallySourcedFlag"], quantity, item_id))
+        rollups.item_stocked(cursor, business_id, item_id)
+        popularity.mark(cursor, item_id, business_id)
         db.get_db().commit()
         cursor.close()
+        inventory_matcher.stocked(business_id, item_id, quantity, company_name)
         return (
-            jsonify({"message": "Item added to inventory successfully", "ItemID": bridge_id}), 201
+            jsonify({"message": "Item added to inventory successfully", "ItemID": bridge_id,
+                     "WishlistsSatisfied": satisfied}), 201
         )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -396,13 +557,13 @@ def get_business_inventory_item(business_id, item_id):
    try:
         cursor = db.get_db().cursor()
          #check for existance 
-        cursor.execute("SELECT * FROM Business WHERE CompanyID = %s", (business_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "business not found"}), 404
-         #check for existance 
-        cursor.execute("SELECT * FROM ClothingItem WHERE ItemID = %s", (item_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "clothing item not found"}), 404
+        missing = first_missing(
+            cursor,
+            ("Business", {"CompanyID": business_id}, "business not found"),
+            ("ClothingItem", {"ItemID": item_id}, "clothing item not found"),
+        )
+        if missing:
+            return jsonify({"error": missing}), 404
         cursor.execute("""
             SELECT CI.ItemID, CI.Name, CI.Category, CI.Price, BIIS.UnitsSold, BIIS.QuantityInStock
             FROM BusinessInventoryItemStorage BIIS
@@ -423,13 +584,13 @@ def update_business_inventory_item(business_id, item_id):
     try:
         cursor = db.get_db().cursor()
          #check for existance 
-        cursor.execute("SELECT * FROM Business WHERE CompanyID = %s", (business_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "business not found"}), 404
-         #check for existance 
-        cursor.execute("SELECT * FROM ClothingItem WHERE ItemID = %s", (item_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "clothing item not found"}), 404
+        missing = first_missing(
+            cursor,
+            ("Business", {"CompanyID": business_id}, "business not found"),
+            ("ClothingItem", {"ItemID": item_id}, "clothing item not found"),
+        )
+        if missing:
+            return jsonify({"error": missing}), 404
         cursor.execute("""
             UPDATE BusinessInventoryItemStorage
             SET EthicallySourcedFlag = TRUE
@@ -449,19 +610,22 @@ def delete_business_inventory_item(business_id, item_id):
     try:
         cursor = db.get_db().cursor()
          #check for existance 
-        cursor.execute("SELECT * FROM Business WHERE CompanyID = %s", (business_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "business not found"}), 404
-         #check for existance 
-        cursor.execute("SELECT * FROM ClothingItem WHERE ItemID = %s", (item_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "clothing item not found"}), 404
+        missing = first_missing(
+            cursor,
+            ("Business", {"CompanyID": business_id}, "business not found"),
+            ("ClothingItem", {"ItemID": item_id}, "clothing item not found"),
+        )
+        if missing:
+            return jsonify({"error": missing}), 404
         cursor.execute("""
             DELETE FROM BusinessInventoryItemStorage
             WHERE InventoryID IN (SELECT InventoryID FROM BusinessInventory WHERE CompanyID = %s)
             AND ClothingItemID = %s
         """, (business_id, item_id))
+        rollups.item_unstocked(cursor, business_id, item_id)
+        popularity.mark(cursor, item_id, business_id)
         db.get_db().commit()
+        inventory_matcher.unstocked(business_id, item_id)
         cursor.close()
         return jsonify({"message": "Item removed from inventory"}), 200
     except Exception as e:
@@ -472,14 +636,11 @@ def delete_business_inventory_item(business_id, item_id):
 def add_business_wishlist_item(business_id, wishlist_id, item_id):
     try:
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT WishlistID FROM BusinessWishlist WHERE CompanyID = %s AND WishlistID = %s", (business_id, wishlist_id))
-        wish_row = cursor.fetchone()
-        if not wish_row: 
-            return jsonify({"error": "No wishlist found for this business"}), 404
+        missing = first_missing(cursor, ("BusinessWishlist", {"CompanyID": business_id, "WishlistID": wishlist_id}, "No wishlist found for this business"))
+        if missing:
+            return jsonify({"error": missing}), 404
 
-        cursor.execute("SELECT MAX(ItemID) FROM BusinessWishlistClothingItem")
-        res = cursor.fetchone()
-        bridge_id = (res['MAX(ItemID)'] or 400) + 1
+        bridge_id = ids.next_id("BusinessWishlistClothingItem")
 
         cursor.execute("""
             INSERT INTO BusinessWishlistClothingItem (ItemID, WishlistID, ClothingItemID)
@@ -497,18 +658,15 @@ def add_business_wishlist_item(business_id, wishlist_id, item_id):
 def delete_business_wishlist_item(business_id, wishlist_id, item_id):
     try:
         cursor = db.get_db().cursor()
-        #checking for existance 
-        cursor.execute("SELECT * FROM Business WHERE CompanyID = %s", (business_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "business not found"}), 404
-         #check for existance 
-        cursor.execute("SELECT * FROM BusinessWishlist WHERE WishlistID = %s", (wishlist_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "wishlist not found"}), 404
-         #check for existance 
-        cursor.execute("SELECT * FROM ClothingItem WHERE ItemID = %s", (item_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "clothing item not found"}), 404
+        #check for existance 
+        missing = first_missing(
+            cursor,
+            ("Business", {"CompanyID": business_id}, "business not found"),
+            ("BusinessWishlist", {"WishlistID": wishlist_id}, "wishlist not found"),
+            ("ClothingItem", {"ItemID": item_id}, "clothing item not found"),
+        )
+        if missing:
+            return jsonify({"error": missing}), 404
         #query 
         cursor.execute("DELETE FROM BusinessWishlistClothingItem WHERE ItemID = %s AND WishlistID = %s", (item_id, wishlist_id))
         db.get_db().commit()
@@ -517,17 +675,20 @@ def delete_business_wishlist_item(business_id, wishlist_id, item_id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500 
 
+# paginated with ?limit=N&after=<next_cursor>, ordered by the storage row's ItemID
 @business.route("/business/<int:business_id>/inventory", methods=["GET"])
 def get_business_inventory(business_id):
     try:
+        limit, after = page_args(start=[0])
         cursor = db.get_db().cursor()
 
         # validate business
-        cursor.execute("SELECT * FROM Business WHERE CompanyID = %s", (business_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "business not found"}), 404
+        missing = first_missing(cursor, ("Business", {"CompanyID": business_id}, "business not found"))
+        if missing:
+            return jsonify({"error": missing}), 404
 
-        # query all inventory rows
+        # query one page of inventory rows, keyed on the storage row's primary key
+        # (item names can repeat or be NULL)
         cursor.execute("""
         SELECT 
             CI.ItemID,
@@ -535,41 +696,111 @@ def get_business_inventory(business_id):
             CI.Category,
             CI.Price,
             BIIS.QuantityInStock,
-            BIIS.UnitsSold
+            BIIS.UnitsSold,
+            BIIS.InventoryID,
+            BIIS.ItemID AS StorageID
         FROM BusinessInventoryItemStorage BIIS
         JOIN ClothingItem CI ON BIIS.ClothingItemID = CI.ItemID
         JOIN BusinessInventory BI ON BIIS.InventoryID = BI.InventoryID
-        WHERE BI.CompanyID = %s
-        ORDER BY CI.Name
-        """, (business_id,))
+        WHERE BI.CompanyID = %s AND BIIS.ItemID > %s
+        ORDER BY BIIS.ItemID
+        LIMIT %s
+        """, (business_id, after[0], limit + 1))
 
         items = cursor.fetchall()
         cursor.close()
-        return jsonify(items), 200
+        return jsonify(page_response(items, limit, ["StorageID"])), 200
+
+    except BadPageRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# the business home page in one call: inventory totals plus the ?top=N
+# best and worst sellers, picked by the database in a single statement
+@business.route("/business/<int:business_id>/home", methods=["GET"])
+def get_business_home(business_id):
+    try:
+        top = min(max(int(request.args.get("top", 3)), 1), 50)
+    except ValueError:
+        return jsonify({"error": "'top' must be an integer"}), 400
+    try:
+        cursor = db.get_db().cursor()
+        #query 1: the business and its inventory totals (no row means no such business)
+        cursor.execute("""
+            SELECT b.CompanyID, b.CompanyName,
+                   COUNT(BIIS.ItemID) AS ItemCount,
+                   COALESCE(SUM(BIIS.QuantityInStock), 0) AS UnitsInStock,
+                   COALESCE(SUM(BIIS.UnitsSold), 0) AS UnitsSold
+            FROM Business b
+            LEFT JOIN BusinessInventory BI ON BI.CompanyID = b.CompanyID
+            LEFT JOIN BusinessInventoryItemStorage BIIS ON BIIS.InventoryID = BI.InventoryID
+            WHERE b.CompanyID = %s
+            GROUP BY b.CompanyID, b.CompanyName
+        """, (business_id,))
+        summary = cursor.fetchone()
+        if summary is None:
+            return jsonify({"error": "business not found"}), 404
 
+        #query 2: top and poor sellers
+        sellers = """
+            SELECT %s AS Bucket, CI.ItemID, CI.Name, CI.Category,
+                   BIIS.UnitsSold, BIIS.QuantityInStock
+            FROM BusinessInventoryItemStorage BIIS
+            JOIN BusinessInventory BI ON BIIS.InventoryID = BI.InventoryID
+            JOIN ClothingItem CI ON BIIS.ClothingItemID = CI.ItemID
+            WHERE BI.CompanyID = %s
+        """
+        cursor.execute(
+            f"({sellers} ORDER BY BIIS.UnitsSold DESC, CI.ItemID LIMIT %s) "
+            f"UNION ALL ({sellers} ORDER BY BIIS.UnitsSold ASC, CI.ItemID LIMIT %s)",
+            ("top", business_id, top, "poor", business_id, top),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        return jsonify({
+            "business": {"CompanyID": summary["CompanyID"], "CompanyName": summary["CompanyName"]},
+            "inventory": {
+                "items": summary["ItemCount"],
+                "units_in_stock": int(summary["UnitsInStock"]),
+                "units_sold": int(summary["UnitsSold"]),
+            },
+            "top_sellers": [{k: v for k, v in r.items() if k != "Bucket"} for r in rows if r["Bucket"] == "top"],
+            "poor_sellers": [{k: v for k, v in r.items() if k != "Bucket"} for r in rows if r["Bucket"] == "poor"],
+        }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # this gives me all of the catalog items that are not currently in the inventory
+# paginated with ?limit=N&after=<next_cursor>, ordered by ItemID
 @business.route("/business/<int:business_id>/inventory/available", methods=["GET"])
 def get_available_items_for_business(business_id):
-    cursor = db.get_db().cursor()
-    # all items NOT currently in inventory for this business
-    cursor.execute("""
-        SELECT ci.ItemID, ci.Name, ci.Category, ci.Price
-        FROM ClothingItem ci
-        LEFT JOIN BusinessInventoryItemStorage biis
-          ON biis.ClothingItemID = ci.ItemID
-         AND biis.InventoryID IN (
-             SELECT InventoryID
-             FROM BusinessInventory
-             WHERE CompanyID = %s
-         )
-        WHERE biis.ClothingItemID IS NULL
-    """, (business_id,))
-    rows = cursor.fetchall()
-    cursor.close()
-    return jsonify(rows), 200
+    try:
+        limit, after = page_args(start=[0])
+        cursor = db.get_db().cursor()
+        # all items NOT currently in inventory for this business
+        cursor.execute("""
+            SELECT ci.ItemID, ci.Name, ci.Category, ci.Price
+            FROM ClothingItem ci
+            LEFT JOIN BusinessInventoryItemStorage biis
+              ON biis.ClothingItemID = ci.ItemID
+             AND biis.InventoryID IN (
+                 SELECT InventoryID
+                 FROM BusinessInventory
+                 WHERE CompanyID = %s
+             )
+            WHERE biis.ClothingItemID IS NULL
+              AND ci.ItemID > %s
+            ORDER BY ci.ItemID
+            LIMIT %s
+        """, (business_id, after[0], limit + 1))
+        rows = cursor.fetchall()
+        cursor.close()
+        return jsonify(page_response(rows, limit, ["ItemID"])), 200
+    except BadPageRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
 # Resource: /business/{business id}/wishlists/{wishlist id}
 # Verb: GET
@@ -578,21 +809,14 @@ def get_business_wishlist_items(business_id, wishlist_id):
     try:
         cursor = db.get_db().cursor()
 
-        # Check that the business exists
-        cursor.execute("SELECT * FROM Business WHERE CompanyID = %s", (business_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "business not found"}), 404
-
-        # Check that the wishlist exists for this business
-        cursor.execute(
-            """
-            SELECT * FROM BusinessWishlist 
-            WHERE CompanyID = %s AND WishlistID = %s
-            """,
-            (business_id, wishlist_id),
+        # Check that the business and its wishlist exist
+        missing = first_missing(
+            cursor,
+            ("Business", {"CompanyID": business_id}, "business not found"),
+            ("BusinessWishlist", {"CompanyID": business_id, "WishlistID": wishlist_id}, "wishlist not found for this business"),
         )
-        if not cursor.fetchone():
-            return jsonify({"error": "wishlist not found for this business"}), 404
+        if missing:
+            return jsonify({"error": missing}), 404
 
         # Get all clothing items in this wishlist
         cursor.execute(
@@ -630,9 +854,7 @@ def post_customer_notification(customer_id):
             if field not in data:
                 return jsonify({"error": f"Missing required field: {field}"}), 400
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT MAX(NotificationID) FROM CustomerNotification")
-        res = cursor.fetchone()
-        new_id = (res['MAX(NotificationID)'] or 400) + 1
+        new_id = ids.next_id("CustomerNotification")
         query = """
             INSERT INTO CustomerNotification (NotificationID, Message, Status, CustomerID)
             VALUES (%s, %s, %s, %s)
@@ -657,9 +879,9 @@ def get_customer_notifications(customer_id):
     try:
         cursor = db.get_db().cursor()
         #check for existance 
-        cursor.execute("SELECT * FROM Customer WHERE CustomerID = %s", (customer_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "customer not found"}), 404
+        missing = first_missing(cursor, ("Customer", {"CustomerID": customer_id}, "customer not found"))
+        if missing:
+            return jsonify({"error": missing}), 404
         #query 
         cursor.execute("""
             SELECT cn.NotificationID, cn.Message, cn.Status, c.CustomerID
@@ -679,9 +901,9 @@ def get_customer_closet(customer_id):
     try:
         cursor = db.get_db().cursor()
          #check for existance 
-        cursor.execute("SELECT * FROM Customer WHERE CustomerID = %s", (customer_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "customer not found"}), 404
+        missing = first_missing(cursor, ("Customer", {"CustomerID": customer_id}, "customer not found"))
+        if missing:
+            return jsonify({"error": missing}), 404
         #query 
         cursor.execute("""
             SELECT c.ClosetID, ci.Name AS ItemName, ci.Category, cci.NumberofWears, cci.AvailabilityStatus
@@ -693,20 +915,109 @@ def get_customer_closet(customer_id):
         """, (customer_id,))
         items = cursor.fetchall()
         
-        # find outfits where customer owns all of the items
+        # find outfits where customer owns all of the items (see backend/matching/outfits.py)
+        outfits, _ = outfit_index.wearable(cursor, customer_id, max_missing=0)
+        add_item_names(cursor, outfits)
+        cursor.close()
+        return jsonify({"items": items, "outfits": outfits}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# outfits the customer can wear from their closets, plus near misses
+# missing at most ?missing=K items (default 1, max 3; ?limit=N of them, default 20)
+@customer.route("/customer/<int:customer_id>/outfits/wearable", methods=["GET"])
+def get_wearable_outfits(customer_id):
+    try:
+        max_missing = min(max(int(request.args.get("missing", 1)), 0), 3)
+        limit = min(max(int(request.args.get("limit", 20)), 1), 100)
+    except ValueError:
+        return jsonify({"error": "'missing' and 'limit' must be integers"}), 400
+    try:
+        cursor = db.get_db().cursor()
+         #check for existance 
+        missing = first_missing(cursor, ("Customer", {"CustomerID": customer_id}, "customer not found"))
+        if missing:
+            return jsonify({"error": missing}), 404
+        complete, near_misses = outfit_index.wearable(cursor, customer_id, max_missing)
+        near_misses = near_misses[:limit]
+        add_item_names(cursor, complete, near_misses)
+        cursor.close()
+        return jsonify({"complete": complete, "near_misses": near_misses}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# everything the closet and outfit pages render, grouped and counted here
+# instead of in the page
+@customer.route("/customer/<int:customer_id>/closet-overview", methods=["GET"])
+def get_closet_overview(customer_id):
+    try:
+        cursor = db.get_db().cursor()
+        #query 1: closets with their counts (no rows means no such customer)
         cursor.execute("""
-            SELECT DISTINCT o.OutfitID, o.Nickname AS OutfitName, ci.Name AS ItemName
+            SELECT cu.CustomerID, cc.ClosetID, cc.NickName,
+                   (SELECT COUNT(*) FROM CustomerClosetClothingItems cci
+                    WHERE cci.ClosetID = cc.ClosetID) AS ItemCount,
+                   (SELECT COUNT(*) FROM CustomerClosetOutfits cco
+                    WHERE cco.ClosetID = cc.ClosetID) AS OutfitCount
+            FROM Customer cu
+            LEFT JOIN CustomerCloset cc ON cc.CustomerID = cu.CustomerID
+            WHERE cu.CustomerID = %s
+            ORDER BY cc.ClosetID
+        """, (customer_id,))
+        rows = cursor.fetchall()
+        if not rows:
+            return jsonify({"error": "customer not found"}), 404
+        closets = [
+            {"ClosetID": r["ClosetID"], "NickName": r["NickName"],
+             "ItemCount": r["ItemCount"], "OutfitCount": r["OutfitCount"]}
+            for r in rows if r["ClosetID"] is not None
+        ]
+
+        # outfits whose items are all in the customer's closets (see backend/matching/outfits.py)
+        wearable, _ = outfit_index.wearable(cursor, customer_id, 0)
+        wearable_ids = [outfit["OutfitID"] for outfit in wearable]
+        wearable_filter = f" OR o.OutfitID IN ({', '.join(['%s'] * len(wearable_ids))})" if wearable_ids else ""
+
+        #query 2: outfits saved in a closet or built from owned items, one row per item
+        cursor.execute(f"""
+            SELECT o.OutfitID, o.Nickname AS OutfitName, ci.Name AS ItemName
             FROM Outfit o
-            JOIN CustomerOutfitsOfClothingItems coci ON o.OutfitID = coci.OutfitID
-            JOIN ClothingItem ci ON coci.ClothingItemID = ci.ItemID
-            JOIN CustomerClosetClothingItems cci ON ci.ItemID = cci.ClothingItemID
-            JOIN CustomerCloset cc ON cci.ClosetID = cc.ClosetID
-            WHERE cc.CustomerID = %s
+            LEFT JOIN CustomerOutfitsOfClothingItems coci ON o.OutfitID = coci.OutfitID
+            LEFT JOIN ClothingItem ci ON coci.ClothingItemID = ci.ItemID
+            WHERE o.OutfitID IN (
+                SELECT cco.OutfitID
+                FROM CustomerClosetOutfits cco
+                JOIN CustomerCloset cc ON cco.ClosetID = cc.ClosetID
+                WHERE cc.CustomerID = %s
+            ){wearable_filter}
             ORDER BY o.OutfitID, ci.Name
-        """, (customer_id,))
-        outfits = cursor.fetchall()
+        """, (customer_id, *wearable_ids))
+        outfits = {}
+        for r in cursor.fetchall():
+            outfit = outfits.setdefault(r["OutfitID"], {
+                "OutfitID": r["OutfitID"], "OutfitName": r["OutfitName"], "Items": []
+            })
+            if r["ItemName"] is not None:
+                outfit["Items"].append(r["ItemName"])
+        outfits = list(outfits.values())
+        for outfit in outfits:
+            outfit["ItemCount"] = len(outfit["Items"])
         cursor.close()
-        return jsonify({"items": items, "outfits": outfits}), 200
+
+        items_in_outfits = sum(o["ItemCount"] for o in outfits)
+        return jsonify({
+            "closets": closets,
+            "outfits": outfits,
+            "totals": {
+                "closets": len(closets),
+                "items": sum(c["ItemCount"] for c in closets),
+                "outfits": len(outfits),
+                "items_in_outfits": items_in_outfits,
+                "avg_items_per_outfit": round(items_in_outfits / len(outfits), 1) if outfits else 0,
+            },
+            "largest_closet": max(closets, key=lambda c: c["ItemCount"], default=None),
+            "largest_outfit": max(outfits, key=lambda o: o["ItemCount"], default=None),
+        }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -714,38 +1025,64 @@ def get_customer_closet(customer_id):
 def add_closet_item(customer_id, closet_id, item_id):
     try:
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT ClosetID FROM CustomerCloset WHERE CustomerID = %s AND ClosetID = %s", (customer_id, closet_id))
-        closet_row = cursor.fetchone()
-        if not closet_row: 
-            return jsonify({"error": "No closet found for this customer"}), 404
+        missing = first_missing(cursor, ("CustomerCloset", {"CustomerID": customer_id, "ClosetID": closet_id}, "No closet found for this customer"))
+        if missing:
+            return jsonify({"error": missing}), 404
         cursor.execute("""
             INSERT INTO CustomerClosetClothingItems (ClothingItemID, ClosetID, NumberofWears, AvailabilityStatus)
             VALUES (%s, %s, 0, TRUE)
         """, (item_id, closet_id))
+        rollups.closet_item_added(cursor, item_id)
+        popularity.mark(cursor, item_id)
+        engagement.record(cursor, "closet_add", item_id, customer_id)
         db.get_db().commit()
+        aesthetic_index.closet_item_added(customer_id, item_id)
+        outfit_index.closet_item_added(customer_id, item_id)
         cursor.close()
         return jsonify({"message": "Item added to closet successfully", "ItemID": item_id}), 201 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@customer.route("/customer/<int:customer_id>/closets/<int:closet_id>/item/<int:item_id>/wear", methods=["POST"])
+def wear_closet_item(customer_id, closet_id, item_id):
+    try:
+        cursor = db.get_db().cursor()
+        missing = first_missing(
+            cursor,
+            ("CustomerCloset", {"CustomerID": customer_id, "ClosetID": closet_id}, "No closet found for this customer"),
+            ("CustomerClosetClothingItems", {"ClosetID": closet_id, "ClothingItemID": item_id}, "item is not in this closet"),
+        )
+        if missing:
+            return jsonify({"error": missing}), 404
+        cursor.execute("""
+            UPDATE CustomerClosetClothingItems
+            SET NumberofWears = NumberofWears + 1
+            WHERE ClosetID = %s AND ClothingItemID = %s
+        """, (closet_id, item_id))
+        rollups.wears_changed(cursor, item_id, 1)
+        popularity.mark(cursor, item_id)
+        engagement.record(cursor, "wear", item_id, customer_id)
+        db.get_db().commit()
+        cursor.close()
+        return jsonify({"message": "Wear recorded", "ItemID": item_id}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @customer.route("/customer/<int:customer_id>/closets/<int:closet_id>/outfit/<int:outfit_id>", methods=["POST"])
 def add_closet_outfit(customer_id, closet_id, outfit_id):
     try:
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT ClosetID FROM CustomerCloset WHERE CustomerID = %s AND ClosetID = %s", (customer_id, closet_id))
-        closet_row = cursor.fetchone()
-        if not closet_row: 
-            return jsonify({"error": "No closet found for this customer"}), 404
-        cursor.execute("SELECT MAX(OutfitID) FROM CustomerClosetOutfits")
-        res = cursor.fetchone()
-        bridge_id = (res['MAX(OutfitID)'] or 400) + 1
+        missing = first_missing(cursor, ("CustomerCloset", {"CustomerID": customer_id, "ClosetID": closet_id}, "No closet found for this customer"))
+        if missing:
+            return jsonify({"error": missing}), 404
         cursor.execute("""
             INSERT INTO CustomerClosetOutfits (ClosetID, OutfitID)
             VALUES (%s, %s)
         """, (closet_id, outfit_id))
         db.get_db().commit()
+        cache.invalidate("closet_outfits")
         cursor.close()
-        return jsonify({"message": "Outfit added to closet successfully", "OutfitID": bridge_id}), 201 
+        return jsonify({"message": "Outfit added to closet successfully", "OutfitID": outfit_id}), 201 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -754,9 +1091,9 @@ def get_customer_wishlist(customer_id):
     try:
         cursor = db.get_db().cursor()
          #check for existance 
-        cursor.execute("SELECT * FROM Customer WHERE CustomerID = %s", (customer_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "customer not found"}), 404
+        missing = first_missing(cursor, ("Customer", {"CustomerID": customer_id}, "customer not found"))
+        if missing:
+            return jsonify({"error": missing}), 404
         #query 
         cursor.execute("""
             SELECT cw.WishlistID, ci.ItemID, ci.Name, ci.Price, ci.ImageAddress
@@ -766,24 +1103,14 @@ def get_customer_wishlist(customer_id):
             WHERE cw.CustomerID = %s
         """, (customer_id,))
         items = cursor.fetchall()
-        cursor.execute("""
-            SELECT DISTINCT ci.Name, ci.Price, a.Name AS SharedAesthetic
-            FROM CustomerWishlist cw
-            JOIN CustWishListClothingItem cwci ON cw.WishlistID = cwci.WishlistID
-            JOIN ClothingItem ci ON cwci.ClothingItemID = ci.ItemID
-            JOIN ClothingItemMatchedAesthetic cima_wish ON ci.ItemID = cima_wish.ClothingItemID
-            JOIN Aesthetic a ON cima_wish.AestheticID = a.AestheticID
-            WHERE cw.CustomerID = %s
-            AND a.AestheticID IN (
-                SELECT DISTINCT cima_closet.AestheticID
-                FROM CustomerCloset cc
-                JOIN CustomerClosetClothingItems cci ON cc.ClosetID = cci.ClosetID
-                JOIN ClothingItemMatchedAesthetic cima_closet ON cci.ClothingItemID = cima_closet.ClothingItemID
-                WHERE cc.CustomerID = %s
-            )
-        """, (customer_id, customer_id))
-        matches = cursor.fetchall()
-
+        #match the wishlist against the closet's aesthetics (see backend/matching/aesthetics.py)
+        details = {item["ItemID"]: item for item in items}
+        matches = [
+            {"ItemID": match["ItemID"], "Name": details[match["ItemID"]]["Name"],
+             "Price": details[match["ItemID"]]["Price"], "SharedAesthetics": match["SharedAesthetics"],
+             "Overlap": match["Overlap"]}
+            for match in aesthetic_index.matches(cursor, customer_id, details)
+        ]
         cursor.close()
         return jsonify({"wishlist": items, "aesthetic_matches": matches}), 200
     except Exception as e:
@@ -793,31 +1120,74 @@ def get_customer_wishlist(customer_id):
 def add_customer_wishlist_item(customer_id, wishlist_id, item_id):
     try:
        cursor = db.get_db().cursor()
-       cursor.execute("SELECT MAX(ItemId) FROM CustWishListClothingItem")
-       res = cursor.fetchone()
-       bridge_id = (res['MAX(ItemId)'] or 400) + 1
-       cursor.execute("SELECT WishlistID FROM CustomerWishlist WHERE CustomerID = %s", (customer_id,))
-       inv_row = cursor.fetchone()
-       if not inv_row: 
-            return jsonify({"error": "No closet found"}), 404     
+       missing = first_missing(cursor, ("CustomerWishlist", {"CustomerID": customer_id}, "No closet found"))
+       if missing:
+           return jsonify({"error": missing}), 404
+       bridge_id = ids.next_id("CustWishListClothingItem")
        cursor.execute("""
             INSERT INTO CustWishListClothingItem (ItemID, WishlistID, ClothingItemID)
             VALUES (%s, %s, %s)
         """, (bridge_id, wishlist_id, item_id))
+       rollups.wishlist_item_added(cursor, item_id)
+       popularity.mark(cursor, item_id)
+       engagement.record(cursor, "wishlist_add", item_id, customer_id)
        db.get_db().commit()
+       demand_index.adjust(item_id, 1)
+       inventory_matcher.wishlisted(customer_id, wishlist_id, item_id)
        cursor.close()
        return jsonify({"message": "Item added to wishlist successfully", "ItemID": bridge_id}), 201 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+@customer.route("/customer/<int:customer_id>/wishlists/<int:wishlist_id>/items/<int:item_id>", methods=["DELETE"])
+def delete_customer_wishlist_item(customer_id, wishlist_id, item_id):
+    try:
+        cursor = db.get_db().cursor()
+        missing = first_missing(cursor, ("CustomerWishlist", {"CustomerID": customer_id, "WishlistID": wishlist_id}, "No wishlist found for this customer"))
+        if missing:
+            return jsonify({"error": missing}), 404
+        cursor.execute("""
+            DELETE FROM CustWishListClothingItem
+            WHERE WishlistID = %s AND ClothingItemID = %s
+        """, (wishlist_id, item_id))
+        removed = cursor.rowcount
+        if removed:
+            rollups.wishlist_item_removed(cursor, item_id, removed)
+            popularity.mark(cursor, item_id)
+        db.get_db().commit()
+        cursor.close()
+        if not removed:
+            return jsonify({"error": "item is not in this wishlist"}), 404
+        demand_index.adjust(item_id, -removed)
+        inventory_matcher.unwishlisted(customer_id, wishlist_id, item_id)
+        return jsonify({"message": "Item removed from wishlist"}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
     
+# paginated with ?limit=N&after=<next_cursor>, ordered by CompanyName
 @general.route("/business/users", methods=["GET"])
+@cache.cached(ttl=60, tags=["business"])
 def get_all_business():
     try:
+        limit, after = page_args(start=[None, 0])
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT * FROM Business ORDER BY CompanyName")
+        # MySQL sorts NULL names first, so a cursor on a NULL name continues
+        # with the remaining NULL names and then every named business
+        if after[0] is None:
+            keyset, params = "(CompanyName IS NULL AND CompanyID > %s) OR CompanyName IS NOT NULL", (after[1],)
+        else:
+            keyset, params = "CompanyName > %s OR (CompanyName = %s AND CompanyID > %s)", (after[0], after[0], after[1])
+        cursor.execute(f"""
+            SELECT * FROM Business
+            WHERE {keyset}
+            ORDER BY CompanyName, CompanyID
+            LIMIT %s
+        """, (*params, limit + 1))
         businesses = cursor.fetchall()
         cursor.close()
-        return jsonify(businesses), 200
+        return jsonify(page_response(businesses, limit, ["CompanyName", "CompanyID"])), 200
+    except BadPageRequest as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -826,14 +1196,13 @@ def create_business():
     try:
         data = request.get_json()
         cursor = db.get_db().cursor()
-        cursor.execute("SELECT MAX(CompanyID) FROM Business")
-        res = cursor.fetchone()
-        new_id = (res['MAX(CompanyID)'] or 40) + 1
+        new_id = ids.next_id("Business")
         cursor.execute("""
             INSERT INTO Business (CompanyID, CompanyName, ContactEmail, StreetAddress, City, State, ZIP, Country, PopularityPercentage)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 0.00)
         """, (new_id, data["company_name"], data["contact_email"], data.get("street",""), data.get("city",""), data.get("state",""), data.get("zip",""), data.get("country","USA")))
         db.get_db().commit()
+        cache.invalidate("business")
         cursor.close()
         return jsonify({"message": "Business created", "CompanyID": new_id}), 201
     except Exception as e:
@@ -845,7 +1214,170 @@ def delete_business(company_id):
         cursor = db.get_db().cursor()
         cursor.execute("DELETE FROM Business WHERE CompanyID = %s", (company_id,))
         db.get_db().commit()
+        cache.invalidate("business")
         cursor.close()
         return jsonify({"message": "Business removed"}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+# ----------- Prediction Routes -----------
+
+# rows per line of a streamed JSON batch response
+PREDICTION_STREAM_ROWS = 10000
+
+@prediction.route("/prediction/<var01>/<var02>", methods=["GET"])
+def predict_value(var01, var02):
+    try:
+        var01, var02 = float(var01), float(var02)
+    except ValueError:
+        return jsonify({"error": "both values must be numbers"}), 400
+    if not np.isfinite([var01, var02]).all():
+        return jsonify({"error": "both values must be finite"}), 400
+    try:
+        version, params = model01.model1_params.current()
+        return jsonify({"var01": var01, "var02": var02,
+                        "prediction": float(model01.predict(var01, var02, params)),
+                        "ParamsVersion": version}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# fits new model01 parameters from the inventory data (see ml_models/model01.py)
+@prediction.route("/prediction/train", methods=["POST"])
+def train_model():
+    try:
+        return jsonify(model01.train()), 201
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# holdout metrics for the current model01 parameters
+@prediction.route("/prediction/test", methods=["POST"])
+def test_model():
+    try:
+        return jsonify(model01.test()), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# registered versions of a model, newest first (see ml_models/registry.py)
+@prediction.route("/prediction/models/<name>", methods=["GET"])
+def get_model_versions(name):
+    try:
+        cursor = db.get_db().cursor()
+        versions = registry.versions(cursor, name)
+        cursor.close()
+        return jsonify({"model": name, "versions": versions}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# makes {"version": N} the version the model serves
+@prediction.route("/prediction/models/<name>/promote", methods=["POST"])
+def promote_model(name):
+    data = request.get_json(silent=True) or {}
+    try:
+        version = int(data["version"])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Missing required field: version (an integer)"}), 400
+    try:
+        cursor = db.get_db().cursor()
+        registry.promote(cursor, name, version)
+        db.get_db().commit()
+        cursor.close()
+        if name == model01.MODEL_NAME:
+            model01.model1_params.invalidate()
+        return jsonify({"model": name, "version": version}), 200
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# switches the model back to the version it served before the last promote
+@prediction.route("/prediction/models/<name>/rollback", methods=["POST"])
+def rollback_model(name):
+    try:
+        cursor = db.get_db().cursor()
+        version = registry.rollback(cursor, name)
+        db.get_db().commit()
+        cursor.close()
+        if name == model01.MODEL_NAME:
+            model01.model1_params.invalidate()
+        return jsonify({"model": name, "version": version}), 200
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 409
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def _prediction_inputs():
+    """The request's rows as an (n, 2) float64 array: a raw little-endian
+    float64 body (Content-Type: application/octet-stream) or JSON
+    {"rows": [[var01, var02], ...]}."""
+    if request.mimetype == "application/octet-stream":
+        body = request.get_data()
+        if len(body) % 16:
+            raise ValueError("binary body must be pairs of little-endian float64 values")
+        inputs = np.frombuffer(body, dtype="<f8").reshape(-1, 2)
+    else:
+        data = request.get_json(silent=True)
+        rows = data.get("rows") if isinstance(data, dict) else None
+        if not isinstance(rows, list):
+            raise ValueError("expected JSON {\"rows\": [[var01, var02], ...]} or a binary float64 body")
+        try:
+            inputs = np.asarray(rows, dtype=np.float64)
+        except TypeError:
+            # e.g. an object in a row
+            raise ValueError("every value must be a number")
+        if inputs.size == 0:
+            return inputs.reshape(0, 2)
+        if inputs.ndim != 2 or inputs.shape[1] != 2:
+            raise ValueError("every row must be [var01, var02]")
+    # null converts to NaN, and NaN or inf would only come back as a NaN prediction
+    if not np.isfinite(inputs).all():
+        raise ValueError("every value must be a finite number")
+    return inputs
+
+# scores a whole batch with one matrix-vector product and streams the results:
+# NDJSON lines of {"predictions": [...]} followed by a summary line, or raw
+# float64 values when the client sends Accept: application/octet-stream.
+# The latency and throughput are also in the X-Batch-* headers.
+@prediction.route("/prediction/batch", methods=["POST"])
+def predict_batch():
+    try:
+        inputs = _prediction_inputs()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if len(inputs) > model01.MAX_BATCH_ROWS:
+        return jsonify({"error": f"at most {model01.MAX_BATCH_ROWS} rows per batch"}), 413
+    try:
+        started = time.perf_counter()
+        version, predictions = model01.predict_batch(inputs)
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    stats = {
+        "rows": len(predictions),
+        "ParamsVersion": version,
+        "latency_ms": round(elapsed * 1000, 3),
+        "rows_per_second": round(len(predictions) / elapsed) if elapsed else None,
+    }
+    headers = {
+        "X-Batch-Rows": str(stats["rows"]),
+        "X-Batch-Latency-Ms": str(stats["latency_ms"]),
+        "X-Batch-Rows-Per-Second": str(stats["rows_per_second"]),
+        "X-Params-Version": str(version),
+    }
+
+    if request.accept_mimetypes.best == "application/octet-stream":
+        def binary():
+            for start in range(0, len(predictions), PREDICTION_STREAM_ROWS):
+                yield predictions[start:start + PREDICTION_STREAM_ROWS].astype("<f8").tobytes()
+        return Response(stream_with_context(binary()), mimetype="application/octet-stream", headers=headers)
+
+    def lines():
+        for start in range(0, len(predictions), PREDICTION_STREAM_ROWS):
+            yield json.dumps({"predictions": predictions[start:start + PREDICTION_STREAM_ROWS].tolist()}) + "\n"
+        yield json.dumps(stats) + "\n"
+    return Response(stream_with_context(lines()), mimetype="application/x-ndjson", headers=headers)
@@ -0,0 +1,40 @@
+#------------------------------------------------------------
+# Batched existence checks for the 404 handling in the routes.
+#
+# Instead of one "SELECT * FROM <table> WHERE id = %s" probe per
+# entity, a route lists every entity it needs and they are all
+# checked in a single round trip:
+#
+#   missing = first_missing(cursor,
+#       ("Business", {"CompanyID": business_id}, "business not found"),
+#       ("ClothingItem", {"ItemID": item_id}, "clothing item not found"))
+#   if missing:
+#       return jsonify({"error": missing}), 404
+#------------------------------------------------------------
+
+
+def first_missing(cursor, *checks):
+    """
+    Runs every check in one SELECT of EXISTS(...) flags.
+
+    Args:
+        cursor: a DictCursor from db.get_db()
+        checks: (table, {column: value, ...}, error message) tuples. Table and
+            column names come from route code, never from the request.
+
+    Returns:
+        The error message of the first check (in the order given) with no
+        matching row, or None when everything exists.
+    """
+    flags = []
+    params = []
+    for index, (table, where, _) in enumerate(checks):
+        conditions = " AND ".join(f"{column} = %s" for column in where)
+        flags.append(f"EXISTS(SELECT 1 FROM `{table}` WHERE {conditions}) AS c{index}")
+        params.extend(where.values())
+    cursor.execute("SELECT " + ", ".join(flags), tuple(params))
+    found = cursor.fetchone()
+    for index, (_, _, error) in enumerate(checks):
+        if not found[f"c{index}"]:
+            return error
+    return None
@@ -0,0 +1,75 @@
+#------------------------------------------------------------
+# Keyset (cursor) pagination for the listing routes.
+#
+# A page is requested with ?limit=N&after=<cursor>. The cursor is
+# the sort key of the last row on the previous page, so the next
+# page is a "WHERE key > cursor ... LIMIT N" index range instead of
+# an OFFSET scan, and rows inserted meanwhile never shift the pages.
+#------------------------------------------------------------
+import base64
+import json
+
+from flask import request
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+class BadPageRequest(ValueError):
+    """Raised for an unparseable limit or cursor; routes turn it into a 400."""
+
+
+def encode_cursor(values):
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise BadPageRequest("invalid 'after' cursor")
+
+
+def page_args(start):
+    """
+    Reads ?limit and ?after from the current request.
+
+    Args:
+        start: the key values that sort before every row, used for the
+            first page so each route needs only one SQL statement
+
+    Returns:
+        (limit, after) where after is a list of key values
+    """
+    try:
+        limit = int(request.args.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise BadPageRequest("'limit' must be an integer")
+    if limit < 1:
+        raise BadPageRequest("'limit' must be at least 1")
+    limit = min(limit, MAX_LIMIT)
+
+    after = request.args.get("after")
+    if not after:
+        return limit, list(start)
+    values = decode_cursor(after)
+    if not isinstance(values, list) or len(values) != len(start):
+        raise BadPageRequest("invalid 'after' cursor")
+    return limit, values
+
+
+def page_response(rows, limit, key_columns):
+    """
+    Builds the {"items": [...], "next_cursor": ...} body.
+
+    The route should fetch limit + 1 rows: the extra row only tells us
+    whether another page exists and is not returned.
+    """
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last[column] for column in key_columns)
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,109 @@
+#------------------------------------------------------------
+# In-memory top-K index over the ItemWishlistDemand counters.
+#
+# Each API process keeps the counters in sorted lists (one for all
+# items plus one per category), so GET /analytics/demand?k=N slices
+# the first k entries instead of sorting anything per request:
+#
+#   demand_index.top(cursor, k=10, category="Tops")
+#
+# The wishlist routes call demand_index.adjust() after they commit.
+# Writes made by other API processes reach this one when it reloads
+# the table, at most DEMAND_REFRESH_SECONDS after the last load.
+#------------------------------------------------------------
+import bisect
+import threading
+import time
+
+
+class DemandIndex:
+
+    def __init__(self):
+        self.refresh_seconds = 30.0
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._counts = {}
+        self._items = {}
+        # ascending lists of (-count, item_id): every item, and per category
+        self._all = []
+        self._by_category = {}
+
+    def init_app(self, app):
+        app.config.setdefault("DEMAND_REFRESH_SECONDS", 30.0)
+        self.refresh_seconds = app.config["DEMAND_REFRESH_SECONDS"]
+
+    def _stale(self):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    def load(self, cursor):
+        """Rebuilds the index from ItemWishlistDemand (one read of the counter table)."""
+        cursor.execute("""
+            SELECT d.ItemID, d.WishlistCount, c.Name, c.Category
+            FROM ItemWishlistDemand d
+            JOIN ClothingItem c ON d.ItemID = c.ItemID
+            WHERE d.WishlistCount > 0
+        """)
+        counts = {}
+        items = {}
+        everything = []
+        by_category = {}
+        for row in cursor.fetchall():
+            counts[row["ItemID"]] = row["WishlistCount"]
+            items[row["ItemID"]] = (row["Name"], row["Category"])
+            key = (-row["WishlistCount"], row["ItemID"])
+            everything.append(key)
+            by_category.setdefault(row["Category"], []).append(key)
+        everything.sort()
+        for entries in by_category.values():
+            entries.sort()
+        with self._lock:
+            self._counts, self._items = counts, items
+            self._all, self._by_category = everything, by_category
+            self._loaded_at = time.monotonic()
+
+    def top(self, cursor, k, category=None):
+        """
+        Returns:
+            up to k {ItemID, Name, Category, total_wishlists} dicts, most
+            wishlisted first (ties by ItemID)
+        """
+        if self._stale():
+            self.load(cursor)
+        with self._lock:
+            ranked = self._all if category is None else self._by_category.get(category, [])
+            entries = ranked[:k]
+            return [
+                {
+                    "ItemID": item_id,
+                    "Name": self._items[item_id][0],
+                    "Category": self._items[item_id][1],
+                    "total_wishlists": -negative_count,
+                }
+                for negative_count, item_id in entries
+            ]
+
+    def adjust(self, item_id, delta):
+        """Applies a committed change of the item's wishlist count."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if item_id not in self._items:
+                # first wishlist entry for this item: its name and category
+                # come with the next load
+                self._loaded_at = None
+                return
+            old = self._counts[item_id]
+            new = max(old + delta, 0)
+            category = self._items[item_id][1]
+            for ranked in (self._all, self._by_category[category]):
+                del ranked[bisect.bisect_left(ranked, (-old, item_id))]
+                if new > 0:
+                    bisect.insort(ranked, (-new, item_id))
+            if new > 0:
+                self._counts[item_id] = new
+            else:
+                del self._counts[item_id]
+                del self._items[item_id]
+
+
+demand_index = DemandIndex()
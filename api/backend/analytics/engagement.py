@@ -0,0 +1,211 @@
+#------------------------------------------------------------
+# Engagement events and their hour / day / week buckets.
+#
+# The routes call record() on the request's cursor before they
+# commit; it appends the raw EngagementEvent row and bumps the three
+# EngagementBucket rows the event falls into (migration V004):
+#
+#   engagement.record(cursor, "wear", item_id, customer_id)
+#
+# growth() compares the event counts of a window with the window
+# right before it, per item, category or aesthetic. It reads only
+# EngagementBucket, so its cost depends on the number of buckets in
+# the window and not on how many events were ever recorded.
+#------------------------------------------------------------
+import math
+import re
+from datetime import datetime, timedelta, timezone
+
+EVENT_TYPES = ("wishlist_add", "closet_add", "wear", "view")
+
+BUCKET_SIZES = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+WINDOW_UNITS = {"h": timedelta(hours=1), "d": timedelta(days=1), "w": timedelta(weeks=1)}
+MAX_WINDOW = timedelta(days=730)
+
+# dimension -> (key and name columns, extra joins, GROUP BY)
+DIMENSIONS = {
+    "item": (
+        "c.ItemID AS `Key`, c.Name AS Name",
+        "",
+        "c.ItemID, c.Name",
+    ),
+    "category": (
+        "c.Category AS `Key`, c.Category AS Name",
+        "",
+        "c.Category",
+    ),
+    "aesthetic": (
+        "a.AestheticID AS `Key`, a.Name AS Name",
+        """
+        JOIN ClothingItemMatchedAesthetic cima ON cima.ClothingItemID = b.ClothingItemID
+        JOIN Aesthetic a ON cima.AestheticID = a.AestheticID
+        """,
+        "a.AestheticID, a.Name",
+    ),
+}
+
+REBUILD_STATEMENTS = [
+    "DELETE FROM EngagementBucket",
+    """
+    INSERT INTO EngagementBucket (Granularity, BucketStart, ClothingItemID, EventType, EventCount)
+    SELECT 'hour', DATE_FORMAT(OccurredAt, '%Y-%m-%d %H:00:00'), ClothingItemID, EventType, COUNT(*)
+    FROM EngagementEvent
+    GROUP BY 2, ClothingItemID, EventType
+    """,
+    """
+    INSERT INTO EngagementBucket (Granularity, BucketStart, ClothingItemID, EventType, EventCount)
+    SELECT 'day', DATE(OccurredAt), ClothingItemID, EventType, COUNT(*)
+    FROM EngagementEvent
+    GROUP BY 2, ClothingItemID, EventType
+    """,
+    """
+    INSERT INTO EngagementBucket (Granularity, BucketStart, ClothingItemID, EventType, EventCount)
+    SELECT 'week', DATE(OccurredAt) - INTERVAL WEEKDAY(OccurredAt) DAY, ClothingItemID, EventType, COUNT(*)
+    FROM EngagementEvent
+    GROUP BY 2, ClothingItemID, EventType
+    """,
+]
+
+
+class BadWindow(ValueError):
+    """Raised for an unusable window, granularity, dimension or event list."""
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def bucket_start(at, granularity):
+    hour = at.replace(minute=0, second=0, microsecond=0)
+    if granularity == "hour":
+        return hour
+    day = hour.replace(hour=0)
+    if granularity == "day":
+        return day
+    return day - timedelta(days=day.weekday())
+
+
+def record(cursor, event_type, item_id, customer_id=None, at=None):
+    """Appends one event and counts it in its hour, day and week buckets; the caller commits."""
+    at = (at or utcnow()).replace(microsecond=0)
+    cursor.execute("""
+        INSERT INTO EngagementEvent (EventType, ClothingItemID, CustomerID, OccurredAt)
+        VALUES (%s, %s, %s, %s)
+    """, (event_type, item_id, customer_id, at))
+    cursor.execute("""
+        INSERT INTO EngagementBucket (Granularity, BucketStart, ClothingItemID, EventType, EventCount)
+        VALUES ('hour', %s, %s, %s, 1), ('day', %s, %s, %s, 1), ('week', %s, %s, %s, 1)
+        ON DUPLICATE KEY UPDATE EventCount = EventCount + 1
+    """, (
+        bucket_start(at, "hour"), item_id, event_type,
+        bucket_start(at, "day"), item_id, event_type,
+        bucket_start(at, "week"), item_id, event_type,
+    ))
+
+
+def rebuild(cursor):
+    """Recomputes every bucket from EngagementEvent; the caller commits."""
+    for statement in REBUILD_STATEMENTS:
+        cursor.execute(statement)
+
+
+def parse_window(text):
+    """"36h", "7d", "12w" -> timedelta"""
+    match = re.fullmatch(r"(\d+)([hdw])", (text or "").strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise BadWindow("'window' must look like 24h, 7d or 4w")
+    window = int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+    if window > MAX_WINDOW:
+        raise BadWindow(f"'window' can be at most {MAX_WINDOW.days}d")
+    return window
+
+
+def pick_granularity(window):
+    """The coarsest buckets that still give the window a few data points."""
+    if window <= timedelta(days=2):
+        return "hour"
+    if window <= timedelta(weeks=8):
+        return "day"
+    return "week"
+
+
+def window_bounds(window, granularity, end=None):
+    """
+    Rounds the window up to whole buckets ending where the bucket that holds
+    `end` starts, so a partly elapsed bucket is never compared with full ones.
+
+    Returns:
+        (previous_start, current_start, stop): the current window is
+        [current_start, stop) and the one it is compared with is
+        [previous_start, current_start)
+    """
+    size = BUCKET_SIZES[granularity]
+    stop = bucket_start(end or utcnow(), granularity)
+    length = size * math.ceil(window / size)
+    return stop - 2 * length, stop - length, stop
+
+
+def growth(cursor, by, window, granularity=None, event_types=EVENT_TYPES, end=None, limit=10):
+    """
+    Args:
+        by: "item", "category" or "aesthetic"
+        window: timedelta, e.g. parse_window("7d")
+        granularity: bucket size to read; picked from the window when None
+        event_types: the events to count
+        end: a UTC datetime; the window stops at the start of its bucket (defaults to now)
+
+    Returns:
+        (bounds, rows): the window bounds and up to `limit` rows of
+        {Key, Name, Current, Previous, GrowthPercent}. Rows that had events
+        in the previous window come first, fastest growing first; rows new
+        in this window (GrowthPercent None) follow, busiest first.
+    """
+    if by not in DIMENSIONS:
+        raise BadWindow(f"'by' must be one of {', '.join(DIMENSIONS)}")
+    granularity = granularity or pick_granularity(window)
+    if granularity not in BUCKET_SIZES:
+        raise BadWindow(f"'granularity' must be one of {', '.join(BUCKET_SIZES)}")
+    unknown = set(event_types) - set(EVENT_TYPES)
+    if unknown or not event_types:
+        raise BadWindow(f"'events' must be a comma separated list of {', '.join(EVENT_TYPES)}")
+
+    previous_start, current_start, stop = window_bounds(window, granularity, end)
+    columns, joins, group_by = DIMENSIONS[by]
+    type_list = ", ".join(["%s"] * len(event_types))
+    cursor.execute(f"""
+        SELECT {columns},
+               SUM(CASE WHEN b.BucketStart >= %s THEN b.EventCount ELSE 0 END) AS Current,
+               SUM(CASE WHEN b.BucketStart < %s THEN b.EventCount ELSE 0 END) AS Previous
+        FROM EngagementBucket b
+        JOIN ClothingItem c ON b.ClothingItemID = c.ItemID
+        {joins}
+        WHERE b.Granularity = %s AND b.BucketStart >= %s AND b.BucketStart < %s
+          AND b.EventType IN ({type_list})
+        GROUP BY {group_by}
+        HAVING Current > 0
+        ORDER BY Previous = 0, (Current - Previous) / Previous DESC, Current DESC
+        LIMIT %s
+    """, (current_start, current_start, granularity, previous_start, stop, *event_types, limit))
+
+    rows = []
+    for row in cursor.fetchall():
+        current, previous = int(row["Current"]), int(row["Previous"])
+        rows.append({
+            "Key": row["Key"],
+            "Name": row["Name"],
+            "Current": current,
+            "Previous": previous,
+            "GrowthPercent": round((current - previous) / previous * 100, 1) if previous else None,
+        })
+    bounds = {
+        "granularity": granularity,
+        "previous_start": previous_start.isoformat(),
+        "current_start": current_start.isoformat(),
+        "end": stop.isoformat(),
+    }
+    return bounds, rows
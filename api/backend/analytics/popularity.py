@@ -0,0 +1,291 @@
+#------------------------------------------------------------
+# Popularity scoring job.
+#
+# Rewrites the popularity columns the routes sort by from real
+# signals instead of seed values:
+#
+#   ClothingItem.PopularityPercentage  owners, wears, wishlist entries, units sold
+#   Business.PopularityPercentage      popularity of the items it stocks, units sold
+#   Aesthetic.PopularityPercent        popularity of the items matched to it
+#
+# Count signals are compressed with log1p (a few items get most of
+# the traffic); the summed item popularity of a business or aesthetic
+# is used as is. Each is divided by its largest value in the last full
+# run, so every score is a 0..99.99 percentage.
+#
+# The signal rows are exported in bulk and summed per id with
+# np.bincount; changed scores are written back with one
+# UPDATE ... CASE per UPDATE_BATCH rows.
+#
+# A full run rescores everything. An incremental run rescores only the
+# items and businesses the routes marked in PopularityDirty (closet
+# adds, wears, wishlist adds and removals, stocking and unstocking),
+# and the businesses and aesthetics of those items. It reuses the
+# scales of the last full run. Changes made outside the API, such as
+# UnitsSold updates or a bulk load, need a full run. From the api folder:
+#
+#   python -m backend.analytics.popularity --full
+#   python -m backend.analytics.popularity --incremental
+#------------------------------------------------------------
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from backend.analytics import engagement
+
+ITEM_WEIGHTS = {"owners": 0.3, "wears": 0.2, "wishlists": 0.3, "units_sold": 0.2}
+BUSINESS_WEIGHTS = {"stocked_popularity": 0.5, "business_units_sold": 0.5}
+AESTHETIC_WEIGHTS = {"matched_popularity": 1.0}
+
+IN_CHUNK = 1000
+UPDATE_BATCH = 1000
+MAX_SCORE = 99.99
+
+# sums of item scores, already compressed, so they are not log1p'd again
+LINEAR_SIGNALS = {"stocked_popularity", "matched_popularity"}
+
+
+def _id_filters(column, ids):
+    """(WHERE condition, params) pairs covering ids in IN_CHUNK pieces; everything when ids is None."""
+    if ids is None:
+        return [("TRUE", ())]
+    ids = [int(i) for i in ids]
+    return [
+        (f"{column} IN ({', '.join(['%s'] * len(chunk))})", tuple(chunk))
+        for chunk in (ids[start:start + IN_CHUNK] for start in range(0, len(ids), IN_CHUNK))
+    ]
+
+
+def _export(cursor, sql, columns, key=None, ids=None):
+    """
+    Runs `sql` (with a {where} placeholder) and returns one float64 array
+    per column. With ids, only rows whose `key` is one of them are read.
+    """
+    parts = [[] for _ in columns]
+    for where, params in _id_filters(key, ids):
+        cursor.execute(sql.format(where=where), params)
+        rows = cursor.fetchall()
+        for part, column in zip(parts, columns):
+            part.append(np.fromiter((row[column] or 0 for row in rows), dtype=np.float64, count=len(rows)))
+    return [np.concatenate(part) if part else np.zeros(0) for part in parts]
+
+
+def _totals(index_ids, keys, weights=None):
+    """Sums weights (or counts rows) per entry of the sorted index_ids; unknown keys are skipped."""
+    if not len(index_ids):
+        return np.zeros(0)
+    positions = np.searchsorted(index_ids, keys)
+    known = positions < len(index_ids)
+    known[known] = index_ids[positions[known]] == keys[known]
+    return np.bincount(positions[known], weights=None if weights is None else weights[known],
+                       minlength=len(index_ids)).astype(np.float64)
+
+
+def _compress(name, values):
+    return values if name in LINEAR_SIGNALS else np.log1p(values)
+
+
+def _scores(signals, weights, scales):
+    """Weighted sum of compressed signal / scale (each capped at 1), as a 0..MAX_SCORE percentage."""
+    total = np.zeros(len(next(iter(signals.values()))))
+    for name, weight in weights.items():
+        if scales[name] > 0:
+            total += weight * np.minimum(_compress(name, signals[name]) / scales[name], 1.0)
+    return np.minimum(np.round(total * 100, 2), MAX_SCORE)
+
+
+def _fit_scales(signals):
+    return {name: float(_compress(name, values).max()) if len(values) else 0.0
+            for name, values in signals.items()}
+
+
+def _write(conn, cursor, table, key, column, ids, scores, current):
+    """UPDATEs the rows whose score changed, UPDATE_BATCH per statement. Returns how many."""
+    changed = np.flatnonzero(np.abs(scores - current) >= 0.005)
+    for start in range(0, len(changed), UPDATE_BATCH):
+        batch = changed[start:start + UPDATE_BATCH]
+        batch_ids = ids[batch].astype(np.int64).tolist()
+        pairs = [value for pair in zip(batch_ids, scores[batch].tolist()) for value in pair]
+        cursor.execute(f"""
+            UPDATE {table}
+            SET {column} = CASE {key} {' '.join(['WHEN %s THEN %s'] * len(batch_ids))} END
+            WHERE {key} IN ({', '.join(['%s'] * len(batch_ids))})
+        """, (*pairs, *batch_ids))
+        conn.commit()
+    return len(changed)
+
+
+def score_items(conn, cursor, scales, item_ids=None):
+    """Rescores the items (all when item_ids is None). Returns (items scored, items updated)."""
+    ids, current = _export(cursor, """
+        SELECT ItemID, PopularityPercentage FROM ClothingItem WHERE {where} ORDER BY ItemID
+    """, ["ItemID", "PopularityPercentage"], "ItemID", item_ids)
+    closet_items, wears = _export(cursor, """
+        SELECT ClothingItemID, NumberofWears FROM CustomerClosetClothingItems WHERE {where}
+    """, ["ClothingItemID", "NumberofWears"], "ClothingItemID", item_ids)
+    (wishlisted,) = _export(cursor, """
+        SELECT ClothingItemID FROM CustWishListClothingItem WHERE {where}
+    """, ["ClothingItemID"], "ClothingItemID", item_ids)
+    sold_items, sold = _export(cursor, """
+        SELECT ClothingItemID, UnitsSold FROM BusinessInventoryItemStorage WHERE {where}
+    """, ["ClothingItemID", "UnitsSold"], "ClothingItemID", item_ids)
+
+    signals = {
+        "owners": _totals(ids, closet_items),
+        "wears": _totals(ids, closet_items, wears),
+        "wishlists": _totals(ids, wishlisted),
+        "units_sold": _totals(ids, sold_items, sold),
+    }
+    if item_ids is None:
+        scales.update(_fit_scales(signals))
+    scores = _scores(signals, ITEM_WEIGHTS, scales)
+    return len(ids), _write(conn, cursor, "ClothingItem", "ItemID", "PopularityPercentage", ids, scores, current)
+
+
+def score_businesses(conn, cursor, scales, company_ids=None):
+    """Rescores the businesses from their stocked items' (already written) popularity."""
+    ids, current = _export(cursor, """
+        SELECT CompanyID, PopularityPercentage FROM Business WHERE {where} ORDER BY CompanyID
+    """, ["CompanyID", "PopularityPercentage"], "CompanyID", company_ids)
+    companies, popularity, sold = _export(cursor, """
+        SELECT BI.CompanyID, c.PopularityPercentage, BIIS.UnitsSold
+        FROM BusinessInventoryItemStorage BIIS
+        JOIN BusinessInventory BI ON BIIS.InventoryID = BI.InventoryID
+        JOIN ClothingItem c ON BIIS.ClothingItemID = c.ItemID
+        WHERE {where}
+    """, ["CompanyID", "PopularityPercentage", "UnitsSold"], "BI.CompanyID", company_ids)
+    signals = {
+        "stocked_popularity": _totals(ids, companies, popularity / 100),
+        "business_units_sold": _totals(ids, companies, sold),
+    }
+    if company_ids is None:
+        scales.update(_fit_scales(signals))
+    scores = _scores(signals, BUSINESS_WEIGHTS, scales)
+    return _write(conn, cursor, "Business", "CompanyID", "PopularityPercentage", ids, scores, current)
+
+
+def score_aesthetics(conn, cursor, scales, aesthetic_ids=None):
+    """Rescores the aesthetics from their matched items' (already written) popularity."""
+    ids, current = _export(cursor, """
+        SELECT AestheticID, PopularityPercent FROM Aesthetic WHERE {where} ORDER BY AestheticID
+    """, ["AestheticID", "PopularityPercent"], "AestheticID", aesthetic_ids)
+    aesthetics, popularity = _export(cursor, """
+        SELECT cima.AestheticID, c.PopularityPercentage
+        FROM ClothingItemMatchedAesthetic cima
+        JOIN ClothingItem c ON cima.ClothingItemID = c.ItemID
+        WHERE {where}
+    """, ["AestheticID", "PopularityPercentage"], "cima.AestheticID", aesthetic_ids)
+    signals = {"matched_popularity": _totals(ids, aesthetics, popularity / 100)}
+    if aesthetic_ids is None:
+        scales.update(_fit_scales(signals))
+    scores = _scores(signals, AESTHETIC_WEIGHTS, scales)
+    return _write(conn, cursor, "Aesthetic", "AestheticID", "PopularityPercent", ids, scores, current)
+
+
+def mark(cursor, item_id, company_id=None):
+    """
+    Flags an item (and a business) for the next incremental run; the
+    routes call it whenever they change a signal, before they commit.
+    """
+    marked_at = engagement.utcnow().replace(microsecond=0)
+    rows = [("item", item_id)] + ([("business", company_id)] if company_id is not None else [])
+    cursor.execute(f"""
+        INSERT INTO PopularityDirty (Kind, ID, MarkedAt)
+        VALUES {', '.join(['(%s, %s, %s)'] * len(rows))}
+        ON DUPLICATE KEY UPDATE MarkedAt = VALUES(MarkedAt)
+    """, tuple(value for kind, row_id in rows for value in (kind, row_id, marked_at)))
+
+
+def _touched(cursor):
+    """(item ids, company ids, aesthetic ids) marked in PopularityDirty, with the items' businesses and aesthetics."""
+    cursor.execute("SELECT Kind, ID FROM PopularityDirty")
+    marked = cursor.fetchall()
+    items = sorted(row["ID"] for row in marked if row["Kind"] == "item")
+    companies = [row["ID"] for row in marked if row["Kind"] == "business"]
+    if not items:
+        return [], sorted(companies), []
+    (stocking,) = _export(cursor, """
+        SELECT DISTINCT BI.CompanyID
+        FROM BusinessInventoryItemStorage BIIS
+        JOIN BusinessInventory BI ON BIIS.InventoryID = BI.InventoryID
+        WHERE {where}
+    """, ["CompanyID"], "BIIS.ClothingItemID", items)
+    (aesthetics,) = _export(cursor, """
+        SELECT DISTINCT AestheticID FROM ClothingItemMatchedAesthetic WHERE {where}
+    """, ["AestheticID"], "ClothingItemID", items)
+    companies = np.unique(np.concatenate([stocking, np.asarray(companies, dtype=np.float64)]))
+    return items, companies.astype(np.int64).tolist(), np.unique(aesthetics).astype(np.int64).tolist()
+
+
+def run(conn, incremental=False):
+    """
+    Rescores the popularity columns and records the run in PopularityRun.
+    An incremental run falls back to a full one when there was no full run yet.
+
+    Returns:
+        {Mode, ItemsScored, ItemsUpdated, BusinessesUpdated, AestheticsUpdated, Seconds}
+    """
+    started_at = engagement.utcnow().replace(microsecond=0)
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute("SELECT Scales FROM PopularityRun WHERE Mode = 'full' ORDER BY RunID DESC LIMIT 1")
+    full = cursor.fetchone()
+
+    if incremental and full is not None:
+        mode = "incremental"
+        scales = json.loads(full["Scales"])
+        items, companies, aesthetics = _touched(cursor)
+        scored, items_updated = score_items(conn, cursor, scales, items) if items else (0, 0)
+        businesses_updated = score_businesses(conn, cursor, scales, companies) if companies else 0
+        aesthetics_updated = score_aesthetics(conn, cursor, scales, aesthetics) if aesthetics else 0
+    else:
+        mode = "full"
+        scales = {}
+        scored, items_updated = score_items(conn, cursor, scales)
+        businesses_updated = score_businesses(conn, cursor, scales)
+        aesthetics_updated = score_aesthetics(conn, cursor, scales)
+
+    # marks made while this run was going stay for the next one
+    cursor.execute("DELETE FROM PopularityDirty WHERE MarkedAt < %s", (started_at,))
+    cursor.execute("""
+        INSERT INTO PopularityRun (Mode, StartedAt, FinishedAt, ItemsScored, ItemsUpdated,
+                                   BusinessesUpdated, AestheticsUpdated, Scales)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """, (mode, started_at, engagement.utcnow().replace(microsecond=0), scored, items_updated,
+          businesses_updated, aesthetics_updated, json.dumps(scales)))
+    conn.commit()
+    cursor.close()
+    return {
+        "Mode": mode,
+        "ItemsScored": scored,
+        "ItemsUpdated": items_updated,
+        "BusinessesUpdated": businesses_updated,
+        "AestheticsUpdated": aesthetics_updated,
+        "Seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute the popularity columns from real signals.")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--full", action="store_true", help="rescore every item, business and aesthetic")
+    group.add_argument("--incremental", action="store_true", help="rescore what changed since the last run")
+    args = parser.parse_args()
+
+    from backend.cache import cache
+    from backend.db_connection import db
+    from backend.rest_entry import create_app
+
+    app = create_app()
+    with app.app_context():
+        report = run(db.get_db(), incremental=args.incremental)
+        cache.invalidate("items", "aesthetics", "business")
+    print(json.dumps(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
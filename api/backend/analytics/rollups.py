@@ -0,0 +1,137 @@
+#------------------------------------------------------------
+# Rollup tables derived from the closet, inventory and wishlist rows.
+#
+# CompanyItemRollup (migration V002) holds one row for every item a
+# business stocks, with the number of closets holding the item and
+# their total wears. ItemWishlistDemand (V003) counts the customer
+# wishlist entries of each item. The routes call the functions below
+# on the request's cursor before they commit, so the rollups change
+# in the same transaction as the rows they summarize.
+#
+# Rebuild every row from the base tables, together with the
+# engagement buckets (see engagement.py), after datagen or a manual
+# bulk load, from the api folder with:
+#
+#   python -m backend.analytics.rollups --rebuild
+#------------------------------------------------------------
+import argparse
+import sys
+
+from backend.analytics import engagement
+
+REBUILD_STATEMENTS = [
+    "DELETE FROM CompanyItemRollup",
+    """
+    INSERT INTO CompanyItemRollup (CompanyID, ItemID, OwnerCount, TotalWears)
+    SELECT stocked.CompanyID, stocked.ItemID,
+           COALESCE(owned.OwnerCount, 0), COALESCE(owned.TotalWears, 0)
+    FROM (
+        SELECT DISTINCT BI.CompanyID, BIIS.ClothingItemID AS ItemID
+        FROM BusinessInventoryItemStorage BIIS
+        JOIN BusinessInventory BI ON BIIS.InventoryID = BI.InventoryID
+    ) stocked
+    LEFT JOIN (
+        SELECT ClothingItemID, COUNT(*) AS OwnerCount, SUM(NumberofWears) AS TotalWears
+        FROM CustomerClosetClothingItems
+        GROUP BY ClothingItemID
+    ) owned ON owned.ClothingItemID = stocked.ItemID
+    """,
+    "DELETE FROM ItemWishlistDemand",
+    """
+    INSERT INTO ItemWishlistDemand (ItemID, WishlistCount)
+    SELECT ClothingItemID, COUNT(*)
+    FROM CustWishListClothingItem
+    WHERE ClothingItemID IS NOT NULL
+    GROUP BY ClothingItemID
+    """,
+]
+
+
+def rebuild(cursor):
+    """Recomputes every rollup row and engagement bucket; the caller commits."""
+    for statement in REBUILD_STATEMENTS:
+        cursor.execute(statement)
+    engagement.rebuild(cursor)
+
+
+def closet_item_added(cursor, item_id, wears=0):
+    cursor.execute("""
+        UPDATE CompanyItemRollup
+        SET OwnerCount = OwnerCount + 1, TotalWears = TotalWears + %s
+        WHERE ItemID = %s
+    """, (wears, item_id))
+
+
+def wears_changed(cursor, item_id, delta):
+    cursor.execute("""
+        UPDATE CompanyItemRollup SET TotalWears = TotalWears + %s WHERE ItemID = %s
+    """, (delta, item_id))
+
+
+def item_stocked(cursor, company_id, item_id):
+    """Starts tracking an item once the business stocks it (no-op if it already does)."""
+    cursor.execute("""
+        INSERT INTO CompanyItemRollup (CompanyID, ItemID, OwnerCount, TotalWears)
+        SELECT %s, %s, COUNT(*), COALESCE(SUM(NumberofWears), 0)
+        FROM CustomerClosetClothingItems
+        WHERE ClothingItemID = %s
+        ON DUPLICATE KEY UPDATE OwnerCount = OwnerCount
+    """, (company_id, item_id, item_id))
+
+
+def item_unstocked(cursor, company_id, item_id):
+    """Drops the row once none of the business's inventories holds the item."""
+    cursor.execute("""
+        DELETE FROM CompanyItemRollup
+        WHERE CompanyID = %s AND ItemID = %s
+          AND NOT EXISTS (
+              SELECT 1
+              FROM BusinessInventoryItemStorage BIIS
+              JOIN BusinessInventory BI ON BIIS.InventoryID = BI.InventoryID
+              WHERE BI.CompanyID = %s AND BIIS.ClothingItemID = %s
+          )
+    """, (company_id, item_id, company_id, item_id))
+
+
+def wishlist_item_added(cursor, item_id):
+    cursor.execute("""
+        INSERT INTO ItemWishlistDemand (ItemID, WishlistCount) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE WishlistCount = WishlistCount + 1
+    """, (item_id,))
+
+
+def wishlist_item_removed(cursor, item_id, count=1):
+    cursor.execute("""
+        UPDATE ItemWishlistDemand
+        SET WishlistCount = GREATEST(WishlistCount - %s, 0)
+        WHERE ItemID = %s
+    """, (count, item_id))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the analytics rollup tables.")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every row from the base tables")
+    args = parser.parse_args()
+    if not args.rebuild:
+        parser.print_help()
+        return 1
+
+    from backend.cache import cache
+    from backend.db_connection import db
+    from backend.rest_entry import create_app
+
+    app = create_app()
+    with app.app_context():
+        conn = db.get_db()
+        cursor = conn.cursor()
+        rebuild(cursor)
+        conn.commit()
+        cache.invalidate("engagement")
+        for table in ("CompanyItemRollup", "ItemWishlistDemand", "EngagementBucket"):
+            cursor.execute(f"SELECT COUNT(*) AS n FROM {table}")
+            print(f"rebuilt {table}: {cursor.fetchone()['n']} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#------------------------------------------------------------
+# Response cache for read-heavy GET routes.
+#
+#   @general.route("/business/users", methods=["GET"])
+#   @cache.cached(ttl=60, tags=["business"])
+#   def get_all_business(): ...
+#
+# and in the handlers that change the data behind it:
+#
+#   db.get_db().commit()
+#   cache.invalidate("business")
+#------------------------------------------------------------
+import functools
+import threading
+
+from flask import current_app, make_response, request
+
+from backend.cache.backends import LRUBackend, RedisBackend
+
+
+class ResponseCache:
+
+    def __init__(self):
+        self.backend = None
+        self.enabled = True
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault("CACHE_ENABLED", True)
+        app.config.setdefault("CACHE_BACKEND", "memory")
+        app.config.setdefault("CACHE_MAX_ENTRIES", 1024)
+        app.config.setdefault("CACHE_REDIS_URL", None)
+
+        self.enabled = app.config["CACHE_ENABLED"]
+        if app.config["CACHE_BACKEND"] == "redis":
+            self.backend = RedisBackend(app.config["CACHE_REDIS_URL"])
+        else:
+            self.backend = LRUBackend(max_entries=app.config["CACHE_MAX_ENTRIES"])
+
+    def _count(self, endpoint, field):
+        with self._lock:
+            counts = self._stats.setdefault(endpoint, {"hits": 0, "misses": 0, "errors": 0})
+            counts[field] += 1
+
+    def _key(self, tags):
+        # route + path arguments + query string, plus the current version of
+        # every tag the route depends on
+        view_args = sorted((request.view_args or {}).items())
+        query = sorted(request.args.items(multi=True))
+        versions = self.backend.versions(tags)
+        return f"{request.endpoint}|{view_args}|{query}|{versions}"
+
+    def cached(self, ttl, tags=()):
+        """
+        Caches successful (200) responses of a GET view for `ttl` seconds.
+
+        Args:
+            ttl: seconds an entry stays fresh
+            tags: names of the data the response depends on; an entry is
+                dropped as soon as any of its tags is invalidated. Tags may
+                use the view's arguments, e.g. "customer:{customer_id}".
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or self.backend is None:
+                    return view(*args, **kwargs)
+                endpoint = request.endpoint
+                try:
+                    key = self._key([tag.format(**kwargs) for tag in tags])
+                    hit = self.backend.get(key)
+                except Exception:
+                    # a broken shared backend must not take the route down
+                    self._count(endpoint, "errors")
+                    return view(*args, **kwargs)
+
+                if hit is not None:
+                    self._count(endpoint, "hits")
+                    body, status, mimetype = hit
+                    response = make_response(body, status)
+                    response.mimetype = mimetype
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                self._count(endpoint, "misses")
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    try:
+                        self.backend.set(key, (response.get_data(), 200, response.mimetype), ttl)
+                    except Exception:
+                        self._count(endpoint, "errors")
+                response.headers["X-Cache"] = "MISS"
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        """Drops every cached response that depends on any of the tags."""
+        if self.backend is None:
+            return
+        for tag in tags:
+            try:
+                self.backend.bump(tag)
+            except Exception as e:
+                current_app.logger.warning(f"cache: could not invalidate '{tag}': {e}")
+
+    def stats(self):
+        with self._lock:
+            routes = {}
+            total_hits = total_misses = 0
+            for endpoint, counts in self._stats.items():
+                lookups = counts["hits"] + counts["misses"]
+                routes[endpoint] = dict(counts, hit_ratio=round(counts["hits"] / lookups, 4) if lookups else None)
+                total_hits += counts["hits"]
+                total_misses += counts["misses"]
+        lookups = total_hits + total_misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "entries": self.backend.size() if self.backend else 0,
+            "hits": total_hits,
+            "misses": total_misses,
+            "hit_ratio": round(total_hits / lookups, 4) if lookups else None,
+            "routes": routes,
+        }
+
+
+cache = ResponseCache()
@@ -0,0 +1,92 @@
+#------------------------------------------------------------
+# Storage backends for the response cache.
+#
+# A backend stores cached responses with a TTL and keeps an
+# integer version per invalidation tag. Cache keys embed the
+# current versions of their tags, so bumping a tag's version
+# makes every dependent key unreachable without a key scan.
+#------------------------------------------------------------
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUBackend:
+    """
+    Bounded in-process backend. Least recently used entries are evicted
+    once max_entries is reached; expired entries are dropped on read.
+
+    Tag versions live outside the LRU so they can never be evicted (an
+    evicted version would reset to 0 and revive stale entries). Each API
+    worker has its own copy, so an invalidation only reaches the worker
+    that handled the write; other workers catch up when their TTL expires.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def versions(self, tags):
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tag):
+        with self._lock:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Shared backend so every API worker sees the same entries and the same
+    invalidations. Needs the optional `redis` package and a CACHE_REDIS_URL.
+    """
+
+    def __init__(self, url, prefix="clueless:"):
+        import redis  # optional dependency, only needed for this backend
+
+        self._redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self._redis.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self._redis.set(self.prefix + key, pickle.dumps(value), ex=max(1, int(ttl)))
+
+    def versions(self, tags):
+        if not tags:
+            return []
+        raw = self._redis.mget([self.prefix + "tag:" + tag for tag in tags])
+        return [int(value) if value is not None else 0 for value in raw]
+
+    def bump(self, tag):
+        self._redis.incr(self.prefix + "tag:" + tag)
+
+    def size(self):
+        return None
@@ -1,10 +1,108 @@
 #------------------------------------------------------------
 # This file creates a shared DB connection resource
 #------------------------------------------------------------
-from flaskext.mysql import MySQL
+import os
+import threading
+
+import pymysql
+from flask import g
 from pymysql import cursors
 
+from backend.db_connection.id_sequence import IdAllocator
+from backend.db_connection.instrumentation import InstrumentedDictCursor, query_stats
+from backend.db_connection.pool import ConnectionPool
+
+# query_stats is re-exported for the routes and the benchmark
+__all__ = ["PooledMySQL", "db", "ids", "query_stats"]
+
+
+class PooledMySQL:
+    """
+    Drop-in replacement for flaskext.mysql's MySQL object.
+
+    db.get_db() still returns one connection per request, but the
+    connection is borrowed from a per-process pool and handed back
+    when the app context tears down instead of being closed.
+    """
+
+    def __init__(self, app=None, cursorclass=cursors.DictCursor):
+        self.cursorclass = cursorclass
+        self.app = None
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.config.setdefault("MYSQL_DATABASE_HOST", "localhost")
+        app.config.setdefault("MYSQL_DATABASE_PORT", 3306)
+        app.config.setdefault("MYSQL_DATABASE_USER", None)
+        app.config.setdefault("MYSQL_DATABASE_PASSWORD", None)
+        app.config.setdefault("MYSQL_DATABASE_DB", None)
+        app.config.setdefault("MYSQL_DATABASE_CHARSET", "utf8mb4")
+        app.config.setdefault("MYSQL_POOL_MIN_SIZE", 1)
+        app.config.setdefault("MYSQL_POOL_MAX_SIZE", 10)
+        app.config.setdefault("MYSQL_POOL_MAX_LIFETIME", 3600)
+        app.config.setdefault("MYSQL_POOL_TIMEOUT", 10)
+        app.config.setdefault("MYSQL_POOL_PING_INTERVAL", 30)
+        app.teardown_appcontext(self.teardown)
+
+    def connect(self):
+        """Open a brand new (unpooled) connection using the app config."""
+        config = self.app.config
+        return pymysql.connect(
+            host=config["MYSQL_DATABASE_HOST"],
+            port=config["MYSQL_DATABASE_PORT"],
+            user=config["MYSQL_DATABASE_USER"],
+            password=config["MYSQL_DATABASE_PASSWORD"],
+            db=config["MYSQL_DATABASE_DB"],
+            charset=config["MYSQL_DATABASE_CHARSET"],
+            cursorclass=self.cursorclass,
+        )
+
+    @property
+    def pool(self):
+        # a forked worker must not share sockets with its parent,
+        # so each process builds its own pool on first use
+        if self._pool is None or self._pool_pid != os.getpid():
+            with self._pool_lock:
+                # another thread may have built it while we waited
+                if self._pool is None or self._pool_pid != os.getpid():
+                    config = self.app.config
+                    self._pool = ConnectionPool(
+                        self.connect,
+                        min_size=config["MYSQL_POOL_MIN_SIZE"],
+                        max_size=config["MYSQL_POOL_MAX_SIZE"],
+                        max_lifetime=config["MYSQL_POOL_MAX_LIFETIME"],
+                        timeout=config["MYSQL_POOL_TIMEOUT"],
+                        ping_interval=config["MYSQL_POOL_PING_INTERVAL"],
+                    )
+                    self._pool_pid = os.getpid()
+        return self._pool
+
+    def get_db(self):
+        """Return this request's connection, checking one out on first use."""
+        if "mysql_conn" not in g:
+            g.mysql_conn = self.pool.checkout()
+        return g.mysql_conn.raw
+
+    def teardown(self, exception):
+        conn = g.pop("mysql_conn", None)
+        if conn is not None:
+            # back to the pool it came from, even if self.pool was rebuilt meanwhile
+            conn.pool.checkin(conn)
+
+    def pool_stats(self):
+        if self._pool is None or self._pool_pid != os.getpid():
+            return None
+        return self._pool.stats()
+
+
+# the parameter instructs the connection to return data
+# as a dictionary object (and to time every statement, see instrumentation.py).
+db = PooledMySQL(cursorclass=InstrumentedDictCursor)
 
-# the parameter instructs the connection to return data 
-# as a dictionary object. 
-db = MySQL(cursorclass=cursors.DictCursor)
\ No newline at end of file
+# primary key blocks for tables without AUTO_INCREMENT ids
+ids = IdAllocator(db)
@@ -0,0 +1,135 @@
+#------------------------------------------------------------
+# Hi/lo primary key allocation backed by the IdSequence table.
+#
+# Each API worker reserves a block of ids with a single atomic
+# UPDATE and then hands them out from memory, so an INSERT no
+# longer needs a SELECT MAX(...) probe first and two workers
+# can never be given the same id.
+#------------------------------------------------------------
+import os
+import threading
+
+
+# sequence name -> (table, id column, value MAX() falls back to on an empty table).
+# The fallbacks match the "(MAX(...) or 400) + 1" defaults the routes used before.
+SEQUENCES = {
+    "Outfit": ("Outfit", "OutfitID", 400),
+    "ClothingItem": ("ClothingItem", "ItemID", 400),
+    "Business": ("Business", "CompanyID", 40),
+    "BusinessNotification": ("BusinessNotification", "NotificationID", 400),
+    "CustomerNotification": ("CustomerNotification", "NotificationID", 400),
+    "BusinessInventoryItemStorage": ("BusinessInventoryItemStorage", "ItemID", 400),
+    "BusinessWishlistClothingItem": ("BusinessWishlistClothingItem", "ItemID", 400),
+    "CustWishListClothingItem": ("CustWishListClothingItem", "ItemID", 400),
+}
+
+
+class IdAllocator:
+    """
+    Hands out ids for the tables listed in SEQUENCES.
+
+    Args:
+        database: the PooledMySQL object; blocks are reserved on a dedicated
+            connection of its own (not one from the pool), so a refill commits
+            independently of the request's transaction and never waits for a
+            pool slot while the request already holds one
+        block_size: ids reserved per round trip to IdSequence
+    """
+
+    def __init__(self, database, block_size=20):
+        self.database = database
+        self.block_size = block_size
+        self._blocks = {}
+        # guards _blocks only; never held during database I/O
+        self._lock = threading.Lock()
+        self._refill_locks = {sequence: threading.Lock() for sequence in SEQUENCES}
+        self._conn = None
+        self._conn_lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        # blocks reserved before a fork (and the parent's connection) belong to the parent
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._blocks = {}
+                    self._refill_locks = {sequence: threading.Lock() for sequence in SEQUENCES}
+                    self._conn = None
+                    self._conn_lock = threading.Lock()
+                    self._pid = os.getpid()
+
+    def _take(self, sequence):
+        """The next id of the in-memory block, or None when it is used up; caller holds _lock."""
+        next_value, end = self._blocks.get(sequence, (0, 0))
+        if next_value >= end:
+            return None
+        self._blocks[sequence] = (next_value + 1, end)
+        return next_value
+
+    def next_id(self, sequence):
+        if sequence not in SEQUENCES:
+            raise KeyError(f"unknown id sequence: {sequence}")
+        self._check_fork()
+        with self._lock:
+            value = self._take(sequence)
+        if value is not None:
+            return value
+        # one refill per sequence at a time; the others keep handing out ids
+        with self._refill_locks[sequence]:
+            with self._lock:
+                value = self._take(sequence)
+            if value is not None:
+                # another thread refilled while we waited
+                return value
+            start, end = self._reserve_block(sequence)
+            with self._lock:
+                self._blocks[sequence] = (start + 1, end)
+            return start
+
+    def _connection(self):
+        """The allocator's own connection, opened on first use and reopened if it dropped."""
+        if self._conn is None:
+            self._conn = self.database.connect()
+        else:
+            self._conn.ping(reconnect=True)
+        return self._conn
+
+    def _reserve_block(self, sequence):
+        block_size = self.block_size
+        if self.database.app is not None:
+            block_size = self.database.app.config.get("ID_BLOCK_SIZE", block_size)
+        with self._conn_lock:
+            conn = self._connection()
+            try:
+                cursor = conn.cursor()
+                # LAST_INSERT_ID(expr) makes MySQL report the new value back in the
+                # OK packet, so the reservation is one statement with no SELECT
+                update = """
+                    UPDATE IdSequence
+                    SET NextValue = LAST_INSERT_ID(NextValue + %s)
+                    WHERE SequenceName = %s
+                """
+                cursor.execute(update, (block_size, sequence))
+                if cursor.rowcount == 0:
+                    self._seed(cursor, sequence)
+                    cursor.execute(update, (block_size, sequence))
+                end = cursor.lastrowid
+                conn.commit()
+                cursor.close()
+            except Exception:
+                # drop the connection; the next refill opens a fresh one
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                self._conn = None
+                raise
+        return end - block_size, end
+
+    def _seed(self, cursor, sequence):
+        # first use on a database created before IdSequence existed
+        table, column, fallback = SEQUENCES[sequence]
+        cursor.execute(f"""
+            INSERT IGNORE INTO IdSequence (SequenceName, NextValue)
+            SELECT %s, COALESCE(MAX({column}), %s) + 1 FROM {table}
+        """, (sequence, fallback))
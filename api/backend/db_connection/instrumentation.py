@@ -0,0 +1,137 @@
+#------------------------------------------------------------
+# Per-request SQL instrumentation.
+#
+# Every cursor handed out by db.get_db() is an InstrumentedDictCursor,
+# which records each statement it runs on flask.g. After the request
+# the statements are folded into rolling per-route aggregates that
+# GET /debug/queries reports, so N+1 patterns and slow joins show up
+# without a profiler.
+#------------------------------------------------------------
+import hashlib
+import re
+import threading
+import time
+from collections import deque
+
+from flask import current_app, g, has_app_context, request
+from pymysql import cursors
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class InstrumentedDictCursor(cursors.DictCursor):
+    """DictCursor that times every execute() and records it on the request."""
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            if has_app_context() and "sql_queries" in g:
+                g.sql_queries.append({
+                    "statement": _WHITESPACE.sub(" ", query).strip(),
+                    "params_hash": _params_hash(args),
+                    "rows": self.rowcount,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                })
+
+
+def _params_hash(args):
+    # a hash rather than the values, so the debug endpoint never leaks user data
+    if args is None:
+        return None
+    return hashlib.sha1(repr(args).encode()).hexdigest()[:12]
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class QueryStats:
+    """
+    Rolling per-route statistics over the last `window` requests of each
+    route, plus the full statement log of the last `recent` requests.
+    """
+
+    def __init__(self, window=1000, recent=50):
+        self.window = window
+        self.debug_headers = False
+        self.slow_request_ms = None
+        self._routes = {}
+        self._recent = deque(maxlen=recent)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault("SQL_INSTRUMENTATION", True)
+        app.config.setdefault("SQL_DEBUG_HEADERS", False)
+        app.config.setdefault("SQL_SLOW_REQUEST_MS", 500)
+        if not app.config["SQL_INSTRUMENTATION"]:
+            return
+        self.debug_headers = app.config["SQL_DEBUG_HEADERS"]
+        self.slow_request_ms = app.config["SQL_SLOW_REQUEST_MS"]
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def _before_request(self):
+        g.sql_queries = []
+
+    def _after_request(self, response):
+        queries = g.pop("sql_queries", None)
+        if queries is None:
+            return response
+        route = f"{request.method} {request.url_rule.rule if request.url_rule else request.path}"
+        db_time = round(sum(q["duration_ms"] for q in queries), 3)
+        rows = sum(max(q["rows"], 0) for q in queries)
+
+        with self._lock:
+            samples = self._routes.get(route)
+            if samples is None:
+                samples = self._routes[route] = deque(maxlen=self.window)
+            samples.append((len(queries), db_time, rows))
+            self._recent.append({
+                "route": route,
+                "path": request.full_path.rstrip("?"),
+                "status": response.status_code,
+                "query_count": len(queries),
+                "db_time_ms": db_time,
+                "queries": queries,
+            })
+
+        if self.slow_request_ms and db_time > self.slow_request_ms:
+            current_app.logger.warning(
+                f"slow request: {route} spent {db_time}ms in {len(queries)} queries"
+            )
+        if self.debug_headers:
+            response.headers["X-DB-Query-Count"] = str(len(queries))
+            response.headers["X-DB-Time-Ms"] = str(db_time)
+        return response
+
+    def route_stats(self):
+        with self._lock:
+            snapshot = {route: list(samples) for route, samples in self._routes.items()}
+        stats = {}
+        for route, samples in snapshot.items():
+            counts = sorted(s[0] for s in samples)
+            times = sorted(s[1] for s in samples)
+            rows = [s[2] for s in samples]
+            stats[route] = {
+                "requests": len(samples),
+                "queries_per_request_avg": round(sum(counts) / len(samples), 2),
+                "queries_per_request_max": counts[-1],
+                "db_time_ms_p50": _percentile(times, 50),
+                "db_time_ms_p95": _percentile(times, 95),
+                "db_time_ms_p99": _percentile(times, 99),
+                "rows_avg": round(sum(rows) / len(samples), 2),
+                "rows_total": sum(rows),
+            }
+        return stats
+
+    def recent_requests(self):
+        with self._lock:
+            return list(self._recent)
+
+
+query_stats = QueryStats()
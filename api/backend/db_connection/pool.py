@@ -0,0 +1,211 @@
+#------------------------------------------------------------
+# A small thread-safe pool of PyMySQL connections.
+#
+# Connections are created up to max_size, handed out one per
+# request and put back when the request's app context ends,
+# so routes skip the TCP + auth handshake on every call.
+#------------------------------------------------------------
+import os
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within the checkout timeout."""
+
+
+class _PooledConnection:
+    """
+    Wraps a raw PyMySQL connection with the bookkeeping the pool needs
+    (the pool it belongs to, when it was opened and when it was last
+    handed back).
+    """
+
+    def __init__(self, raw, pool):
+        self.raw = raw
+        self.pool = pool
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+
+    def age(self):
+        return time.monotonic() - self.created_at
+
+    def idle_for(self):
+        return time.monotonic() - self.last_used_at
+
+
+class ConnectionPool:
+    """
+    Keeps between min_size and max_size open connections.
+
+    Args:
+        connect: zero-argument callable that opens a new raw connection
+        min_size: connections opened up front and kept around when idle
+        max_size: hard cap on open connections; extra callers wait
+        max_lifetime: seconds before a connection is retired and replaced
+        timeout: seconds a caller waits for a free connection
+        ping_interval: connections idle longer than this are pinged
+            before being handed out (0 pings on every checkout)
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, max_lifetime=3600,
+                 timeout=10, ping_interval=30):
+        if min_size > max_size:
+            raise ValueError("min_size cannot be larger than max_size")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        self._idle = []
+        self._open = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+        # running totals used by stats()
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._checkout_time_total = 0.0
+        self._checkout_time_max = 0.0
+        self._created = 0
+        self._discarded = 0
+        self._timeouts = 0
+
+        for _ in range(min_size):
+            self._idle.append(self._new_connection())
+
+    def _new_connection(self):
+        conn = _PooledConnection(self._connect(), self)
+        self._open += 1
+        self._created += 1
+        return conn
+
+    def _discard(self, conn):
+        self._open -= 1
+        self._discarded += 1
+        try:
+            conn.raw.close()
+        except Exception:
+            pass
+
+    def _expired(self, conn):
+        return bool(self.max_lifetime) and conn.age() > self.max_lifetime
+
+    def _ping(self, conn):
+        try:
+            conn.raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def checkout(self):
+        """Return a healthy raw connection, waiting up to `timeout` seconds."""
+        started = time.monotonic()
+        waited = 0.0
+        with self._cond:
+            while True:
+                if self._idle:
+                    # most recently used first, so the tail of the list can age out
+                    conn = self._idle.pop()
+                    if self._expired(conn):
+                        self._discard(conn)
+                        continue
+                    if conn.idle_for() >= self.ping_interval:
+                        # the popped connection still counts in _open, so the
+                        # ping can run without blocking other checkouts/checkins
+                        self._cond.release()
+                        try:
+                            healthy = self._ping(conn)
+                        finally:
+                            self._cond.acquire()
+                        if not healthy:
+                            self._discard(conn)
+                            self._cond.notify()
+                            continue
+                    break
+                if self._open < self.max_size:
+                    # reserve the slot, then connect without holding the lock
+                    self._open += 1
+                    self._cond.release()
+                    try:
+                        conn = _PooledConnection(self._connect(), self)
+                    except Exception:
+                        self._cond.acquire()
+                        self._open -= 1
+                        self._cond.notify()
+                        raise
+                    self._cond.acquire()
+                    self._created += 1
+                    break
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"no database connection free after {self.timeout}s "
+                        f"({self._in_use} in use, max {self.max_size})"
+                    )
+                wait_started = time.monotonic()
+                self._cond.wait(remaining)
+                waited += time.monotonic() - wait_started
+
+            self._in_use += 1
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+                self._wait_time_total += waited
+                self._wait_time_max = max(self._wait_time_max, waited)
+            elapsed = time.monotonic() - started
+            self._checkout_time_total += elapsed
+            self._checkout_time_max = max(self._checkout_time_max, elapsed)
+            return conn
+
+    def checkin(self, conn):
+        """Hand a connection back. Any open transaction is rolled back first."""
+        broken = False
+        try:
+            conn.raw.rollback()
+        except Exception:
+            broken = True
+        with self._cond:
+            self._in_use -= 1
+            if broken or self._expired(conn):
+                self._discard(conn)
+            elif len(self._idle) >= self.max_size:
+                self._discard(conn)
+            else:
+                conn.last_used_at = time.monotonic()
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def close(self):
+        """Close every idle connection. Checked-out ones close on check-in."""
+        with self._cond:
+            while self._idle:
+                self._discard(self._idle.pop())
+            self.max_size = 0
+
+    def stats(self):
+        """Snapshot of pool usage, suitable for logging or a JSON response."""
+        with self._cond:
+            checkouts = self._checkouts or 1
+            return {
+                "pid": os.getpid(),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "wait_time_total_ms": round(self._wait_time_total * 1000, 3),
+                "wait_time_max_ms": round(self._wait_time_max * 1000, 3),
+                "checkout_latency_avg_ms": round(self._checkout_time_total * 1000 / checkouts, 3),
+                "checkout_latency_max_ms": round(self._checkout_time_max * 1000, 3),
+            }
@@ -0,0 +1,223 @@
+#------------------------------------------------------------
+# Aesthetic bitsets for wishlist <-> closet matching.
+#
+# Every Aesthetic gets a bit position. A clothing item's bitset has
+# the bits of its aesthetics (ClothingItemMatchedAesthetic), and a
+# customer's closet bitset is the OR of the bitsets of every item in
+# their closets. Whether a wishlist item suits a closet is then a
+# single AND, and the number of shared bits is the overlap strength:
+#
+#   aesthetic_index.matches(cursor, customer_id, wishlist_item_ids)
+#
+# Item bitsets are reloaded every MATCHING_REFRESH_SECONDS; closet
+# bitsets are built on first use and kept up to date by
+# closet_item_added(). For offline runs over every customer, see
+# batch_matches() and:
+#
+#   python -m backend.matching.aesthetics --top 5
+#------------------------------------------------------------
+import argparse
+import json
+import sys
+import threading
+import time
+
+import numpy as np
+
+# set bits in each byte value, for popcounts over uint8 views
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def bit_positions(bits):
+    position = 0
+    while bits:
+        if bits & 1:
+            yield position
+        bits >>= 1
+        position += 1
+
+
+class AestheticIndex:
+
+    def __init__(self):
+        self.refresh_seconds = 300.0
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._positions = {}
+        self._names = []
+        self._item_bits = {}
+        # customer id -> (monotonic time built, closet bitset)
+        self._customer_bits = {}
+
+    def init_app(self, app):
+        app.config.setdefault("MATCHING_REFRESH_SECONDS", 300.0)
+        self.refresh_seconds = app.config["MATCHING_REFRESH_SECONDS"]
+
+    def _fresh(self, built_at):
+        return built_at is not None and time.monotonic() - built_at <= self.refresh_seconds
+
+    def load(self, cursor):
+        """Reads every aesthetic and item -> aesthetic pair, and forgets the closet bitsets."""
+        cursor.execute("SELECT AestheticID, Name FROM Aesthetic ORDER BY AestheticID")
+        aesthetics = cursor.fetchall()
+        positions = {row["AestheticID"]: bit for bit, row in enumerate(aesthetics)}
+        cursor.execute("SELECT ClothingItemID, AestheticID FROM ClothingItemMatchedAesthetic")
+        item_bits = {}
+        for row in cursor.fetchall():
+            bit = positions.get(row["AestheticID"])
+            if bit is not None:
+                item_bits[row["ClothingItemID"]] = item_bits.get(row["ClothingItemID"], 0) | (1 << bit)
+        with self._lock:
+            self._positions = positions
+            self._names = [row["Name"] for row in aesthetics]
+            self._item_bits = item_bits
+            self._customer_bits = {}
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self, cursor):
+        if not self._fresh(self._loaded_at):
+            self.load(cursor)
+
+    def customer_bits(self, cursor, customer_id):
+        """The OR of the aesthetic bitsets of every item in the customer's closets."""
+        self._ensure_loaded(cursor)
+        with self._lock:
+            built_at, bits = self._customer_bits.get(customer_id, (None, 0))
+        if self._fresh(built_at):
+            return bits
+        cursor.execute("""
+            SELECT DISTINCT cci.ClothingItemID
+            FROM CustomerCloset cc
+            JOIN CustomerClosetClothingItems cci ON cc.ClosetID = cci.ClosetID
+            WHERE cc.CustomerID = %s
+        """, (customer_id,))
+        with self._lock:
+            bits = 0
+            for row in cursor.fetchall():
+                bits |= self._item_bits.get(row["ClothingItemID"], 0)
+            self._customer_bits[customer_id] = (time.monotonic(), bits)
+        return bits
+
+    def closet_item_added(self, customer_id, item_id):
+        """Applies a committed closet add to the customer's bitset, if it is built."""
+        with self._lock:
+            built = self._customer_bits.get(customer_id)
+            if built is not None:
+                self._customer_bits[customer_id] = (built[0], built[1] | self._item_bits.get(item_id, 0))
+
+    def matches(self, cursor, customer_id, item_ids):
+        """
+        Returns:
+            [{ItemID, Overlap, SharedAesthetics}] for the items sharing at least
+            one aesthetic with the customer's closet, strongest overlap first
+            (then the larger share of the item's own aesthetics, then ItemID)
+        """
+        closet = self.customer_bits(cursor, customer_id)
+        ranked = []
+        with self._lock:
+            for item_id in set(item_ids):
+                item = self._item_bits.get(item_id, 0)
+                shared = item & closet
+                if shared:
+                    overlap = shared.bit_count()
+                    ranked.append((-overlap, -overlap / item.bit_count(), item_id, shared))
+            ranked.sort()
+            return [
+                {
+                    "ItemID": item_id,
+                    "Overlap": -negative_overlap,
+                    "SharedAesthetics": [self._names[bit] for bit in bit_positions(shared)],
+                }
+                for negative_overlap, _, item_id, shared in ranked
+            ]
+
+    def _word_matrix(self, bitsets):
+        """Python int bitsets -> uint64 matrix with one row of 64-bit words per bitset."""
+        words = max(1, (len(self._positions) + 63) // 64)
+        matrix = np.zeros((len(bitsets), words), dtype=np.uint64)
+        for row, bits in enumerate(bitsets):
+            for word in range(words):
+                matrix[row, word] = (bits >> (64 * word)) & 0xFFFFFFFFFFFFFFFF
+        return matrix
+
+    def batch_matches(self, cursor, top=5):
+        """
+        Ranks the wishlist items of every customer against their closet in one
+        vectorized pass (bitwise AND + popcount over all pairs at once).
+
+        Returns:
+            {customer id: [(item id, overlap), ...]} with up to `top` items each
+        """
+        self.load(cursor)
+        cursor.execute("""
+            SELECT cc.CustomerID, cima.AestheticID
+            FROM CustomerCloset cc
+            JOIN CustomerClosetClothingItems cci ON cc.ClosetID = cci.ClosetID
+            JOIN ClothingItemMatchedAesthetic cima ON cci.ClothingItemID = cima.ClothingItemID
+            GROUP BY cc.CustomerID, cima.AestheticID
+        """)
+        closet_rows = [(row["CustomerID"], row["AestheticID"]) for row in cursor.fetchall()]
+        cursor.execute("""
+            SELECT DISTINCT cw.CustomerID, cwci.ClothingItemID
+            FROM CustomerWishlist cw
+            JOIN CustWishListClothingItem cwci ON cw.WishlistID = cwci.WishlistID
+        """)
+        pairs = np.array([(row["CustomerID"], row["ClothingItemID"]) for row in cursor.fetchall()],
+                         dtype=np.int64).reshape(-1, 2)
+
+        customers = np.unique(pairs[:, 0])
+        items = np.unique(pairs[:, 1])
+        closet_bits = {}
+        with self._lock:
+            for customer_id, aesthetic_id in closet_rows:
+                bit = self._positions.get(aesthetic_id)
+                if bit is not None:
+                    closet_bits[customer_id] = closet_bits.get(customer_id, 0) | (1 << bit)
+            closets = self._word_matrix([closet_bits.get(c, 0) for c in customers.tolist()])
+            item_matrix = self._word_matrix([self._item_bits.get(i, 0) for i in items.tolist()])
+
+        customer_idx = np.searchsorted(customers, pairs[:, 0])
+        item_idx = np.searchsorted(items, pairs[:, 1])
+        shared = closets[customer_idx] & item_matrix[item_idx]
+        overlap = _POPCOUNT[shared.view(np.uint8)].reshape(len(pairs), -1).sum(axis=1)
+
+        keep = overlap > 0
+        pairs, overlap = pairs[keep], overlap[keep]
+        # by customer, then strongest overlap first, then item id
+        order = np.lexsort((pairs[:, 1], -overlap.astype(np.int64), pairs[:, 0]))
+        results = {}
+        for (customer_id, item_id), strength in zip(pairs[order].tolist(), overlap[order].tolist()):
+            ranked = results.setdefault(customer_id, [])
+            if len(ranked) < top:
+                ranked.append((item_id, strength))
+        return results
+
+
+aesthetic_index = AestheticIndex()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank every customer's wishlist against their closet.")
+    parser.add_argument("--top", type=int, default=5, help="matches kept per customer")
+    parser.add_argument("--out", help="write {customer id: [[item id, overlap], ...]} to this JSON file")
+    args = parser.parse_args()
+
+    from backend.db_connection import db
+    from backend.rest_entry import create_app
+
+    app = create_app()
+    with app.app_context():
+        cursor = db.get_db().cursor()
+        started = time.perf_counter()
+        results = aesthetic_index.batch_matches(cursor, args.top)
+        elapsed = time.perf_counter() - started
+    print(f"matched {len(results)} customers in {elapsed:.2f}s "
+          f"({len(results) / elapsed if elapsed else 0:.0f} customers/s, including the reads)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#------------------------------------------------------------
+# Wishlist <-> inventory matching.
+#
+# Two inverted indexes keyed by ClothingItemID:
+#
+#   suppliers:   item -> {CompanyID: units in stock}   (QuantityInStock > 0)
+#   wishlisters: item -> {(CustomerID, WishlistID): wishlist entries}
+#
+# so "which businesses can fill the demand for this item" and "which
+# wishlists does stocking this item satisfy" are one dict lookup each
+# and cost O(matches):
+#
+#   inventory_matcher.suppliers(cursor, item_id)
+#   inventory_matcher.wishlists(cursor, item_id)
+#
+# load() recomputes both indexes from the tables (the bulk mode; it
+# also runs every MATCHING_REFRESH_SECONDS to pick up writes made by
+# other API processes). The inventory and wishlist routes apply their
+# own writes through the stocked/unstocked/wishlisted/unwishlisted
+# methods after they commit.
+#------------------------------------------------------------
+import threading
+import time
+
+
+class InventoryMatcher:
+
+    def __init__(self):
+        self.refresh_seconds = 300.0
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._suppliers = {}
+        self._wishlisters = {}
+        self._companies = {}
+
+    def init_app(self, app):
+        app.config.setdefault("MATCHING_REFRESH_SECONDS", 300.0)
+        self.refresh_seconds = app.config["MATCHING_REFRESH_SECONDS"]
+
+    def load(self, cursor):
+        """Recomputes both indexes from BusinessInventoryItemStorage and the customer wishlists."""
+        cursor.execute("""
+            SELECT BIIS.ClothingItemID, BI.CompanyID, b.CompanyName, SUM(BIIS.QuantityInStock) AS Units
+            FROM BusinessInventoryItemStorage BIIS
+            JOIN BusinessInventory BI ON BIIS.InventoryID = BI.InventoryID
+            JOIN Business b ON BI.CompanyID = b.CompanyID
+            WHERE BIIS.QuantityInStock > 0
+            GROUP BY BIIS.ClothingItemID, BI.CompanyID, b.CompanyName
+        """)
+        suppliers = {}
+        companies = {}
+        for row in cursor.fetchall():
+            suppliers.setdefault(row["ClothingItemID"], {})[row["CompanyID"]] = int(row["Units"])
+            companies[row["CompanyID"]] = row["CompanyName"]
+        cursor.execute("""
+            SELECT cwci.ClothingItemID, cw.CustomerID, cw.WishlistID, COUNT(*) AS Entries
+            FROM CustWishListClothingItem cwci
+            JOIN CustomerWishlist cw ON cwci.WishlistID = cw.WishlistID
+            GROUP BY cwci.ClothingItemID, cw.CustomerID, cw.WishlistID
+        """)
+        wishlisters = {}
+        for row in cursor.fetchall():
+            wishlisters.setdefault(row["ClothingItemID"], {})[(row["CustomerID"], row["WishlistID"])] = row["Entries"]
+        with self._lock:
+            self._suppliers, self._wishlisters, self._companies = suppliers, wishlisters, companies
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self, cursor):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            self.load(cursor)
+
+    # ---- queries ----
+
+    def suppliers(self, cursor, item_id):
+        """[{CompanyID, CompanyName, QuantityInStock}] with the item in stock, most units first."""
+        self._ensure_loaded(cursor)
+        with self._lock:
+            stock = self._suppliers.get(item_id, {})
+            found = [
+                {"CompanyID": company_id, "CompanyName": self._companies.get(company_id),
+                 "QuantityInStock": units}
+                for company_id, units in stock.items()
+            ]
+        found.sort(key=lambda supplier: (-supplier["QuantityInStock"], supplier["CompanyID"]))
+        return found
+
+    def wishlists(self, cursor, item_id):
+        """[{CustomerID, WishlistID}] of the customer wishlists holding the item."""
+        self._ensure_loaded(cursor)
+        with self._lock:
+            holders = list(self._wishlisters.get(item_id, {}))
+        holders.sort()
+        return [{"CustomerID": customer_id, "WishlistID": wishlist_id} for customer_id, wishlist_id in holders]
+
+    def wishlist_count(self, cursor, item_id):
+        self._ensure_loaded(cursor)
+        with self._lock:
+            return len(self._wishlisters.get(item_id, {}))
+
+    def company_name(self, cursor, company_id):
+        """The business's name from the index, or read from Business for a first-time supplier."""
+        with self._lock:
+            if company_id in self._companies:
+                return self._companies[company_id]
+        cursor.execute("SELECT CompanyName FROM Business WHERE CompanyID = %s", (company_id,))
+        row = cursor.fetchone()
+        return row["CompanyName"] if row else None
+
+    # ---- incremental updates (after the route commits) ----
+
+    def stocked(self, company_id, item_id, units, company_name):
+        """company_name comes from company_name(), read before the route commits."""
+        if units <= 0:
+            return
+        with self._lock:
+            self._companies.setdefault(company_id, company_name)
+            stock = self._suppliers.setdefault(item_id, {})
+            stock[company_id] = stock.get(company_id, 0) + units
+
+    def unstocked(self, company_id, item_id):
+        with self._lock:
+            stock = self._suppliers.get(item_id)
+            if stock is not None:
+                stock.pop(company_id, None)
+                if not stock:
+                    del self._suppliers[item_id]
+
+    def wishlisted(self, customer_id, wishlist_id, item_id):
+        with self._lock:
+            holders = self._wishlisters.setdefault(item_id, {})
+            holders[(customer_id, wishlist_id)] = holders.get((customer_id, wishlist_id), 0) + 1
+
+    def unwishlisted(self, customer_id, wishlist_id, item_id):
+        with self._lock:
+            holders = self._wishlisters.get(item_id)
+            if holders is not None:
+                holders.pop((customer_id, wishlist_id), None)
+                if not holders:
+                    del self._wishlisters[item_id]
+
+
+inventory_matcher = InventoryMatcher()
@@ -0,0 +1,136 @@
+#------------------------------------------------------------
+# Complete-outfit and near-miss detection.
+#
+# The index keeps every outfit's item set (CustomerOutfitsOfClothingItems)
+# and the inverted index item -> outfits containing it. For a customer
+# it walks only the outfits that contain one of their closet items and
+# counts how many of each outfit's items they own:
+#
+#   owned == len(outfit items)       -> a complete, wearable outfit
+#   len(outfit items) - owned <= k   -> a near miss, missing k items
+#
+#   complete, near = outfit_index.wearable(cursor, customer_id, max_missing=1)
+#
+# Outfit item sets are reloaded every MATCHING_REFRESH_SECONDS; a
+# customer's owned items are read on first use and kept up to date by
+# closet_item_added().
+#------------------------------------------------------------
+import threading
+import time
+
+
+class OutfitIndex:
+
+    def __init__(self):
+        self.refresh_seconds = 300.0
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._outfit_items = {}
+        self._item_outfits = {}
+        self._names = {}
+        # customer id -> (monotonic time read, set of owned item ids)
+        self._owned = {}
+
+    def init_app(self, app):
+        app.config.setdefault("MATCHING_REFRESH_SECONDS", 300.0)
+        self.refresh_seconds = app.config["MATCHING_REFRESH_SECONDS"]
+
+    def _fresh(self, built_at):
+        return built_at is not None and time.monotonic() - built_at <= self.refresh_seconds
+
+    def load(self, cursor):
+        """Reads every outfit's items, rebuilds the item -> outfits index and forgets the owned items."""
+        cursor.execute("""
+            SELECT o.OutfitID, o.Nickname, coci.ClothingItemID
+            FROM Outfit o
+            JOIN CustomerOutfitsOfClothingItems coci ON o.OutfitID = coci.OutfitID
+        """)
+        outfit_items = {}
+        item_outfits = {}
+        names = {}
+        for row in cursor.fetchall():
+            outfit_items.setdefault(row["OutfitID"], set()).add(row["ClothingItemID"])
+            item_outfits.setdefault(row["ClothingItemID"], []).append(row["OutfitID"])
+            names[row["OutfitID"]] = row["Nickname"]
+        with self._lock:
+            self._outfit_items = {outfit_id: frozenset(items) for outfit_id, items in outfit_items.items()}
+            self._item_outfits = item_outfits
+            self._names = names
+            # every customer read since the last load would stay in memory otherwise
+            self._owned = {}
+            self._loaded_at = time.monotonic()
+
+    def owned_items(self, cursor, customer_id):
+        with self._lock:
+            read_at, owned = self._owned.get(customer_id, (None, None))
+        if self._fresh(read_at):
+            return owned
+        cursor.execute("""
+            SELECT DISTINCT cci.ClothingItemID
+            FROM CustomerCloset cc
+            JOIN CustomerClosetClothingItems cci ON cc.ClosetID = cci.ClosetID
+            WHERE cc.CustomerID = %s
+        """, (customer_id,))
+        owned = {row["ClothingItemID"] for row in cursor.fetchall()}
+        with self._lock:
+            self._owned[customer_id] = (time.monotonic(), owned)
+        return owned
+
+    def closet_item_added(self, customer_id, item_id):
+        """Applies a committed closet add to the customer's owned items, if they are read."""
+        with self._lock:
+            read = self._owned.get(customer_id)
+            if read is not None:
+                read[1].add(item_id)
+
+    def wearable(self, cursor, customer_id, max_missing=1):
+        """
+        Returns:
+            (complete, near_misses). complete is [{OutfitID, OutfitName, ItemIDs}]
+            in OutfitID order; near_misses is [{OutfitID, OutfitName, ItemIDs,
+            MissingItemIDs}] for outfits missing 1..max_missing items, fewest
+            missing first, then most items owned.
+        """
+        if not self._fresh(self._loaded_at):
+            self.load(cursor)
+        owned = self.owned_items(cursor, customer_id)
+        with self._lock:
+            hits = {}
+            for item_id in owned:
+                for outfit_id in self._item_outfits.get(item_id, ()):
+                    hits[outfit_id] = hits.get(outfit_id, 0) + 1
+            complete = []
+            near = []
+            for outfit_id, count in hits.items():
+                items = self._outfit_items[outfit_id]
+                missing = len(items) - count
+                if missing == 0:
+                    complete.append({"OutfitID": outfit_id, "OutfitName": self._names[outfit_id],
+                                     "ItemIDs": sorted(items)})
+                elif missing <= max_missing:
+                    near.append({"OutfitID": outfit_id, "OutfitName": self._names[outfit_id],
+                                 "ItemIDs": sorted(items), "MissingItemIDs": sorted(items - owned)})
+        complete.sort(key=lambda outfit: outfit["OutfitID"])
+        near.sort(key=lambda outfit: (len(outfit["MissingItemIDs"]), -len(outfit["ItemIDs"]), outfit["OutfitID"]))
+        return complete, near
+
+
+def add_item_names(cursor, *outfit_lists):
+    """Adds Items (names) and, for near misses, Missing ([{ItemID, Name}]) in one query."""
+    item_ids = {item_id for outfits in outfit_lists for outfit in outfits for item_id in outfit["ItemIDs"]}
+    names = {}
+    if item_ids:
+        cursor.execute(
+            f"SELECT ItemID, Name FROM ClothingItem WHERE ItemID IN ({', '.join(['%s'] * len(item_ids))})",
+            tuple(item_ids),
+        )
+        names = {row["ItemID"]: row["Name"] for row in cursor.fetchall()}
+    for outfits in outfit_lists:
+        for outfit in outfits:
+            outfit["Items"] = [names.get(item_id) for item_id in outfit["ItemIDs"]]
+            if "MissingItemIDs" in outfit:
+                outfit["Missing"] = [{"ItemID": item_id, "Name": names.get(item_id)}
+                                     for item_id in outfit["MissingItemIDs"]]
+
+
+outfit_index = OutfitIndex()
@@ -0,0 +1,278 @@
+#------------------------------------------------------------
+# Request metrics in the Prometheus text exposition format.
+#
+# Every request thread updates its own shard of counters, so the
+# hot path never takes a lock; shards are only summed when
+# GET /metrics is scraped. With METRICS_MULTIPROC_DIR set, each
+# API worker process also dumps its totals to a file there and
+# the scrape merges the files of every worker.
+#------------------------------------------------------------
+import glob
+import json
+import os
+import threading
+import time
+
+from flask import g, request
+
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+SIZE_BUCKETS = [100, 1000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+
+class _Shard:
+    """Counters owned by a single thread; only that thread ever writes them."""
+
+    def __init__(self, thread=None):
+        self.thread = thread
+        self.requests = {}
+        self.latency = {}
+        self.size = {}
+        self.in_flight = 0
+
+
+def _observe(histograms, key, buckets, value):
+    hist = histograms.get(key)
+    if hist is None:
+        # one slot per bucket, then +Inf, sum, count
+        hist = histograms[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            hist[index] += 1
+            break
+    else:
+        hist[len(buckets)] += 1
+    hist[-2] += value
+    hist[-1] += 1
+
+
+def _merge_hist(into, key, hist):
+    current = into.get(key)
+    if current is None:
+        into[key] = list(hist)
+    else:
+        for index, value in enumerate(hist):
+            current[index] += value
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metrics:
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        # totals of shards whose thread has exited (see _retire_dead_shards)
+        self._retired = _Shard()
+        self.multiproc_dir = None
+        self.flush_interval = 5
+        self._last_flush = 0.0
+        self._pool_stats = None
+
+    def init_app(self, app, pool_stats=None):
+        """
+        Args:
+            pool_stats: zero-argument callable returning the DB pool stats
+                dict of this worker (or None before the pool exists)
+        """
+        app.config.setdefault("METRICS_MULTIPROC_DIR", None)
+        app.config.setdefault("METRICS_FLUSH_INTERVAL", 5)
+        self.multiproc_dir = app.config["METRICS_MULTIPROC_DIR"]
+        self.flush_interval = app.config["METRICS_FLUSH_INTERVAL"]
+        if self.multiproc_dir:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+        self._pool_stats = pool_stats
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._shards_lock:
+                self._shards.append(shard)
+                if len(self._shards) > 64:
+                    self._retire_dead_shards()
+        return shard
+
+    def _retire_dead_shards(self):
+        # the dev server starts a thread per request, so fold the shards of
+        # finished threads into one total; a dead thread can no longer write
+        # its shard, so this needs no coordination with the hot path
+        alive = []
+        for shard in self._shards:
+            if shard.thread.is_alive():
+                alive.append(shard)
+                continue
+            for key, count in shard.requests.items():
+                self._retired.requests[key] = self._retired.requests.get(key, 0) + count
+            for key, hist in shard.latency.items():
+                _merge_hist(self._retired.latency, key, hist)
+            for key, hist in shard.size.items():
+                _merge_hist(self._retired.size, key, hist)
+        self._shards = alive
+
+    # ---- hot path ---------------------------------------------------------
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        self._shard().in_flight += 1
+
+    def _after_request(self, response):
+        started = g.get("metrics_started")
+        if started is None:
+            return response
+        shard = self._shard()
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        key = (request.blueprint or "", route, request.method)
+        status_key = key + (str(response.status_code),)
+        shard.requests[status_key] = shard.requests.get(status_key, 0) + 1
+        _observe(shard.latency, key, LATENCY_BUCKETS, time.perf_counter() - started)
+        size = response.calculate_content_length()
+        if size is not None:
+            _observe(shard.size, key, SIZE_BUCKETS, size)
+
+        if self.multiproc_dir and time.monotonic() - self._last_flush > self.flush_interval:
+            self._flush()
+        return response
+
+    def _teardown_request(self, exception):
+        if g.pop("metrics_started", None) is not None:
+            self._shard().in_flight -= 1
+
+    # ---- aggregation ------------------------------------------------------
+
+    def snapshot(self):
+        """Sum of every thread shard of this process, in a JSON-friendly shape."""
+        requests, latency, size, in_flight = {}, {}, {}, 0
+        with self._shards_lock:
+            self._retire_dead_shards()
+            shards = [self._retired] + self._shards
+        for shard in shards:
+            for key, count in list(shard.requests.items()):
+                requests[key] = requests.get(key, 0) + count
+            for key, hist in list(shard.latency.items()):
+                _merge_hist(latency, key, hist)
+            for key, hist in list(shard.size.items()):
+                _merge_hist(size, key, hist)
+            in_flight += shard.in_flight
+        return {
+            "pid": os.getpid(),
+            "written_at": time.time(),
+            "requests": [[list(k), v] for k, v in requests.items()],
+            "latency": [[list(k), v] for k, v in latency.items()],
+            "size": [[list(k), v] for k, v in size.items()],
+            "in_flight": in_flight,
+            "pool": self._pool_stats() if self._pool_stats else None,
+        }
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        path = os.path.join(self.multiproc_dir, f"metrics_{os.getpid()}.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _collect(self):
+        if not self.multiproc_dir:
+            return [self.snapshot()]
+        self._flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.multiproc_dir, "metrics_*.json")):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def render(self):
+        """All workers' metrics in the Prometheus text exposition format."""
+        snapshots = self._collect()
+        requests, latency, size = {}, {}, {}
+        in_flight = 0
+        # gauges of workers that stopped reporting are left out
+        live_after = time.time() - 3 * self.flush_interval
+        for snap in snapshots:
+            for key, count in snap["requests"]:
+                requests[tuple(key)] = requests.get(tuple(key), 0) + count
+            for key, hist in snap["latency"]:
+                _merge_hist(latency, tuple(key), hist)
+            for key, hist in snap["size"]:
+                _merge_hist(size, tuple(key), hist)
+            if snap["written_at"] >= live_after:
+                in_flight += snap["in_flight"]
+
+        route_labels = ("blueprint", "route", "method")
+        lines = [
+            "# HELP clueless_http_requests_total HTTP requests by route and status code.",
+            "# TYPE clueless_http_requests_total counter",
+        ]
+        for key, count in sorted(requests.items()):
+            lines.append(f"clueless_http_requests_total{_labels(route_labels + ('status',), key)} {count}")
+
+        lines += self._render_hist(
+            "clueless_http_request_duration_seconds",
+            "HTTP request latency by route template.",
+            latency, LATENCY_BUCKETS, route_labels,
+        )
+        lines += self._render_hist(
+            "clueless_http_response_size_bytes",
+            "HTTP response body size by route template.",
+            size, SIZE_BUCKETS, route_labels,
+        )
+        lines += [
+            "# HELP clueless_http_requests_in_flight Requests currently being served.",
+            "# TYPE clueless_http_requests_in_flight gauge",
+            f"clueless_http_requests_in_flight {in_flight}",
+        ]
+
+        pool_gauges = [
+            ("open", "Open DB connections."),
+            ("idle", "Idle DB connections."),
+            ("in_use", "DB connections checked out by requests."),
+            ("max_size", "Configured DB pool size limit."),
+        ]
+        pool_counters = [
+            ("checkouts", "DB connection checkouts."),
+            ("waits", "Checkouts that had to wait for a free connection."),
+            ("timeouts", "Checkouts that gave up waiting."),
+        ]
+        pools = [s["pool"] for s in snapshots if s.get("pool") and s["written_at"] >= live_after]
+        for field, help_text in pool_gauges:
+            lines.append(f"# HELP clueless_db_pool_{field} {help_text}")
+            lines.append(f"# TYPE clueless_db_pool_{field} gauge")
+            for pool in pools:
+                lines.append(f'clueless_db_pool_{field}{{pid="{pool["pid"]}"}} {pool[field]}')
+        for field, help_text in pool_counters:
+            lines.append(f"# HELP clueless_db_pool_{field}_total {help_text}")
+            lines.append(f"# TYPE clueless_db_pool_{field}_total counter")
+            for pool in pools:
+                lines.append(f'clueless_db_pool_{field}_total{{pid="{pool["pid"]}"}} {pool[field]}')
+        return "\n".join(lines) + "\n"
+
+    def _render_hist(self, name, help_text, histograms, buckets, label_names):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, hist in sorted(histograms.items()):
+            cumulative = 0
+            for index, bound in enumerate(buckets + ["+Inf"]):
+                cumulative += hist[index]
+                le = f'le="{bound}"'
+                lines.append(f"{name}_bucket{_labels(label_names, key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(label_names, key)} {round(hist[-2], 6)}")
+            lines.append(f"{name}_count{_labels(label_names, key)} {hist[-1]}")
+        return lines
+
+
+metrics = Metrics()
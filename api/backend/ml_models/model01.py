@@ -1,45 +1,293 @@
 """
 model01.py is an example of how to access model parameter values that you are storing
 in the database and use them to make a prediction when a route associated with prediction is
-accessed. 
+accessed.
+
+The parameters are versioned artifacts in the model registry (registry.py) under the
+name "model01". The active version's vector is memory-mapped once and kept in memory with
+its version number. At most every MODEL_PARAMS_PROBE_SECONDS the cache asks ActiveModel
+which version is live and only maps a new file when that changed; publish() pushes freshly
+trained parameters straight into the cache. In between, predict() does no database work at
+all. The old text parameters in model1_params are imported as the first version by
+warm_up() when nothing is registered yet.
+
+train() fits the parameters by least squares, reading the training rows in chunks of
+TRAIN_CHUNK_ROWS and keeping only X^T X and X^T y; test() computes holdout metrics the
+same way. Both report their run time and the process's peak RSS; run from the command line
+they also trace the job's peak Python memory. From the api folder:
+
+  python -m backend.ml_models.model01 --train --test --chunk-rows 10000
 """
+import argparse
+import json
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+
 from backend.db_connection import db
+from backend.ml_models.registry import registry
 import numpy as np
 # import logging
 
 from flask import current_app
 
-def train():
+
+MODEL_NAME = 'model01'
+
+
+class ParamCache:
+  """The active model01 parameter vector (read-only), keyed by its registry version."""
+
+  def __init__(self):
+    self.probe_seconds = 5.0
+    self._lock = threading.Lock()
+    self._version = None
+    self._params = None
+    self._probed_at = None
+
+  def init_app(self, app):
+    app.config.setdefault("MODEL_PARAMS_PROBE_SECONDS", 5.0)
+    self.probe_seconds = app.config["MODEL_PARAMS_PROBE_SECONDS"]
+
+  def publish(self, version, params):
+    """Installs parameters this process just promoted."""
+    with self._lock:
+      self._version, self._params = version, params
+      self._probed_at = time.monotonic()
+
+  def invalidate(self):
+    """Makes the next current() call probe the registry."""
+    with self._lock:
+      self._probed_at = None
+
+  def current(self):
+    """
+    Returns:
+      (version, params); reads the database only when the last probe is
+      older than probe_seconds
+    """
+    with self._lock:
+      probed_at = self._probed_at
+      if probed_at is not None and time.monotonic() - probed_at <= self.probe_seconds:
+        return self._version, self._params
+
+    cursor = db.get_db().cursor()
+    try:
+      version = registry.active_version(cursor, MODEL_NAME)
+      if version is None:
+        raise LookupError('model01 has no active version yet; train one with POST /prediction/train')
+      if version != self._version:
+        params = registry.load(cursor, MODEL_NAME, version)
+        current_app.logger.info(f'loaded model01 version {version} = {params}')
+        with self._lock:
+          self._version, self._params = version, params
+    finally:
+      cursor.close()
+    with self._lock:
+      self._probed_at = time.monotonic()
+      return self._version, self._params
+
+
+model1_params = ParamCache()
+
+
+def warm_up():
   """
-  You could have a function that performs training from scratch as well as testing (see below).
-  It could be activated from a route for an "administrator role" or something similar. 
+  Called by create_app(): registers the newest model1_params row as the first
+  model01 version if nothing is registered yet, then maps every active model.
   """
-  return 'Training the model'
+  cursor = db.get_db().cursor()
+  try:
+    if registry.active_version(cursor, MODEL_NAME) is None:
+      cursor.execute('SELECT beta_vals FROM model1_params ORDER BY sequence_number DESC LIMIT 1')
+      row = cursor.fetchone()
+      if row is not None:
+        params = np.asarray(json.loads(row['beta_vals']), dtype=np.float64)
+        version = registry.register(cursor, MODEL_NAME, params, {'source': 'model1_params'})
+        registry.promote(cursor, MODEL_NAME, version)
+        db.get_db().commit()
+    active = registry.warm(cursor)
+  finally:
+    cursor.close()
+  if MODEL_NAME in active:
+    model1_params.current()
+  return active
 
-def test():
-  return 'Testing the model'
+# the most rows one predict_batch() call accepts
+MAX_BATCH_ROWS = 1_000_000
 
-def predict(var01, var02):
+
+# Training data: one row per stocked item (BusinessInventoryItemStorage) with
+#   var01 = ClothingItem.Price, var02 = ClothingItem.QualityRating, target = UnitsSold
+# Rows whose ItemID % HOLDOUT_MODULUS == 0 are held out for test().
+HOLDOUT_MODULUS = 5
+TRAIN_CHUNK_ROWS = 10000
+
+def _feature_chunks(cursor, holdout, chunk_rows):
   """
-  Retreives model parameters from the database and uses them for real-time prediction
+  Yields (X, y) float64 arrays of at most chunk_rows rows, X with a leading
+  column of ones. Pages through the table by ItemID, so only one chunk is
+  in memory at a time.
   """
-  # get a database cursor 
-  cursor = db.get_db().cursor()
-  # get the model params from the database
-  query = 'SELECT beta_vals FROM model1_params ORDER BY sequence_number DESC LIMIT 1'
-  cursor.execute(query)
-  return_val = cursor.fetchone()
-  params = return_val['beta_vals']
-  
-  # turn the values from the database into a numpy array
-  params_array = np.array(list(map(float, params[1:-1].split(','))))
-  current_app.logger.info(f'params array = {params_array}')
-
-  # turn the variables sent from the UI into a numpy array
-  input_array = np.array([1.0, float(var01), float(var02)])
-  
-  # calculate the dot product (since this is a fake regression)
-  prediction = np.dot(params_array, input_array)
+  last_id = -1
+  while True:
+    cursor.execute("""
+      SELECT bis.ItemID, c.Price, c.QualityRating, bis.UnitsSold
+      FROM BusinessInventoryItemStorage bis
+      JOIN ClothingItem c ON bis.ClothingItemID = c.ItemID
+      WHERE bis.ItemID > %s AND (bis.ItemID %% %s = 0) = %s
+        AND c.Price IS NOT NULL AND c.QualityRating IS NOT NULL AND bis.UnitsSold IS NOT NULL
+      ORDER BY bis.ItemID
+      LIMIT %s
+    """, (last_id, HOLDOUT_MODULUS, holdout, chunk_rows))
+    rows = cursor.fetchall()
+    if not rows:
+      return
+    last_id = rows[-1]['ItemID']
+    X = np.ones((len(rows), 3))
+    X[:, 1:] = [(row['Price'], row['QualityRating']) for row in rows]
+    y = np.array([row['UnitsSold'] for row in rows], dtype=np.float64)
+    yield X, y
+    if len(rows) < chunk_rows:
+      return
+
+def _measure(job, trace_memory=False):
+  """
+  Runs job() and adds its wall time and the process's peak RSS (getrusage) to the
+  dict it returns. tracemalloc traces every thread of the process, so only the
+  command line passes trace_memory=True to also report the job's peak Python memory.
+  """
+  if trace_memory:
+    tracemalloc.start()
+  started = time.perf_counter()
+  try:
+    report = job()
+  finally:
+    if trace_memory:
+      _, peak = tracemalloc.get_traced_memory()
+      tracemalloc.stop()
+  report['seconds'] = round(time.perf_counter() - started, 3)
+  # kilobytes on Linux
+  report['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10, 2)
+  if trace_memory:
+    report['peak_memory_mb'] = round(peak / 2**20, 2)
+  return report
+
+def train(chunk_rows=TRAIN_CHUNK_ROWS, trace_memory=False):
+  """
+  Ordinary least squares over the training rows, streamed in chunks: only the
+  3x3 X^T X and 3-vector X^T y are accumulated, so memory does not grow with
+  the row count. Registers the solution as a new model01 version, promotes it
+  and publishes it to this process's parameter cache.
+
+  Returns:
+    {version, params, rows, chunks, seconds, max_rss_mb} and, with trace_memory, peak_memory_mb
+  """
+  def job():
+    cursor = db.get_db().cursor()
+    xtx = np.zeros((3, 3))
+    xty = np.zeros(3)
+    rows = chunks = 0
+    for X, y in _feature_chunks(cursor, False, chunk_rows):
+      xtx += X.T @ X
+      xty += X.T @ y
+      rows += len(y)
+      chunks += 1
+    if rows < 3:
+      cursor.close()
+      raise ValueError(f'need at least 3 training rows, found {rows}')
+    # lstsq rather than solve so a singular X^T X (e.g. a constant feature) still fits
+    beta = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+    version = registry.register(cursor, MODEL_NAME, beta, {'rows': rows})
+    registry.promote(cursor, MODEL_NAME, version)
+    db.get_db().commit()
+    model1_params.publish(version, registry.load(cursor, MODEL_NAME, version))
+    cursor.close()
+    return {'version': version, 'params': beta.tolist(), 'rows': rows, 'chunks': chunks}
+  report = _measure(job, trace_memory)
+  current_app.logger.info(f'model01 train: {report}')
+  return report
+
+def test(chunk_rows=TRAIN_CHUNK_ROWS, trace_memory=False):
+  """
+  Scores the held-out rows with the current parameters, streamed the same way.
+
+  Returns:
+    {version, rows, rmse, mae, r2, seconds, max_rss_mb} and, with trace_memory, peak_memory_mb
+  """
+  def job():
+    version, params_array = model1_params.current()
+    cursor = db.get_db().cursor()
+    rows = 0
+    sum_sq = sum_abs = sum_y = sum_y2 = 0.0
+    for X, y in _feature_chunks(cursor, True, chunk_rows):
+      error = X @ params_array - y
+      sum_sq += float(error @ error)
+      sum_abs += float(np.abs(error).sum())
+      sum_y += float(y.sum())
+      sum_y2 += float(y @ y)
+      rows += len(y)
+    cursor.close()
+    if not rows:
+      raise ValueError('no holdout rows to test on')
+    total = sum_y2 - sum_y * sum_y / rows
+    return {
+      'version': version,
+      'rows': rows,
+      'rmse': round((sum_sq / rows) ** 0.5, 4),
+      'mae': round(sum_abs / rows, 4),
+      'r2': round(1 - sum_sq / total, 4) if total else None,
+    }
+  report = _measure(job, trace_memory)
+  current_app.logger.info(f'model01 test: {report}')
+  return report
+
+def predict(var01, var02, params_array=None):
+  """
+  Uses the cached model parameters for real-time prediction, or params_array
+  when the caller already fetched them (and needs to know their version)
+  """
+  if params_array is None:
+    _, params_array = model1_params.current()
+
+  # intercept + beta_1 * var01 + beta_2 * var02 (since this is a fake regression)
+  prediction = params_array[0] + params_array[1] * float(var01) + params_array[2] * float(var02)
 
   return prediction
 
+
+def predict_batch(inputs):
+  """
+  Scores every row of an (n, 2) float64 array of [var01, var02] with one matrix-vector product.
+
+  Returns:
+    (version of the parameters used, (n,) array of predictions)
+  """
+  version, params_array = model1_params.current()
+  return version, inputs @ params_array[1:] + params_array[0]
+
+
+def main():
+  parser = argparse.ArgumentParser(description='Train and/or test model01 from the database.')
+  parser.add_argument('--train', action='store_true', help='fit and store new parameters')
+  parser.add_argument('--test', action='store_true', help='report holdout metrics for the current parameters')
+  parser.add_argument('--chunk-rows', type=int, default=TRAIN_CHUNK_ROWS, help='rows read per query')
+  args = parser.parse_args()
+  if not (args.train or args.test):
+    parser.error('pass --train, --test or both')
+
+  from backend.rest_entry import create_app
+
+  app = create_app()
+  with app.app_context():
+    if args.train:
+      print('train:', json.dumps(train(args.chunk_rows, trace_memory=True)))
+    if args.test:
+      print('test:', json.dumps(test(args.chunk_rows, trace_memory=True)))
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
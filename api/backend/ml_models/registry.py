@@ -0,0 +1,162 @@
+#------------------------------------------------------------
+# Model artifact registry.
+#
+# Every trained version of a model is a .npy file under MODEL_DIR:
+#
+#   <MODEL_DIR>/<model name>/v000003.npy
+#
+# with its metadata in ModelArtifact and the version each model
+# serves in ActiveModel (migration V006). Files are written once and
+# never changed, and they are opened with np.load(mmap_mode="r"), so
+# the API workers on a machine share the same page-cache pages
+# instead of each holding a copy.
+#
+#   version = registry.register(cursor, "model01", params, metrics)
+#   registry.promote(cursor, "model01", version)    # caller commits
+#   registry.rollback(cursor, "model01")            # back to the previous version
+#   params = registry.load(cursor, "model01", registry.active_version(cursor, "model01"))
+#
+# Promote and rollback are a single-row write to ActiveModel, so a
+# switch is atomic for every worker. create_app() calls warm() to map
+# the active versions before the first request.
+#------------------------------------------------------------
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+
+class ModelRegistry:
+
+    def __init__(self):
+        self.model_dir = "models"
+        self._lock = threading.Lock()
+        # (model name, version) -> read-only memory-mapped array
+        self._arrays = {}
+
+    def init_app(self, app):
+        app.config.setdefault("MODEL_DIR", "models")
+        self.model_dir = app.config["MODEL_DIR"]
+
+    def register(self, cursor, name, array, metrics=None):
+        """
+        Writes `array` as the model's next version and records it in
+        ModelArtifact; the caller commits.
+
+        Returns:
+            the new version number
+        """
+        cursor.execute("""
+            SELECT COALESCE(MAX(Version), 0) + 1 AS Version
+            FROM ModelArtifact
+            WHERE ModelName = %s
+            FOR UPDATE
+        """, (name,))
+        version = cursor.fetchone()["Version"]
+        array = np.ascontiguousarray(array)
+        relative = os.path.join(name, f"v{version:06d}.npy")
+        path = os.path.join(self.model_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write then rename, so a reader never maps a half-written file
+        partial = f"{path}.{os.getpid()}.partial"
+        with open(partial, "wb") as f:
+            np.save(f, array)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(partial, path)
+        cursor.execute("""
+            INSERT INTO ModelArtifact (ModelName, Version, Path, Sha256, DType, Shape, Metrics)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, (name, version, relative, _sha256(path), str(array.dtype), json.dumps(array.shape),
+              json.dumps(metrics) if metrics is not None else None))
+        return version
+
+    def promote(self, cursor, name, version):
+        """Makes `version` the one the model serves; the caller commits."""
+        cursor.execute("SELECT 1 FROM ModelArtifact WHERE ModelName = %s AND Version = %s", (name, version))
+        if cursor.fetchone() is None:
+            raise LookupError(f"{name} has no version {version}")
+        cursor.execute("""
+            INSERT INTO ActiveModel (ModelName, Version) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE PreviousVersion = IF(Version = %s, PreviousVersion, Version), Version = %s
+        """, (name, version, version, version))
+
+    def rollback(self, cursor, name):
+        """
+        Switches the model back to the version it served before the last
+        promote; the caller commits.
+
+        Returns:
+            the version now active
+        """
+        cursor.execute("SELECT Version, PreviousVersion FROM ActiveModel WHERE ModelName = %s", (name,))
+        row = cursor.fetchone()
+        if row is None or row["PreviousVersion"] is None:
+            raise LookupError(f"{name} has no previous version to roll back to")
+        cursor.execute("""
+            UPDATE ActiveModel SET Version = %s, PreviousVersion = %s
+            WHERE ModelName = %s AND Version = %s
+        """, (row["PreviousVersion"], row["Version"], name, row["Version"]))
+        if cursor.rowcount == 0:
+            raise LookupError(f"{name} was promoted by someone else meanwhile; try again")
+        return row["PreviousVersion"]
+
+    def active_version(self, cursor, name):
+        cursor.execute("SELECT Version FROM ActiveModel WHERE ModelName = %s", (name,))
+        row = cursor.fetchone()
+        return row["Version"] if row else None
+
+    def versions(self, cursor, name):
+        """[{Version, DType, Shape, Metrics, CreatedAt, Active}] newest first."""
+        cursor.execute("""
+            SELECT m.Version, m.DType, m.Shape, m.Metrics, m.CreatedAt, a.Version IS NOT NULL AS Active
+            FROM ModelArtifact m
+            LEFT JOIN ActiveModel a ON a.ModelName = m.ModelName AND a.Version = m.Version
+            WHERE m.ModelName = %s
+            ORDER BY m.Version DESC
+        """, (name,))
+        rows = cursor.fetchall()
+        for row in rows:
+            row["Shape"] = json.loads(row["Shape"])
+            row["Metrics"] = json.loads(row["Metrics"]) if row["Metrics"] else None
+            row["Active"] = bool(row["Active"])
+        return rows
+
+    def load(self, cursor, name, version):
+        """The version's array, memory-mapped read-only; mapped once per process."""
+        with self._lock:
+            array = self._arrays.get((name, version))
+        if array is not None:
+            return array
+        cursor.execute("SELECT Path FROM ModelArtifact WHERE ModelName = %s AND Version = %s", (name, version))
+        row = cursor.fetchone()
+        if row is None:
+            raise LookupError(f"{name} has no version {version}")
+        array = np.load(os.path.join(self.model_dir, row["Path"]), mmap_mode="r")
+        with self._lock:
+            # keep only the newest mapping per model; older ones unmap once unused
+            for key in [key for key in self._arrays if key[0] == name]:
+                del self._arrays[key]
+            self._arrays[(name, version)] = array
+        return array
+
+    def warm(self, cursor):
+        """Maps the active version of every model. Returns {model name: version}."""
+        cursor.execute("SELECT ModelName, Version FROM ActiveModel")
+        active = {row["ModelName"]: row["Version"] for row in cursor.fetchall()}
+        for name, version in active.items():
+            self.load(cursor, name, version)
+        return active
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+registry = ModelRegistry()
@@ -0,0 +1,649 @@
+"""
+benchmark.py drives persona-shaped traffic through every route in clueless_routes.py
+and reports throughput, latency percentiles, DB round trips and error rates per route.
+
+Run it from the api folder (with the .env values exported):
+
+    python -m backend.perf.benchmark --duration 30 --concurrency 8 --out run.json
+    python -m backend.perf.benchmark --url http://localhost:4000 --mix consumer=1
+    python -m backend.perf.benchmark --baseline perf/baseline.json --update-baseline
+    python -m backend.perf.benchmark --baseline perf/baseline.json --max-regression 0.2
+
+By default the Flask app runs in-process (a test client per worker thread) against
+whatever database the .env points at, e.g. one loaded by backend.perf.datagen; with
+--url the requests go over HTTP to a running API instead. Ids for the requests are
+sampled from the database up front, so nested resources (a customer's closet, a
+business's wishlist) always belong together. Writes create their own rows and the
+destructive routes only ever delete rows the run created itself.
+
+DB round trips come from the X-DB-Query-Count header. The in-process app always
+sends it; a server behind --url needs SQL_DEBUG_HEADERS=true.
+
+With --baseline the run is compared to a stored result and the command exits 1 when
+a route's p95 latency, DB round trips or error rate regressed past the thresholds.
+"""
+import argparse
+import http.client
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import quote, urlsplit
+
+from backend.perf.datagen import connect
+
+PERSONAS = ["consumer", "data_analyst", "administrator", "business_owner"]
+DEFAULT_MIX = "consumer=5,data_analyst=2,administrator=1,business_owner=3"
+
+_PLACEHOLDER = re.compile(r"<(?:\w+:)?(\w+)>")
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# ---- transports -------------------------------------------------------------
+
+class InProcessTransport:
+    """Calls the app through a Flask test client, one per worker thread."""
+
+    def __init__(self):
+        from backend.db_connection import query_stats
+        from backend.rest_entry import create_app
+
+        self.app = create_app()
+        query_stats.debug_headers = True
+        self._local = threading.local()
+
+    def request(self, method, path, body=None):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body)
+        return response.status_code, response.headers, response.get_data()
+
+
+class HttpTransport:
+    """Calls a running API over HTTP, one keep-alive connection per worker thread."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self._local = threading.local()
+
+    def request(self, method, path, body=None):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        payload = None if body is None else json.dumps(body)
+        headers = {} if body is None else {"Content-Type": "application/json"}
+        try:
+            conn.request(method, self.prefix + path, body=payload, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.headers, response.read()
+        except (OSError, http.client.HTTPException):
+            # drop the connection so the next call reconnects
+            conn.close()
+            self._local.conn = None
+            raise
+
+
+# ---- fixtures ---------------------------------------------------------------
+
+FIXTURE_QUERIES = {
+    "aesthetics": "SELECT AestheticID FROM Aesthetic",
+    "categories": "SELECT DISTINCT Category FROM ClothingItem WHERE Category IS NOT NULL",
+    "items": "SELECT ItemID FROM ClothingItem ORDER BY RAND() LIMIT %s",
+    "outfits": "SELECT OutfitID FROM Outfit ORDER BY RAND() LIMIT %s",
+    "businesses": "SELECT CompanyID FROM Business ORDER BY RAND() LIMIT %s",
+    "closets": "SELECT CustomerID, ClosetID FROM CustomerCloset ORDER BY RAND() LIMIT %s",
+    "customer_wishlists": "SELECT CustomerID, WishlistID FROM CustomerWishlist ORDER BY RAND() LIMIT %s",
+    "inventories": "SELECT CompanyID, InventoryID FROM BusinessInventory ORDER BY RAND() LIMIT %s",
+    "business_wishlists": "SELECT CompanyID, WishlistID FROM BusinessWishlist ORDER BY RAND() LIMIT %s",
+    "inventory_items": """
+        SELECT BI.CompanyID, BIIS.ClothingItemID
+        FROM BusinessInventoryItemStorage BIIS
+        JOIN BusinessInventory BI ON BIIS.InventoryID = BI.InventoryID
+        ORDER BY RAND() LIMIT %s
+    """,
+}
+
+
+def load_fixtures(sample_size):
+    """Samples existing ids (and id pairs) to build request paths from."""
+    conn = connect()
+    cursor = conn.cursor()
+    fixtures = {}
+    for name, query in FIXTURE_QUERIES.items():
+        cursor.execute(query, (sample_size,) if "%s" in query else None)
+        rows = cursor.fetchall()
+        if not rows:
+            raise SystemExit(f"no rows for fixture '{name}'; load data first (backend.perf.datagen)")
+        fixtures[name] = [row[0] if len(row) == 1 else row for row in rows]
+    conn.close()
+    return fixtures
+
+
+# ---- recording --------------------------------------------------------------
+
+class Recorder:
+    """Per-route samples; every worker thread records into it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.recording = False
+
+    def add(self, route, status, latency_ms, queries):
+        if not self.recording:
+            return
+        with self._lock:
+            samples = self.samples.get(route)
+            if samples is None:
+                samples = self.samples[route] = {"latency": [], "statuses": Counter(), "queries": []}
+            samples["latency"].append(latency_ms)
+            samples["statuses"][str(status)] += 1
+            if queries is not None:
+                samples["queries"].append(queries)
+
+    def summary(self, elapsed):
+        routes = {}
+        total = errors = 0
+        all_latency = []
+        for route, samples in sorted(self.samples.items()):
+            latency = sorted(samples["latency"])
+            count = len(latency)
+            failed = sum(n for status, n in samples["statuses"].items()
+                         if status == "error" or status.startswith("5"))
+            total += count
+            errors += failed
+            all_latency += latency
+            queries = samples["queries"]
+            routes[route] = {
+                "requests": count,
+                "throughput_rps": round(count / elapsed, 2),
+                "latency_ms_mean": round(sum(latency) / count, 3),
+                "latency_ms_p50": percentile(latency, 50),
+                "latency_ms_p95": percentile(latency, 95),
+                "latency_ms_p99": percentile(latency, 99),
+                "latency_ms_max": latency[-1],
+                "db_queries_avg": round(sum(queries) / len(queries), 2) if queries else None,
+                "db_queries_max": max(queries) if queries else None,
+                "error_rate": round(failed / count, 4),
+                "statuses": dict(samples["statuses"]),
+            }
+        all_latency.sort()
+        totals = {
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0,
+            "latency_ms_p50": percentile(all_latency, 50),
+            "latency_ms_p95": percentile(all_latency, 95),
+            "latency_ms_p99": percentile(all_latency, 99),
+            "error_rate": round(errors / total, 4) if total else 0,
+        }
+        return totals, routes
+
+
+class Session:
+    """One simulated user; issues requests for a route template and records them."""
+
+    def __init__(self, transport, recorder, fixtures, rng):
+        self.transport = transport
+        self.recorder = recorder
+        self.fx = fixtures
+        self.rng = rng
+
+    def pick(self, fixture):
+        return self.rng.choice(self.fx[fixture])
+
+    def call(self, method, route, body=None, query="", **params):
+        """
+        Args:
+            route: the Flask rule, e.g. "/customer/<int:customer_id>/closets";
+                results are grouped under "<METHOD> <route>"
+            params: values for the placeholders in the rule
+
+        Returns:
+            the decoded JSON body, or None for an error / non-JSON response
+        """
+        path = _PLACEHOLDER.sub(lambda m: str(params[m.group(1)]), route) + query
+        started = time.perf_counter()
+        try:
+            status, headers, payload = self.transport.request(method, path, body)
+        except Exception:
+            self.recorder.add(f"{method} {route}", "error", (time.perf_counter() - started) * 1000, None)
+            return None
+        latency_ms = round((time.perf_counter() - started) * 1000, 3)
+        queries = headers.get("X-DB-Query-Count")
+        self.recorder.add(f"{method} {route}", status, latency_ms,
+                          int(queries) if queries is not None else None)
+        if status >= 400:
+            return None
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return None
+
+
+# ---- persona tasks ----------------------------------------------------------
+# Each task is one user action as the Streamlit pages perform it; a task may
+# make several requests. Tasks that write clean up after themselves where the
+# API allows it.
+
+def consumer_browse_closet(s):
+    customer_id, _ = s.pick("closets")
+    s.call("GET", "/customer/<int:customer_id>/closets", customer_id=customer_id)
+
+
+def consumer_closet_overview(s):
+    customer_id, _ = s.pick("closets")
+    s.call("GET", "/customer/<int:customer_id>/closet-overview", customer_id=customer_id)
+
+
+def consumer_wearable_outfits(s):
+    customer_id, _ = s.pick("closets")
+    s.call("GET", "/customer/<int:customer_id>/outfits/wearable", query="?missing=2", customer_id=customer_id)
+
+
+def consumer_browse_wishlist(s):
+    customer_id, _ = s.pick("customer_wishlists")
+    s.call("GET", "/customer/<int:customer_id>/wishlists", customer_id=customer_id)
+
+
+def consumer_search_aesthetic(s):
+    aesthetic_id = s.pick("aesthetics")
+    s.call("GET", "/outfits/<int:aesthetic_id>", aesthetic_id=aesthetic_id)
+    s.call("GET", "/items/<int:aesthetic_id>", aesthetic_id=aesthetic_id)
+
+
+def consumer_notifications(s):
+    customer_id, _ = s.pick("closets")
+    s.call("GET", "/customer/<int:customer_id>/notifications", customer_id=customer_id)
+
+
+def consumer_add_to_wishlist(s):
+    customer_id, wishlist_id = s.pick("customer_wishlists")
+    item_id = s.pick("items")
+    added = s.call("POST", "/customer/<int:customer_id>/wishlists/<int:wishlist_id>/items/<int:item_id>",
+                   customer_id=customer_id, wishlist_id=wishlist_id, item_id=item_id)
+    if added:
+        s.call("DELETE", "/customer/<int:customer_id>/wishlists/<int:wishlist_id>/items/<int:item_id>",
+               customer_id=customer_id, wishlist_id=wishlist_id, item_id=item_id)
+
+
+def consumer_new_item_to_closet(s):
+    customer_id, closet_id = s.pick("closets")
+    created = s.call("POST", "/items", body={
+        "image": "img/bench.jpg", "name": "Benchmark Tee", "category": "Top",
+        "price": 20, "size": "M", "rating": 5,
+    })
+    if created:
+        added = s.call("POST", "/customer/<int:customer_id>/closets/<int:closet_id>/item/<int:item_id>",
+                       customer_id=customer_id, closet_id=closet_id, item_id=created["ItemID"])
+        if added:
+            s.call("POST", "/customer/<int:customer_id>/closets/<int:closet_id>/item/<int:item_id>/wear",
+                   customer_id=customer_id, closet_id=closet_id, item_id=created["ItemID"])
+
+
+def consumer_save_outfit(s):
+    customer_id, closet_id = s.pick("closets")
+    created = s.call("POST", "/outfits", body={"nickname": "Benchmark look", "description": "load test"})
+    if created:
+        outfit_id = created["OutfitID"]
+        s.call("POST", "/customer/<int:customer_id>/closets/<int:closet_id>/outfit/<int:outfit_id>",
+               customer_id=customer_id, closet_id=closet_id, outfit_id=outfit_id)
+        s.call("DELETE", "/outfits/<int:outfit_id>", outfit_id=outfit_id)
+
+
+def consumer_view_item(s):
+    customer_id, _ = s.pick("closets")
+    s.call("POST", "/items/<int:item_id>/views", body={"customer_id": customer_id}, item_id=s.pick("items"))
+
+
+def consumer_receive_notification(s):
+    customer_id, _ = s.pick("closets")
+    s.call("POST", "/customer/<int:customer_id>/notifications", customer_id=customer_id,
+           body={"message": "Benchmark notification"})
+
+
+def analyst_trends(s):
+    s.call("GET", "/analytics/trend")
+
+
+def analyst_brand(s):
+    s.call("GET", "/analytics/items/<int:company_id>", company_id=s.pick("businesses"))
+
+
+def analyst_demand(s):
+    s.call("GET", "/analytics/demand", query="?k=10")
+    s.call("GET", "/analytics/demand", query=f"?k=25&category={quote(s.pick('categories'))}")
+
+
+def analyst_growth(s):
+    window = s.rng.choice(["7d", "30d", "365d"])
+    for by in ("item", "category", "aesthetic"):
+        s.call("GET", "/analytics/growth", query=f"?by={by}&window={window}")
+
+
+def analyst_matching(s):
+    s.call("GET", "/analytics/matching", query="?k=20")
+    item_id = s.pick("items")
+    s.call("GET", "/analytics/matching/<int:item_id>/suppliers", item_id=item_id)
+    s.call("GET", "/analytics/matching/<int:item_id>/wishlists", item_id=item_id)
+
+
+def admin_users(s):
+    page = s.call("GET", "/admin/users", query="?limit=100")
+    if page and page.get("next_cursor"):
+        s.call("GET", "/admin/users", query=f"?limit=100&after={page['next_cursor']}")
+
+
+def admin_predict(s):
+    s.call("GET", "/prediction/<var01>/<var02>", var01=s.rng.randint(0, 100), var02=s.rng.randint(0, 100))
+    s.call("POST", "/prediction/batch",
+           body={"rows": [[s.rng.uniform(0, 100), s.rng.uniform(0, 100)] for _ in range(1000)]})
+
+
+def admin_logs(s):
+    s.call("GET", "/admin/logs")
+
+
+def admin_business_clients(s):
+    s.call("GET", "/business/users", query="?limit=100")
+
+
+def admin_add_remove_client(s):
+    created = s.call("POST", "/business/users", body={
+        "company_name": "Benchmark Co", "contact_email": "bench@example.com",
+    })
+    if created:
+        s.call("DELETE", "/business/users/<int:company_id>", company_id=created["CompanyID"])
+
+
+def admin_monitoring(s):
+    s.call("GET", "/")
+    s.call("GET", "/admin/db/pool")
+    s.call("GET", "/admin/cache")
+    s.call("GET", "/metrics")
+    s.call("GET", "/debug/queries")
+
+
+def business_inventory(s):
+    business_id, _ = s.pick("inventories")
+    s.call("GET", "/business/<int:business_id>/inventory", query="?limit=100", business_id=business_id)
+
+
+def business_home(s):
+    s.call("GET", "/business/<int:business_id>/home", query="?top=3", business_id=s.pick("businesses"))
+
+
+def business_inventory_item(s):
+    business_id, item_id = s.pick("inventory_items")
+    s.call("GET", "/business/<int:business_id>/inventory/<int:item_id>",
+           business_id=business_id, item_id=item_id)
+
+
+def business_available(s):
+    business_id, _ = s.pick("inventories")
+    s.call("GET", "/business/<int:business_id>/inventory/available", query="?limit=100",
+           business_id=business_id)
+
+
+def business_wishlist(s):
+    business_id, wishlist_id = s.pick("business_wishlists")
+    s.call("GET", "/business/<int:business_id>/wishlists/<int:wishlist_id>",
+           business_id=business_id, wishlist_id=wishlist_id)
+
+
+def business_wishlist_add_remove(s):
+    business_id, wishlist_id = s.pick("business_wishlists")
+    created = s.call("POST", "/business/<int:business_id>/wishlists/<int:wishlist_id>/item/<int:item_id>",
+                     business_id=business_id, wishlist_id=wishlist_id, item_id=s.pick("items"))
+    if created:
+        s.call("DELETE", "/business/<int:business_id>/wishlists/<int:wishlist_id>/item/<int:item_id>",
+               business_id=business_id, wishlist_id=wishlist_id, item_id=created["ItemID"])
+
+
+def business_stock_new_item(s):
+    business_id, inventory_id = s.pick("inventories")
+    created = s.call("POST", "/items", body={
+        "image": "img/bench.jpg", "name": "Benchmark Jacket", "category": "Jacket",
+        "price": 80, "size": "L", "rating": 7,
+    })
+    if not created:
+        return
+    item_id = created["ItemID"]
+    s.call("POST", "/business/<int:business_id>/inventory/<int:inventory_id>/item/<int:item_id>",
+           business_id=business_id, inventory_id=inventory_id, item_id=item_id,
+           body={"EthicallySourcedFlag": False, "QuantityInStock": 10})
+    s.call("PUT", "/business/<int:business_id>/inventory/<int:item_id>",
+           business_id=business_id, item_id=item_id)
+    s.call("DELETE", "/business/<int:business_id>/inventory/<int:item_id>",
+           business_id=business_id, item_id=item_id)
+
+
+def business_notifications(s):
+    business_id = s.pick("businesses")
+    s.call("GET", "/business/<int:business_id>/notifications", business_id=business_id)
+    created = s.call("POST", "/business/<int:business_id>/notifications", business_id=business_id,
+                     body={"message": "Benchmark notification"})
+    if created:
+        s.call("DELETE", "/business/<int:business_id>/notifications/<int:notification_id>",
+               business_id=business_id, notification_id=created["NotificationID"])
+
+
+# (weight, task) per persona; weights are relative within the persona
+PERSONA_TASKS = {
+    "consumer": [
+        (15, consumer_browse_closet),
+        (15, consumer_closet_overview),
+        (10, consumer_wearable_outfits),
+        (20, consumer_browse_wishlist),
+        (20, consumer_search_aesthetic),
+        (10, consumer_notifications),
+        (8, consumer_add_to_wishlist),
+        (5, consumer_new_item_to_closet),
+        (5, consumer_save_outfit),
+        (2, consumer_receive_notification),
+        (10, consumer_view_item),
+    ],
+    "data_analyst": [
+        (25, analyst_trends),
+        (25, analyst_brand),
+        (20, analyst_demand),
+        (20, analyst_growth),
+        (10, analyst_matching),
+    ],
+    "administrator": [
+        (35, admin_users),
+        (20, admin_logs),
+        (25, admin_business_clients),
+        (5, admin_add_remove_client),
+        (15, admin_monitoring),
+        (5, admin_predict),
+    ],
+    "business_owner": [
+        (15, business_home),
+        (15, business_inventory),
+        (15, business_inventory_item),
+        (15, business_available),
+        (15, business_wishlist),
+        (8, business_wishlist_add_remove),
+        (5, business_stock_new_item),
+        (12, business_notifications),
+    ],
+}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in PERSONA_TASKS:
+            raise SystemExit(f"unknown persona '{name}' (choose from {', '.join(PERSONAS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ---- driver -----------------------------------------------------------------
+
+def worker(index, args, mix, transport, recorder, fixtures, stop):
+    rng = random.Random(args.seed * 1000 + index)
+    session = Session(transport, recorder, fixtures, rng)
+    personas = list(mix)
+    persona_weights = [mix[p] for p in personas]
+    while not stop.is_set():
+        persona = rng.choices(personas, persona_weights)[0]
+        tasks = PERSONA_TASKS[persona]
+        task = rng.choices([t for _, t in tasks], [w for w, _ in tasks])[0]
+        task(session)
+        if args.think_ms:
+            time.sleep(rng.expovariate(1000 / args.think_ms))
+
+
+def run(args):
+    mix = parse_mix(args.mix)
+    transport = HttpTransport(args.url) if args.url else InProcessTransport()
+    fixtures = load_fixtures(args.fixture_size)
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=worker, args=(i, args, mix, transport, recorder, fixtures, stop), daemon=True)
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+
+    time.sleep(args.warmup)
+    recorder.recording = True
+    started = time.perf_counter()
+    time.sleep(args.duration)
+    recorder.recording = False
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=30)
+
+    totals, routes = recorder.summary(elapsed)
+    uncovered = []
+    if not args.url:
+        exercised = {route for route in routes}
+        for rule in transport.app.url_map.iter_rules():
+            if rule.endpoint == "static":
+                continue
+            for method in sorted(rule.methods - {"HEAD", "OPTIONS"}):
+                if f"{method} {rule.rule}" not in exercised:
+                    uncovered.append(f"{method} {rule.rule}")
+    return {
+        "meta": {
+            "target": args.url or "in-process",
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 2),
+            "think_ms": args.think_ms,
+            "seed": args.seed,
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "totals": totals,
+        "routes": routes,
+        "uncovered_routes": uncovered,
+    }
+
+
+def compare(result, baseline, args):
+    """Returns a list of human-readable regressions (empty when the run passes)."""
+    failures = []
+    for route, current in result["routes"].items():
+        base = baseline["routes"].get(route)
+        if base is None or current["requests"] < args.min_samples or base["requests"] < args.min_samples:
+            continue
+        allowed = base["latency_ms_p95"] * (1 + args.max_regression)
+        if (current["latency_ms_p95"] > allowed
+                and current["latency_ms_p95"] - base["latency_ms_p95"] > args.min_delta_ms):
+            failures.append(f"{route}: p95 {current['latency_ms_p95']}ms vs baseline "
+                            f"{base['latency_ms_p95']}ms")
+        if (current["db_queries_avg"] is not None and base["db_queries_avg"] is not None
+                and current["db_queries_avg"] > base["db_queries_avg"] + args.max_query_increase):
+            failures.append(f"{route}: {current['db_queries_avg']} DB queries/request vs baseline "
+                            f"{base['db_queries_avg']}")
+        if current["error_rate"] > base["error_rate"] + args.max_error_increase:
+            failures.append(f"{route}: error rate {current['error_rate']} vs baseline {base['error_rate']}")
+    return failures
+
+
+def print_report(result):
+    header = f"{'route':86} {'reqs':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'dbq':>5} {'err%':>6}"
+    print(header)
+    print("-" * len(header))
+    for route, r in result["routes"].items():
+        dbq = "-" if r["db_queries_avg"] is None else f"{r['db_queries_avg']:.1f}"
+        print(f"{route[:86]:86} {r['requests']:>6} {r['throughput_rps']:>7} {r['latency_ms_p50']:>8.1f} "
+              f"{r['latency_ms_p95']:>8.1f} {r['latency_ms_p99']:>8.1f} {dbq:>5} {r['error_rate'] * 100:>6.2f}")
+    t = result["totals"]
+    print("-" * len(header))
+    print(f"total: {t['requests']} requests, {t['throughput_rps']} req/s, p50 {t['latency_ms_p50']}ms, "
+          f"p95 {t['latency_ms_p95']}ms, p99 {t['latency_ms_p99']}ms, error rate {t['error_rate'] * 100:.2f}%")
+    if result["uncovered_routes"]:
+        print("routes not exercised: " + ", ".join(result["uncovered_routes"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running API; default runs the app in-process")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"persona weights (default {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=8, help="simulated users (threads)")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between user actions")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--fixture-size", type=int, default=500, help="ids sampled per fixture")
+    parser.add_argument("--out", help="write the results as JSON")
+    parser.add_argument("--baseline", help="JSON baseline to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as --baseline")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="allowed relative p95 increase per route (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5,
+                        help="p95 increases smaller than this never fail the run")
+    parser.add_argument("--max-query-increase", type=float, default=0.5,
+                        help="allowed increase in average DB queries per request")
+    parser.add_argument("--max-error-increase", type=float, default=0.01,
+                        help="allowed increase in a route's error rate")
+    parser.add_argument("--min-samples", type=int, default=20,
+                        help="routes with fewer requests are not compared")
+    args = parser.parse_args()
+
+    result = run(args)
+    print_report(result)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = compare(result, baseline, args)
+        if failures:
+            print(f"\n{len(failures)} regression(s) against {args.baseline}:")
+            for failure in failures:
+                print("  " + failure)
+            return 1
+        print(f"\nno regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+"""
+datagen.py replaces the contents of the Clueless database with synthetic data at a
+configurable scale, so routes can be measured against production-sized tables.
+
+Run it from the api folder (with the .env values exported):
+
+    python -m backend.perf.datagen --scale 1 --seed 42 --yes
+
+Scale 1 is roughly 10k customers, 5k clothing items and ~800k rows in total; the
+row counts grow linearly with --scale. Popularity follows power-law (Zipf-like)
+distributions, so a few items, aesthetics and brands receive most of the closet
+adds, wishlist adds and sales, as they would in real traffic. The same --seed
+always produces the same database (engagement event times are relative to the
+time of the run), so benchmark runs stay comparable.
+
+Every table is truncated and refilled in foreign-key order, then IdSequence is
+moved past the new ids, the analytics rollups and engagement buckets are
+rebuilt and the tables are ANALYZEd so EXPLAIN sees real sizes.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pymysql
+
+from backend.analytics import rollups
+from backend.db_connection.id_sequence import SEQUENCES
+from backend.rest_entry import create_app
+
+BASE_SIZES = {
+    "customers": 10_000,
+    "businesses": 500,
+    "items": 5_000,
+    "outfits": 3_000,
+    "systems": 200,
+    "events": 200_000,
+}
+
+FIRST_NAMES = ["Olivia", "Jackson", "Sophie", "Rachel", "Liam", "Emma", "Noah", "Ava", "Mia",
+               "Ethan", "Isabella", "Lucas", "Amelia", "Mason", "Harper", "Elijah", "Chloe", "Aria"]
+LAST_NAMES = ["Rodriguez", "Thompson", "Lee", "Green", "Nguyen", "Patel", "Kim", "Garcia",
+              "Smith", "Johnson", "Brown", "Martinez", "Davis", "Lopez", "Wilson", "Clark"]
+PLACES = [("New York", "NY", "10012"), ("Los Angeles", "CA", "90001"), ("Austin", "TX", "78701"),
+          ("Chicago", "IL", "60601"), ("Seattle", "WA", "98101"), ("Boston", "MA", "02108"),
+          ("Miami", "FL", "33101"), ("Denver", "CO", "80202"), ("Portland", "OR", "97201")]
+CATEGORIES = ["Top", "Pants", "Jacket", "Dress", "Skirt", "Shoes", "Accessory", "Set"]
+CATEGORY_WEIGHTS = [0.24, 0.16, 0.12, 0.1, 0.08, 0.12, 0.14, 0.04]
+CATEGORY_PRICE = {"Top": 30, "Pants": 55, "Jacket": 90, "Dress": 65, "Skirt": 40,
+                  "Shoes": 95, "Accessory": 35, "Set": 110}
+SIZES = ["XS", "S", "M", "L", "XL", "OneSize"]
+ADJECTIVES = ["Vintage", "Oversized", "Cropped", "Linen", "Satin", "Wool", "Denim", "Leather",
+              "Knit", "Pleated", "Striped", "Floral", "Classic", "Relaxed", "Tailored"]
+AESTHETICS = ["Dark Academia", "Cyberpunk", "Boho Chic", "Grunge", "Old Money", "Soft Girl",
+              "Y2K", "Cottagecore", "Streetwear", "Minimalist", "Preppy", "Athleisure",
+              "Coastal Grandmother", "Gorpcore", "Balletcore", "Western", "Mod", "Punk",
+              "Indie Sleaze", "Clean Girl"]
+STATUSES = ["Sent", "Read", "Unread"]
+EVENT_TYPES = ["view", "wishlist_add", "closet_add", "wear"]
+EVENT_TYPE_WEIGHTS = [0.6, 0.15, 0.15, 0.1]
+EVENT_HISTORY_DAYS = 120
+
+# truncate/insert order; children are listed after the tables they reference
+TABLE_ORDER = [
+    "Customer", "Business", "Aesthetic", "ClothingItem", "Outfit",
+    "CustomerCloset", "CustomerWishlist", "CustomerNotification", "BusinessNotification",
+    "BusinessWishlist", "BusinessInventory", "System", "TechTeam",
+    "OutfitMatchedAesthetic", "ClothingItemMatchedAesthetic", "CustomerOutfitsOfClothingItems",
+    "CustomerClosetOutfits", "CustomerClosetClothingItems", "CustWishListClothingItem",
+    "BusinessWishlistClothingItem", "BusinessInventoryItemStorage", "EngagementEvent",
+]
+
+
+def power_law_weights(rng, n, exponent):
+    """Selection probabilities for n ids where the rank-k id gets weight 1/k^exponent."""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def unique_pairs(parents, children):
+    """Drops duplicate (parent, child) pairs so composite primary keys stay unique."""
+    keys = parents.astype(np.int64) * (int(children.max()) + 1) + children
+    _, first = np.unique(keys, return_index=True)
+    first.sort()
+    return parents[first], children[first]
+
+
+def sample_children(rng, parent_ids, counts, child_ids, weights):
+    """For each parent draw counts[i] children (by weight), without duplicates."""
+    parents = np.repeat(parent_ids, counts)
+    children = rng.choice(child_ids, size=len(parents), p=weights)
+    return unique_pairs(parents, children)
+
+
+def pick(rng, values, size):
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), size)]
+
+
+class Generator:
+
+    def __init__(self, scale, seed):
+        self.rng = np.random.default_rng(seed)
+        self.sizes = {name: max(1, int(count * scale)) for name, count in BASE_SIZES.items()}
+
+    def tables(self):
+        """Yields (table, columns, rows) in TABLE_ORDER; rows are lists of tuples."""
+        rng = self.rng
+        n_customers = self.sizes["customers"]
+        n_businesses = self.sizes["businesses"]
+        n_items = self.sizes["items"]
+        n_outfits = self.sizes["outfits"]
+
+        customer_ids = np.arange(1, n_customers + 1)
+        business_ids = np.arange(1, n_businesses + 1)
+        item_ids = np.arange(1, n_items + 1)
+        outfit_ids = np.arange(1, n_outfits + 1)
+        aesthetic_ids = np.arange(1, len(AESTHETICS) + 1)
+
+        item_weights = power_law_weights(rng, n_items, 1.05)
+        aesthetic_weights = power_law_weights(rng, len(aesthetic_ids), 0.8)
+        business_weights = power_law_weights(rng, n_businesses, 1.0)
+
+        # ---- entities ----
+        places = rng.integers(0, len(PLACES), n_customers)
+        first = pick(rng, FIRST_NAMES, n_customers)
+        last = pick(rng, LAST_NAMES, n_customers)
+        yield "Customer", ["CustomerID", "EmailAddress", "FirstName", "LastName", "StreetAddress",
+                           "City", "State", "ZIP", "Country"], [
+            (int(cid), f"user{cid}@example.com", first[i], last[i], f"{(cid * 7) % 999 + 1} Main St",
+             *PLACES[places[i]], "USA")
+            for i, cid in enumerate(customer_ids)
+        ]
+
+        places = rng.integers(0, len(PLACES), n_businesses)
+        popularity = np.round(np.clip(business_weights / business_weights.max() * 99.99, 0, 99.99), 2)
+        yield "Business", ["CompanyID", "CompanyName", "ContactEmail", "StreetAddress", "City",
+                           "State", "ZIP", "Country", "PopularityPercentage"], [
+            (int(bid), f"{ADJECTIVES[bid % len(ADJECTIVES)]} Label {bid}", f"contact@brand{bid}.com",
+             f"{bid % 900 + 100} Market St", *PLACES[places[i]], "USA", float(popularity[i]))
+            for i, bid in enumerate(business_ids)
+        ]
+
+        popularity = np.round(aesthetic_weights / aesthetic_weights.max() * 99.99, 2)
+        yield "Aesthetic", ["AestheticID", "Name", "Description", "PopularityPercent"], [
+            (int(aid), AESTHETICS[i], f"{AESTHETICS[i]} looks", float(popularity[i]))
+            for i, aid in enumerate(aesthetic_ids)
+        ]
+
+        categories = rng.choice(CATEGORIES, size=n_items, p=CATEGORY_WEIGHTS)
+        base_price = np.array([CATEGORY_PRICE[c] for c in categories])
+        prices = np.round(base_price * rng.lognormal(0, 0.45, n_items), 2).clip(5, 99_999)
+        adjectives = pick(rng, ADJECTIVES, n_items)
+        sizes = pick(rng, SIZES, n_items)
+        ratings = rng.integers(1, 11, n_items)
+        outdated = rng.random(n_items) < 0.05
+        popularity = np.round(item_weights / item_weights.max() * 99.99, 2)
+        yield "ClothingItem", ["ItemID", "ImageAddress", "Name", "Category", "Price", "Size",
+                               "QualityRating", "OutdatedFlag", "PopularityPercentage"], [
+            (int(iid), f"img/item{iid}.jpg", f"{adjectives[i]} {categories[i]} {iid}", categories[i],
+             float(prices[i]), sizes[i], int(ratings[i]), bool(outdated[i]), float(popularity[i]))
+            for i, iid in enumerate(item_ids)
+        ]
+
+        yield "Outfit", ["OutfitID", "Nickname", "Description"], [
+            (int(oid), f"Look {oid}", f"Outfit idea number {oid}") for oid in outfit_ids
+        ]
+
+        # ---- customer side ----
+        closet_counts = rng.poisson(0.8, n_customers) + 1
+        closet_owner = np.repeat(customer_ids, closet_counts)
+        closet_ids = np.arange(1, len(closet_owner) + 1)
+        yield "CustomerCloset", ["ClosetID", "NickName", "CustomerID"], [
+            (int(cid), f"Closet {cid}", int(owner)) for cid, owner in zip(closet_ids, closet_owner)
+        ]
+
+        has_wishlist = rng.random(n_customers) < 0.75
+        wishlist_owner = customer_ids[has_wishlist]
+        wishlist_ids = np.arange(1, len(wishlist_owner) + 1)
+        yield "CustomerWishlist", ["WishlistID", "Nickname", "CustomerID"], [
+            (int(wid), f"Wishlist {wid}", int(owner)) for wid, owner in zip(wishlist_ids, wishlist_owner)
+        ]
+
+        notif_owner = np.repeat(customer_ids, rng.poisson(2.5, n_customers))
+        customer_notif_ids = np.arange(1, len(notif_owner) + 1)
+        statuses = pick(rng, STATUSES, len(notif_owner))
+        yield "CustomerNotification", ["NotificationID", "Message", "Status", "CustomerID"], [
+            (int(nid), "An item on your wishlist is back", statuses[i], int(owner))
+            for i, (nid, owner) in enumerate(zip(customer_notif_ids, notif_owner))
+        ]
+
+        # ---- business side ----
+        notif_owner = np.repeat(business_ids, rng.poisson(4, n_businesses))
+        business_notif_ids = np.arange(1, len(notif_owner) + 1)
+        statuses = pick(rng, STATUSES, len(notif_owner))
+        yield "BusinessNotification", ["NotificationID", "Message", "Status", "CompanyID"], [
+            (int(nid), "Wishlist demand is rising for your items", statuses[i], int(owner))
+            for i, (nid, owner) in enumerate(zip(business_notif_ids, notif_owner))
+        ]
+
+        bwishlist_owner = business_ids[rng.random(n_businesses) < 0.8]
+        bwishlist_ids = np.arange(1, len(bwishlist_owner) + 1)
+        yield "BusinessWishlist", ["WishlistID", "Nickname", "CompanyID"], [
+            (int(wid), f"Buying list {wid}", int(owner)) for wid, owner in zip(bwishlist_ids, bwishlist_owner)
+        ]
+
+        inventory_owner = np.repeat(business_ids, rng.integers(1, 4, n_businesses))
+        inventory_ids = np.arange(1, len(inventory_owner) + 1)
+        yield "BusinessInventory", ["InventoryID", "Title", "CompanyID"], [
+            (int(iid), f"Inventory {iid}", int(owner)) for iid, owner in zip(inventory_ids, inventory_owner)
+        ]
+
+        # ---- admin ----
+        n_systems = self.sizes["systems"]
+        system_ids = np.arange(1, n_systems + 1)
+        b_notifs = rng.choice(business_notif_ids, n_systems) if len(business_notif_ids) else [None] * n_systems
+        c_notifs = rng.choice(customer_notif_ids, n_systems) if len(customer_notif_ids) else [None] * n_systems
+        yield "System", ["SystemID", "UserName", "Password", "IssueLogs", "BusinessNotifID",
+                         "CustomerNotifID"], [
+            (int(sid), f"svc{sid}", f"pw{sid}", f"Latency spike on node {sid % 12}",
+             None if b is None else int(b), None if c is None else int(c))
+            for sid, b, c in zip(system_ids, b_notifs, c_notifs)
+        ]
+        tech_names = ["Jenna Kim"] + [f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[i % len(LAST_NAMES)]}"
+                                      for i in range(1, 50)]
+        yield "TechTeam", ["TechID", "Name", "Department", "SystemID"], [
+            (i + 1, name, "Platform", int(system_ids[i % n_systems])) for i, name in enumerate(tech_names)
+        ]
+
+        # ---- bridge tables ----
+        parents, children = sample_children(rng, outfit_ids, rng.integers(1, 3, n_outfits),
+                                            aesthetic_ids, aesthetic_weights)
+        yield "OutfitMatchedAesthetic", ["AestheticID", "OutfitID"], list(zip(children.tolist(), parents.tolist()))
+
+        parents, children = sample_children(rng, item_ids, rng.integers(1, 4, n_items),
+                                            aesthetic_ids, aesthetic_weights)
+        yield "ClothingItemMatchedAesthetic", ["AestheticID", "ClothingItemID"], \
+            list(zip(children.tolist(), parents.tolist()))
+
+        parents, children = sample_children(rng, outfit_ids, rng.integers(2, 7, n_outfits),
+                                            item_ids, item_weights)
+        yield "CustomerOutfitsOfClothingItems", ["ClothingItemID", "OutfitID"], \
+            list(zip(children.tolist(), parents.tolist()))
+
+        parents, children = sample_children(rng, closet_ids, rng.poisson(1.5, len(closet_ids)),
+                                            outfit_ids, np.full(n_outfits, 1.0 / n_outfits))
+        yield "CustomerClosetOutfits", ["ClosetID", "OutfitID"], list(zip(parents.tolist(), children.tolist()))
+
+        # closet sizes are heavy-tailed: most closets are small, a few are huge
+        counts = np.clip(rng.lognormal(3.0, 0.9, len(closet_ids)), 1, 600).astype(int)
+        parents, children = sample_children(rng, closet_ids, counts, item_ids, item_weights)
+        wears = rng.geometric(0.08, len(parents)) - 1
+        available = rng.random(len(parents)) < 0.9
+        yield "CustomerClosetClothingItems", ["ClothingItemID", "ClosetID", "NumberofWears",
+                                              "AvailabilityStatus"], \
+            list(zip(children.tolist(), parents.tolist(), wears.tolist(), available.tolist()))
+
+        parents, children = sample_children(rng, wishlist_ids, rng.geometric(0.12, len(wishlist_ids)),
+                                            item_ids, item_weights)
+        yield "CustWishListClothingItem", ["ItemID", "WishlistID", "ClothingItemID"], \
+            list(zip(range(1, len(parents) + 1), parents.tolist(), children.tolist()))
+
+        parents, children = sample_children(rng, bwishlist_ids, rng.geometric(0.1, len(bwishlist_ids)),
+                                            item_ids, item_weights)
+        yield "BusinessWishlistClothingItem", ["ItemID", "WishlistID", "ClothingItemID"], \
+            list(zip(range(1, len(parents) + 1), parents.tolist(), children.tolist()))
+
+        counts = np.clip(rng.lognormal(3.6, 0.8, len(inventory_ids)), 1, 2000).astype(int)
+        parents, children = sample_children(rng, inventory_ids, counts, item_ids, item_weights)
+        ethical = rng.random(len(parents)) < 0.6
+        sold = rng.geometric(0.05, len(parents)) - 1
+        stock = rng.integers(0, 200, len(parents))
+        yield "BusinessInventoryItemStorage", ["ItemID", "InventoryID", "EthicallySourcedFlag", "UnitsSold",
+                                               "QuantityInStock", "ClothingItemID"], \
+            list(zip(range(1, len(parents) + 1), parents.tolist(), ethical.tolist(), sold.tolist(),
+                     stock.tolist(), children.tolist()))
+
+        # ---- engagement history ----
+        # each item gets a momentum in [-0.6, 2): positive values push its
+        # events toward the present (rising), negative ones into the past
+        n_events = self.sizes["events"]
+        momentum = rng.uniform(-0.6, 2.0, n_items)
+        event_items = rng.choice(item_ids, size=n_events, p=item_weights)
+        position = rng.random(n_events) ** (1.0 / (1.0 + momentum[event_items - 1]))
+        seconds_ago = ((1.0 - position) * EVENT_HISTORY_DAYS * 86_400).astype("int64")
+        now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "s")
+        occurred = (now - seconds_ago.astype("timedelta64[s]")).tolist()
+        event_types = rng.choice(EVENT_TYPES, size=n_events, p=EVENT_TYPE_WEIGHTS)
+        event_customers = rng.choice(customer_ids, size=n_events)
+        yield "EngagementEvent", ["EventID", "EventType", "ClothingItemID", "CustomerID", "OccurredAt"], \
+            list(zip(range(1, n_events + 1), event_types.tolist(), event_items.tolist(),
+                     event_customers.tolist(), occurred))
+
+
+def connect(local_infile=False):
+    config = create_app().config
+    return pymysql.connect(
+        host=config["MYSQL_DATABASE_HOST"],
+        port=config["MYSQL_DATABASE_PORT"],
+        user=config["MYSQL_DATABASE_USER"],
+        password=config["MYSQL_DATABASE_PASSWORD"],
+        db=config["MYSQL_DATABASE_DB"],
+        charset="utf8mb4",
+        local_infile=local_infile,
+    )
+
+
+def insert_rows(cursor, table, columns, rows, batch_size):
+    # pymysql folds executemany() on an INSERT ... VALUES into multi-row INSERTs
+    sql = (f"INSERT INTO `{table}` ({', '.join(columns)}) "
+           f"VALUES ({', '.join(['%s'] * len(columns))})")
+    for start in range(0, len(rows), batch_size):
+        cursor.executemany(sql, rows[start:start + batch_size])
+
+
+def _load_data_field(value):
+    # LOAD DATA's own escaping: \N is NULL, and a backslash, tab or newline
+    # inside a value is escaped with a backslash
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        value = int(value)
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def load_data_rows(cursor, table, columns, rows):
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False, newline="") as f:
+        for row in rows:
+            f.write("\t".join(_load_data_field(v) for v in row) + "\n")
+        path = f.name
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table}` "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({', '.join(columns)})",
+            (path,),
+        )
+    finally:
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="size multiplier (1 = ~800k rows)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; same seed, same data")
+    parser.add_argument("--method", choices=["insert", "load-data"], default="insert",
+                        help="multi-row INSERTs, or LOAD DATA LOCAL INFILE (needs local_infile=ON)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT batch")
+    parser.add_argument("--yes", action="store_true", help="skip the confirmation prompt")
+    args = parser.parse_args()
+
+    if not args.yes:
+        answer = input("This deletes every row in the Clueless database. Continue? [y/N] ")
+        if answer.strip().lower() != "y":
+            return 1
+
+    conn = connect(local_infile=args.method == "load-data")
+    cursor = conn.cursor()
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+    cursor.execute("SET UNIQUE_CHECKS = 0")
+    for table in reversed(TABLE_ORDER):
+        cursor.execute(f"TRUNCATE TABLE `{table}`")
+
+    total_rows = 0
+    started = time.perf_counter()
+    for table, columns, rows in Generator(args.scale, args.seed).tables():
+        table_started = time.perf_counter()
+        if args.method == "load-data":
+            load_data_rows(cursor, table, columns, rows)
+        else:
+            insert_rows(cursor, table, columns, rows, args.batch_size)
+        conn.commit()
+        total_rows += len(rows)
+        print(f"{table:32} {len(rows):>10} rows  {time.perf_counter() - table_started:7.2f}s")
+
+    cursor.execute("SET UNIQUE_CHECKS = 1")
+    cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+    # move every id sequence past the generated ids
+    for sequence, (table, column, fallback) in SEQUENCES.items():
+        cursor.execute(f"""
+            REPLACE INTO IdSequence (SequenceName, NextValue)
+            SELECT %s, COALESCE(MAX({column}), %s) + 1 FROM {table}
+        """, (sequence, fallback))
+    conn.commit()
+
+    # the analytics rollups are derived from the tables just loaded
+    rollups.rebuild(cursor)
+    conn.commit()
+
+    cursor.execute("ANALYZE TABLE " + ", ".join(f"`{t}`" for t in TABLE_ORDER))
+    cursor.fetchall()
+    conn.close()
+    print(f"loaded {total_rows} rows in {time.perf_counter() - started:.1f}s "
+          f"(scale {args.scale}, seed {args.seed})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""
+explain_check.py runs EXPLAIN on every SQL statement the API issues and fails when
+one of them does a full table scan (access type ALL) on a table holding more rows
+than the threshold.
+
+Run it from the api folder against a database that has the migrations applied:
+
+    python -m backend.perf.explain_check --threshold 1000
+
+Statements are pulled out of SQL_MODULES by reading their source, so new routes
+and jobs are covered without being registered anywhere. SQL built with f-strings,
+concatenation or loops over constant lists is rendered from the source: every
+alternative a local variable can hold is tried, and a `", ".join(["%s"] * n)`
+placeholder list is rendered once. Where the SQL depends on a function argument
+(a table name, a filter built at run time), the function is called with sample
+arguments from SAMPLE_CALLS on a cursor that records statements instead of running
+them. Any execute() whose SQL is covered by neither is reported as a failure.
+Every %s placeholder is replaced with 1 before the EXPLAIN, which is enough for the
+optimizer to choose an access path.
+"""
+import argparse
+import ast
+import glob
+import itertools
+import os
+import re
+import sys
+from datetime import timedelta
+
+import numpy as np
+
+from backend.db_connection import db
+from backend.rest_entry import create_app
+
+_BACKEND = os.path.join(os.path.dirname(__file__), "..")
+
+SQL_MODULES = [
+    os.path.join(_BACKEND, "Clueless", "clueless_routes.py"),
+    os.path.join(_BACKEND, "Clueless", "existence.py"),
+    *sorted(glob.glob(os.path.join(_BACKEND, "analytics", "*.py"))),
+    *sorted(glob.glob(os.path.join(_BACKEND, "matching", "*.py"))),
+    *sorted(glob.glob(os.path.join(_BACKEND, "ml_models", "*.py"))),
+    os.path.join(_BACKEND, "db_connection", "id_sequence.py"),
+]
+
+SQL_START = re.compile(r"^\s*\(?\s*(SELECT|INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+PLACEHOLDER = re.compile(r"%([s%])")
+TABLE_REF = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE|INTO)\s+`?(\w+)`?(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|JOIN\b|LEFT\b|SET\b|GROUP\b|ORDER\b|LIMIT\b|VALUES\b|SELECT\b)(\w+))?",
+    re.IGNORECASE,
+)
+
+# the most renderings of one execute() call; more means a loop over something large
+MAX_ALTERNATIVES = 32
+
+
+class RecordingCursor:
+    """Stands in for a cursor (and its connection): keeps every statement and returns `rows` for every fetch."""
+
+    def __init__(self, rows=(), statements=None):
+        self.rows = list(rows)
+        self.statements = [] if statements is None else statements
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def with_rows(self, rows):
+        """A cursor that returns `rows` and records into the same list."""
+        return RecordingCursor(rows, self.statements)
+
+    def execute(self, query, args=None):
+        self.statements.append(query)
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _sample_export(cursor):
+    from backend.analytics import popularity
+
+    scales = dict.fromkeys({**popularity.ITEM_WEIGHTS, **popularity.BUSINESS_WEIGHTS,
+                            **popularity.AESTHETIC_WEIGHTS}, 1.0)
+    popularity.score_items(cursor, cursor, scales, [1])
+    popularity.score_businesses(cursor, cursor, scales, [1])
+    popularity.score_aesthetics(cursor, cursor, scales, [1])
+    # one marked item, so _touched() goes on to read its businesses and aesthetics
+    popularity._touched(cursor.with_rows([{"Kind": "item", "ID": 1, "CompanyID": 1, "AestheticID": 1}]))
+
+
+def _sample_write(cursor):
+    from backend.analytics import popularity
+
+    one = np.ones(1)
+    for table, key, column in (("ClothingItem", "ItemID", "PopularityPercentage"),
+                               ("Business", "CompanyID", "PopularityPercentage"),
+                               ("Aesthetic", "AestheticID", "PopularityPercent")):
+        popularity._write(cursor, cursor, table, key, column, one, one * 50, one * 0)
+
+
+def _sample_first_missing(cursor):
+    from backend.Clueless.existence import first_missing
+
+    first_missing(cursor.with_rows([{"c0": 1, "c1": 1}]),
+                  ("Business", {"CompanyID": 1}, ""), ("ClothingItem", {"ItemID": 1}, ""))
+
+
+def _sample_growth(cursor):
+    from backend.analytics import engagement
+
+    for by in engagement.DIMENSIONS:
+        engagement.growth(cursor, by, timedelta(days=7))
+
+
+def _sample_seed(cursor):
+    from backend.db_connection import ids
+    from backend.db_connection.id_sequence import SEQUENCES
+
+    for sequence in SEQUENCES:
+        ids._seed(cursor, sequence)
+
+
+# (module file name, function) -> callable(cursor) that runs the function with
+# sample arguments; for SQL that depends on what the function is passed
+SAMPLE_CALLS = {
+    ("popularity.py", "_export"): _sample_export,
+    ("popularity.py", "_write"): _sample_write,
+    ("existence.py", "first_missing"): _sample_first_missing,
+    ("engagement.py", "growth"): _sample_growth,
+    ("id_sequence.py", "_seed"): _sample_seed,
+}
+
+
+def _recorded(sample):
+    cursor = RecordingCursor()
+    sample(cursor)
+    return cursor.statements
+
+
+def _constant_list(node):
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return list(node.elts)
+    return None
+
+
+def _bind(scope, target, value):
+    """Records what `target = value` (or a for-loop over value) may bind; None marks an unknown value."""
+    if isinstance(target, ast.Name):
+        scope.setdefault(target.id, []).append(value)
+    elif isinstance(target, ast.Tuple):
+        values = _constant_list(value)
+        for index, element in enumerate(target.elts):
+            _bind(scope, element, values[index] if values and len(values) == len(target.elts) else None)
+
+
+def _own_nodes(func):
+    """The nodes of func's body; functions nested in it are yielded but not entered."""
+    stack = list(func.body)
+    while stack:
+        node = stack.pop()
+        yield node
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            stack.extend(ast.iter_child_nodes(node))
+
+
+def _scope(func, outer, module_lists):
+    scope = {name: list(values) for name, values in outer.items()}
+    for arg in func.args.args + func.args.kwonlyargs:
+        scope[arg.arg] = [None]
+    for node in _own_nodes(func):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                _bind(scope, target, node.value)
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign)) and isinstance(node.target, ast.Name):
+            scope.setdefault(node.target.id, []).append(None)
+        elif isinstance(node, ast.For):
+            values = _constant_list(node.iter)
+            if values is None and isinstance(node.iter, ast.Name):
+                values = module_lists.get(node.iter.id)
+            for value in values if values is not None else [None]:
+                _bind(scope, node.target, value)
+    return scope
+
+
+def _alternatives(node, scope, seen=()):
+    """Every string `node` can evaluate to, or None when that cannot be read from the source."""
+    if node is None:
+        return None
+    if isinstance(node, ast.Constant):
+        return [node.value] if isinstance(node.value, str) else None
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            options = _alternatives(value.value if isinstance(value, ast.FormattedValue) else value, scope, seen)
+            if options is None:
+                return None
+            parts.append(options)
+        return _limited("".join(combo) for combo in itertools.product(*parts))
+    if isinstance(node, ast.Name):
+        if node.id in seen or node.id not in scope:
+            return None
+        options = []
+        for value in scope[node.id]:
+            rendered = _alternatives(value, scope, seen + (node.id,))
+            if rendered is None:
+                return None
+            options.extend(rendered)
+        return _limited(dict.fromkeys(options))
+    if isinstance(node, ast.IfExp):
+        body, orelse = _alternatives(node.body, scope, seen), _alternatives(node.orelse, scope, seen)
+        return None if body is None or orelse is None else _limited(body + orelse)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left, right = _alternatives(node.left, scope, seen), _alternatives(node.right, scope, seen)
+        return None if left is None or right is None else _limited(a + b for a in left for b in right)
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "join"
+            and isinstance(node.func.value, ast.Constant) and len(node.args) == 1):
+        items = node.args[0]
+        if isinstance(items, ast.BinOp) and isinstance(items.op, ast.Mult):
+            # ["%s"] * n: one repetition stands for any n
+            items = items.left
+        elements = _constant_list(items)
+        if elements is None:
+            return None
+        rendered = [_alternatives(element, scope, seen) for element in elements]
+        if any(options is None or len(options) != 1 for options in rendered):
+            return None
+        return [node.func.value.value.join(options[0] for options in rendered)]
+    return None
+
+
+def _limited(options):
+    options = list(options)
+    return options if len(options) <= MAX_ALTERNATIVES else None
+
+
+def extract_statements(path):
+    """
+    Returns ([(function name, line number, sql)], [(function name, line number)])
+    for the cursor.execute(...) calls in the module: the statements rendered from
+    the source, and the calls whose SQL could not be worked out.
+    """
+    tree = ast.parse(open(path).read(), filename=path)
+    module_lists = {}
+    module_scope = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            values = _constant_list(node.value)
+            if values is not None:
+                module_lists[node.targets[0].id] = values
+            elif isinstance(node.value, ast.Constant):
+                module_scope[node.targets[0].id] = [node.value]
+
+    statements = []
+    unresolved = []
+
+    def visit(func, outer):
+        scope = _scope(func, outer, module_lists)
+        for node in _own_nodes(func):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                visit(node, scope)
+                continue
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr == "execute" and node.args):
+                continue
+            rendered = _alternatives(node.args[0], scope)
+            if rendered is None:
+                unresolved.append((func.name, node.lineno))
+                continue
+            statements.extend((func.name, node.lineno, sql) for sql in rendered if SQL_START.match(sql))
+
+    for func in _top_functions(tree):
+        visit(func, module_scope)
+    statements.sort(key=lambda statement: statement[1])
+    unresolved.sort(key=lambda call: call[1])
+    return statements, unresolved
+
+
+def _top_functions(tree):
+    """Module-level functions and the methods of module-level classes."""
+    functions = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node)
+        elif isinstance(node, ast.ClassDef):
+            functions.extend(child for child in node.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)))
+    return functions
+
+
+def collect(modules):
+    """
+    Returns ([(label, sql)], [failure]) for every statement in the modules,
+    rendered from the source or recorded from a SAMPLE_CALLS entry.
+    """
+    collected = []
+    failures = []
+    for path in modules:
+        name = os.path.basename(path)
+        statements, unresolved = extract_statements(path)
+        collected.extend((f"{name} {func} (line {lineno})", sql) for func, lineno, sql in statements)
+        sampled = set()
+        for func, lineno in unresolved:
+            sample = SAMPLE_CALLS.get((name, func))
+            if sample is None:
+                failures.append(f"{name} {func} (line {lineno}): cannot work out the SQL passed to "
+                                f"execute(); add a SAMPLE_CALLS entry for it")
+            elif func not in sampled:
+                sampled.add(func)
+                recorded = [sql for sql in _recorded(sample) if SQL_START.match(sql)]
+                if not recorded:
+                    failures.append(f"{name} {func}: its SAMPLE_CALLS entry ran no statement")
+                collected.extend((f"{name} {func} (sample call)", sql) for sql in dict.fromkeys(recorded))
+    return collected, failures
+
+
+def table_sizes(cursor):
+    cursor.execute("""
+        SELECT TABLE_NAME, TABLE_ROWS
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+    """)
+    return {row["TABLE_NAME"].lower(): row["TABLE_ROWS"] or 0 for row in cursor.fetchall()}
+
+
+def alias_map(sql):
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        aliases[table.lower()] = table
+        if alias:
+            aliases[alias.lower()] = table
+    return aliases
+
+
+def check(threshold, modules):
+    statements, failures = collect(modules)
+    cursor = db.get_db().cursor()
+    sizes = table_sizes(cursor)
+    for label, sql in statements:
+        explain_sql = "EXPLAIN " + PLACEHOLDER.sub(lambda m: "1" if m.group(1) == "s" else "%", sql.strip().rstrip(";"))
+        try:
+            cursor.execute(explain_sql)
+        except Exception as e:
+            failures.append(f"{label}: EXPLAIN failed: {e}")
+            continue
+        aliases = alias_map(sql)
+        for row in cursor.fetchall():
+            if row.get("type") != "ALL" or not row.get("table"):
+                continue
+            table = aliases.get(row["table"].lower(), row["table"])
+            size = sizes.get(table.lower(), row.get("rows") or 0)
+            if size > threshold:
+                failures.append(f"{label}: full scan of {table} (~{size} rows, threshold {threshold})")
+    # EXPLAIN of an INSERT/UPDATE/DELETE does not write, but be explicit
+    db.get_db().rollback()
+    cursor.close()
+    return len(statements), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threshold", type=int, default=1000,
+                        help="largest table (in rows) that may be fully scanned")
+    parser.add_argument("modules", nargs="*", default=SQL_MODULES,
+                        help="modules to scan (defaults to SQL_MODULES)")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        checked, failures = check(args.threshold, args.modules)
+
+    print(f"explained {checked} statements")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,21 @@ import os
 import logging
 from logging.handlers import RotatingFileHandler
 
-from backend.db_connection import db
+from backend.db_connection import db, query_stats
+from backend.cache import cache
+from backend.metrics import metrics
+from backend.analytics.demand import demand_index
+from backend.matching.aesthetics import aesthetic_index
+from backend.matching.inventory import inventory_matcher
+from backend.matching.outfits import outfit_index
+from backend.ml_models import model01
+from backend.ml_models.model01 import model1_params
+from backend.ml_models.registry import registry
 from backend.Clueless.clueless_routes import general
 from backend.Clueless.clueless_routes import analytics
 from backend.Clueless.clueless_routes import business
 from backend.Clueless.clueless_routes import customer
+from backend.Clueless.clueless_routes import prediction
 
 
 def create_app():
@@ -42,10 +52,63 @@ def create_app():
     app.config["MYSQL_DATABASE_PORT"] = int(os.getenv("DB_PORT").strip())
     app.config["MYSQL_DATABASE_DB"] = "Clueless" # Change this to your DB name
 
+    # connection pool sizing (see backend/db_connection/pool.py)
+    app.config["MYSQL_POOL_MIN_SIZE"] = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+    app.config["MYSQL_POOL_MAX_SIZE"] = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    app.config["MYSQL_POOL_MAX_LIFETIME"] = int(os.getenv("DB_POOL_MAX_LIFETIME", "3600"))
+    app.config["MYSQL_POOL_TIMEOUT"] = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    app.config["MYSQL_POOL_PING_INTERVAL"] = float(os.getenv("DB_POOL_PING_INTERVAL", "30"))
+
+    # how many primary keys each worker reserves at a time (see db_connection/id_sequence.py)
+    app.config["ID_BLOCK_SIZE"] = int(os.getenv("ID_BLOCK_SIZE", "20"))
+
     # Initialize the database object with the settings above.
     app.logger.info("current_app(): starting the database connection")
     db.init_app(app)
 
+    # response cache for the read-heavy GET routes (see backend/cache)
+    app.config["CACHE_ENABLED"] = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    app.config["CACHE_BACKEND"] = os.getenv("CACHE_BACKEND", "memory")
+    app.config["CACHE_MAX_ENTRIES"] = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    app.config["CACHE_REDIS_URL"] = os.getenv("CACHE_REDIS_URL")
+    cache.init_app(app)
+
+    # per-request SQL statement log and per-route aggregates (see GET /debug/queries)
+    app.config["SQL_INSTRUMENTATION"] = os.getenv("SQL_INSTRUMENTATION", "true").lower() == "true"
+    app.config["SQL_DEBUG_HEADERS"] = os.getenv("SQL_DEBUG_HEADERS", "false").lower() == "true"
+    app.config["SQL_SLOW_REQUEST_MS"] = float(os.getenv("SQL_SLOW_REQUEST_MS", "500"))
+    query_stats.init_app(app)
+
+    # request metrics served in Prometheus text format at GET /metrics; set
+    # METRICS_MULTIPROC_DIR when running several API worker processes
+    app.config["METRICS_MULTIPROC_DIR"] = os.getenv("METRICS_MULTIPROC_DIR")
+    app.config["METRICS_FLUSH_INTERVAL"] = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+    metrics.init_app(app, pool_stats=db.pool_stats)
+
+    # how stale the in-memory wishlist demand index may get (see backend/analytics/demand.py)
+    app.config["DEMAND_REFRESH_SECONDS"] = float(os.getenv("DEMAND_REFRESH_SECONDS", "30"))
+    demand_index.init_app(app)
+
+    # how long the matching indexes are reused before a reload (see backend/matching)
+    app.config["MATCHING_REFRESH_SECONDS"] = float(os.getenv("MATCHING_REFRESH_SECONDS", "300"))
+    aesthetic_index.init_app(app)
+    outfit_index.init_app(app)
+    inventory_matcher.init_app(app)
+
+    # how often the cached model01 parameters check ActiveModel for a newly promoted version
+    app.config["MODEL_PARAMS_PROBE_SECONDS"] = float(os.getenv("MODEL_PARAMS_PROBE_SECONDS", "5"))
+    model1_params.init_app(app)
+
+    # where the model registry keeps its .npy artifacts (see backend/ml_models/registry.py);
+    # the active versions are mapped now so the first prediction does not wait for them
+    app.config["MODEL_DIR"] = os.getenv("MODEL_DIR", "models")
+    registry.init_app(app)
+    with app.app_context():
+        try:
+            app.logger.info(f"create_app(): active models {model01.warm_up()}")
+        except Exception as e:
+            app.logger.warning(f"create_app(): model warm load skipped: {e}")
+
     # Register the routes from each Blueprint with the app object
     # and give a url prefix to each
     app.logger.info("create_app(): registering blueprints with Flask app object.")
@@ -53,6 +116,7 @@ def create_app():
     app.register_blueprint(business) 
     app.register_blueprint(analytics) 
     app.register_blueprint(customer) 
+    app.register_blueprint(prediction)
 
 
     # Don't forget to return the app object
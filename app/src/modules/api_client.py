@@ -0,0 +1,213 @@
+# ------------------------------------------------------------
+# Shared HTTP client for talking to the Flask API.
+#
+# Every page goes through the one requests.Session created here,
+# so TCP connections to web-api are kept alive and reused across
+# reruns, sessions and pages instead of being opened per call.
+#
+#   from modules import api_client as api
+#   resp = api.get(f"/customer/{customer_id}/closets")
+#
+# The helpers return the requests.Response and raise the usual
+# requests exceptions, so pages keep their own error handling.
+#
+# cached_get() keeps successful GET responses in the user's
+# st.session_state for API_CACHE_TTL seconds, so widget clicks and
+# st.rerun() don't refetch the same payload. The write helpers at
+# the bottom drop exactly the cached reads their change affects.
+#
+# Inside a deadline() block (modules.fanout runs every page section
+# in one) requests are sent once, without retries, and their timeouts
+# are cut to the time left before the deadline.
+# ------------------------------------------------------------
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlencode
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = os.getenv("API_BASE_URL", "http://web-api:4000").rstrip("/")
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3"))
+READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "2"))
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))
+CACHE_TTL = float(os.getenv("API_CACHE_TTL", "60"))
+
+
+@st.cache_resource
+def get_session():
+    """One pooled session per Streamlit server process, shared by all users."""
+    # only idempotent methods (GET, PUT, DELETE, ...) are retried, on
+    # connection errors and on the gateway errors of a restarting API
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_single_try_session():
+    """Pooled session without retries, for requests made under a deadline."""
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=0)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_deadline = threading.local()
+
+
+@contextmanager
+def deadline(at):
+    """Caps the requests this thread sends inside the block at time.monotonic() value `at`."""
+    _deadline.at = at
+    try:
+        yield
+    finally:
+        _deadline.at = None
+
+
+def request(method, path, timeout=None, **kwargs):
+    """
+    Sends METHOD API_BASE_URL + path through the shared session.
+
+    Args:
+        path: the route, e.g. "/business/10/inventory"
+        timeout: read timeout in seconds (defaults to API_READ_TIMEOUT)
+        kwargs: passed on to requests (params, json, ...)
+    """
+    started = time.perf_counter()
+    status = "error"
+    try:
+        session = get_session()
+        connect_timeout, read_timeout = CONNECT_TIMEOUT, timeout or READ_TIMEOUT
+        at = getattr(_deadline, "at", None)
+        if at is not None:
+            remaining = at - time.monotonic()
+            if remaining <= 0:
+                raise requests.Timeout(f"{method} {path}: deadline passed before the request was sent")
+            # a retry or a full read timeout would hold the caller's thread past the deadline
+            session = get_single_try_session()
+            connect_timeout, read_timeout = min(connect_timeout, remaining), min(read_timeout, remaining)
+        response = session.request(
+            method, API_BASE_URL + path,
+            timeout=(connect_timeout, read_timeout), **kwargs
+        )
+        status = response.status_code
+        return response
+    finally:
+        logger.info(f"{method} {path} -> {status} in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+def get(path, **kwargs):
+    return request("GET", path, **kwargs)
+
+
+def post(path, **kwargs):
+    return request("POST", path, **kwargs)
+
+
+def put(path, **kwargs):
+    return request("PUT", path, **kwargs)
+
+
+def delete(path, **kwargs):
+    return request("DELETE", path, **kwargs)
+
+
+# ---- per-session read cache ----------------------------------------------
+
+def _cache():
+    return st.session_state.setdefault("_api_cache", {})
+
+
+def cached_get(path, params=None, ttl=None, **kwargs):
+    """
+    GET through the current user's session cache.
+
+    Only 200 responses are cached; the key is the path plus its params.
+    """
+    key = (path, urlencode(sorted((params or {}).items())))
+    cache = _cache()
+    hit = cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        logger.info(f"GET {path} -> cache hit")
+        return hit[1]
+    response = get(path, params=params, **kwargs)
+    if response.status_code == 200:
+        cache[key] = (time.monotonic() + (CACHE_TTL if ttl is None else ttl), response)
+    return response
+
+
+def invalidate(*paths):
+    """Drops the cached reads of the given paths (for any params)."""
+    cache = _cache()
+    for key in [key for key in cache if key[0] in paths]:
+        del cache[key]
+
+
+# ---- writes that keep the cache consistent --------------------------------
+
+def _invalidate_closets(customer_id):
+    invalidate(
+        f"/customer/{customer_id}/closets",
+        f"/customer/{customer_id}/closet-overview",
+        f"/customer/{customer_id}/outfits/wearable",
+        # wishlist items are ranked by the aesthetics they share with the closets
+        f"/customer/{customer_id}/wishlists",
+    )
+
+
+def add_item_to_closet(customer_id, closet_id, item_id):
+    response = post(f"/customer/{customer_id}/closets/{closet_id}/item/{item_id}")
+    if response.ok:
+        _invalidate_closets(customer_id)
+    return response
+
+
+def add_outfit_to_closet(customer_id, closet_id, outfit_id):
+    response = post(f"/customer/{customer_id}/closets/{closet_id}/outfit/{outfit_id}")
+    if response.ok:
+        _invalidate_closets(customer_id)
+    return response
+
+
+def create_outfit(outfit_data):
+    # a new outfit is in no closet yet, so no cached read changes
+    return post("/outfits", json=outfit_data)
+
+
+def delete_outfit(customer_id, outfit_id):
+    response = delete(f"/outfits/{outfit_id}", timeout=5)
+    if response.ok:
+        _invalidate_closets(customer_id)
+    return response
+
+
+def create_clothing_item(item_data):
+    # the new item is in no closet or wishlist yet
+    return post("/items", json=item_data)
+
+
+def add_item_to_wishlist(customer_id, wishlist_id, item_id):
+    response = post(f"/customer/{customer_id}/wishlists/{wishlist_id}/items/{item_id}")
+    if response.ok:
+        invalidate(f"/customer/{customer_id}/wishlists")
+    return response
@@ -0,0 +1,83 @@
+# ------------------------------------------------------------
+# Runs a page's independent API loads in parallel.
+#
+#   results = fetch_all({
+#       "users": (get_admin_users, cursor),
+#       "logs": (get_admin_logs,),
+#   }, default=(False, "timed out"))
+#   success_users, users_page = results["users"]
+#
+# The page waits for the slowest call instead of the sum of all
+# calls. A call that raises or misses the page deadline gets the
+# default value instead, so that section renders its usual error
+# state and the rest of the page still shows.
+#
+# A running call cannot be cancelled, so each one runs inside
+# api_client.deadline(): its requests are not retried and time out
+# at the page deadline. A call that misses the deadline therefore
+# frees its pool worker right after it, and the pool only needs a
+# worker per section in flight.
+# ------------------------------------------------------------
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from modules import api_client
+
+logger = logging.getLogger(__name__)
+
+# one worker per pooled API connection, so no worker waits for a connection
+MAX_WORKERS = int(os.getenv("PAGE_FETCH_WORKERS", str(api_client.POOL_SIZE)))
+PAGE_DEADLINE = float(os.getenv("PAGE_FETCH_DEADLINE", "8"))
+
+
+@st.cache_resource
+def _executor():
+    """Bounded pool shared by every session of this Streamlit server process."""
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="page-fetch")
+
+
+def _run(ctx, at, fn, args):
+    # pool threads are reused, so attach the calling session's context on
+    # every task; that lets the call use st.session_state (e.g. cached_get)
+    add_script_run_ctx(threading.current_thread(), ctx)
+    with api_client.deadline(at):
+        return fn(*args)
+
+
+def fetch_all(calls, deadline=None, default=None):
+    """
+    Args:
+        calls: {name: (function, *args)}
+        deadline: seconds to wait for all calls (defaults to PAGE_FETCH_DEADLINE)
+        default: the result of any call that raised or missed the deadline
+
+    Returns:
+        {name: result}
+    """
+    ctx = get_script_run_ctx()
+    timeout = PAGE_DEADLINE if deadline is None else deadline
+    at = time.monotonic() + timeout
+    futures = {
+        name: _executor().submit(_run, ctx, at, call[0], call[1:])
+        for name, call in calls.items()
+    }
+    wait(futures.values(), timeout=timeout)
+
+    results = {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            logger.warning(f"page section '{name}' missed the deadline")
+            results[name] = default
+        elif future.exception() is not None:
+            logger.warning(f"page section '{name}' failed: {future.exception()}")
+            results[name] = default
+        else:
+            results[name] = future.result()
+    return results
@@ -5,21 +5,20 @@ logger = logging.getLogger(__name__)
 import streamlit as st
 import requests
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 st.set_page_config(layout = 'wide')
 
-API_BASE_URL = "http://web-api:4000"
-
 # API Functions:
 
-# gets all closets for a given customer
-def get_customer_closets(customer_id):
+# gets the closets, outfits and counts shown on this page in one call
+def get_closet_overview(customer_id):
     try:
-        response = requests.get(f"{API_BASE_URL}/customer/{customer_id}/closets")
+        response = api.cached_get(f"/customer/{customer_id}/closet-overview")
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
-        st.error(f"❌ Cannot connect to backend at {API_BASE_URL}")
+        st.error(f"❌ Cannot connect to backend at {api.API_BASE_URL}")
         return None
     except requests.exceptions.HTTPError as e:
         st.error(f"❌ HTTP Error")
@@ -85,28 +84,12 @@ st.subheader("View Clothing Items or Outfits")
 
 st.divider()
 
-closet_data = get_customer_closets(st.session_state['customer_id'])
+closet_data = get_closet_overview(st.session_state['customer_id'])
 
 if closet_data:
-    items = closet_data.get('items', [])
-    outfits = closet_data.get('outfits', [])
-
-    closets = {}
-    for item in items:
-        closet_id = item['ClosetID']
-        if closet_id not in closets:
-            closets[closet_id] = {
-                'id': closet_id,
-                'items_count': 0,
-                'outfits_count': 0
-            }
-        closets[closet_id]['items_count'] += 1
-
-    for outfit in outfits:
-        closet_id = outfit.get('ClosetID')
-        if closet_id and closet_id in closets:
-            closets[closet_id]['outfits_count'] += 1
-    
+    outfits = closet_data['outfits']
+    closets = {closet['ClosetID']: closet for closet in closet_data['closets']}
+
     if not closets:
         st.info("You don't have any closets yet.")
     else:
@@ -117,13 +100,7 @@ if closet_data:
         for idx, (closet_id, closet_info) in enumerate(closets.items()):
             with cols[idx % 3]:
                 with st.container(border=True):
-                    closet_names = {
-                        109: "Gym Bag", 110: "Office Fits", 111: "Date Night",
-                        112: "Casual", 113: "Summer 2025", 114: "Winter Vault",
-                        115: "Interview Clothes", 116: "Lounge", 117: "Party Wear",
-                        118: "Beach Trip", 119: "Hiking", 120: "Daily Rotation"
-                    }
-                    closet_name = closet_names.get(closet_id, f"Closet {closet_id}")
+                    closet_name = closet_info['NickName'] or f"Closet {closet_id}"
 
                     st.markdown(f"### 🗂️ {closet_name}")
                     st.markdown(
@@ -134,9 +111,9 @@ if closet_data:
                     st.write()
                     col_a, col_b = st.columns(2)
                     with col_a:
-                        st.metric("Items", closet_info['items_count'])
+                        st.metric("Items", closet_info['ItemCount'])
                     with col_b:
-                        st.metric("Outfits", closet_info['outfits_count'])
+                        st.metric("Outfits", closet_info['OutfitCount'])
                     
                     st.write("")
                     if st.button(f"Open Closet", key=f"open_closet_{closet_id}"):
@@ -173,25 +150,15 @@ if closet_data:
     st.caption("Create and manage outfits consisting of items across all your closets!")
 
     if outfits:
-        outfit_dict = {}
-        for outfit in outfits:
-            outfit_id = outfit['OutfitID']
-            if outfit_id not in outfit_dict:
-                outfit_dict[outfit_id] = {
-                    'name': outfit['OutfitName'],
-                    'items': []
-                }
-            outfit_dict[outfit_id]['items'].append(outfit['ItemName'])
+        totals = closet_data['totals']
 
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Outfits", len(outfit_dict))
+            st.metric("Total Outfits", totals['outfits'])
         with col2: 
-            total_items_in_outfits = sum(len(o['items']) for o in outfit_dict.values())
-            st.metric("Total Items Used", total_items_in_outfits)
+            st.metric("Total Items Used", totals['items_in_outfits'])
         with col3:
-            avg_items = total_items_in_outfits / len(outfit_dict) if outfit_dict else 0
-            st.metric("Avg Items/Outfit", f"{avg_items:.1f}")
+            st.metric("Avg Items/Outfit", f"{totals['avg_items_per_outfit']:.1f}")
 
         st.write("")
 
@@ -199,16 +166,16 @@ if closet_data:
         st.markdown("**Recent Outfits:**")
         preview_cols = st.columns(3)
 
-        for idx, (outfit_id, outfit_data) in enumerate(list(outfit_dict.items())[:3]):
+        for idx, outfit in enumerate(outfits[:3]):
             with preview_cols[idx]:
                 with st.container(border=True):
-                    st.markdown(f"**{outfit_data['name']}**")
-                    st.caption(f"{len(outfit_data['items'])} items")
+                    st.markdown(f"**{outfit['OutfitName']}**")
+                    st.caption(f"{outfit['ItemCount']} items")
 
-                    if outfit_data['items']:
-                        st.markdown(f"* {outfit_data['items'][0]}")
-                        if len(outfit_data['items']) > 1:
-                            st.markdown(f"**{len(outfit_data['items']) - 1} more**")
+                    if outfit['Items']:
+                        st.markdown(f"* {outfit['Items'][0]}")
+                        if outfit['ItemCount'] > 1:
+                            st.markdown(f"**{outfit['ItemCount'] - 1} more**")
 
         st.write()
         if st.button("View All My Outfits", key="view_all_outfits_button", use_container_width=True):
@@ -229,27 +196,17 @@ with st.sidebar:
     st.markdown("### 📊 Account Overview")
     
     if closet_data and closets:
-        st.metric("Total Closets", len(closets))
-        
-        total_items = sum(c['items_count'] for c in closets.values())
-        total_outfits = sum(c['outfits_count'] for c in closets.values())
-        
-        st.metric("Total Items", total_items)
-        st.metric("Total Outfits", total_outfits)
+        totals = closet_data['totals']
+        st.metric("Total Closets", totals['closets'])
+        st.metric("Total Items", totals['items'])
+        st.metric("Total Outfits", totals['outfits'])
         
         # Show largest closet
-        if closets:
-            largest_closet = max(closets.items(), key=lambda x: x[1]['items_count'])
-            closet_names = {
-                109: "Gym Bag", 110: "Office Fits", 111: "Date Night",
-                112: "Casual", 113: "Summer 2025", 114: "Winter Vault",
-                115: "Interview Clothes", 116: "Lounge"
-            }
-            largest_name = closet_names.get(largest_closet[0], f"Closet {largest_closet[0]}")
-            
+        largest_closet = closet_data['largest_closet']
+        if largest_closet:
             st.markdown("**Largest Closet**")
-            st.text(f"{largest_name}")
-            st.text(f"({largest_closet[1]['items_count']} items)")
+            st.text(largest_closet['NickName'] or f"Closet {largest_closet['ClosetID']}")
+            st.text(f"({largest_closet['ItemCount']} items)")
     
     st.markdown("---")
     
@@ -257,4 +214,5 @@ with st.sidebar:
         st.info(f"📂 Active: {st.session_state.get('closet_name', 'Closet')}")
     
     if st.button("🔄 Refresh Data"):
+        api.invalidate(f"/customer/{st.session_state['customer_id']}/closet-overview")
         st.rerun()
\ No newline at end of file
@@ -5,8 +5,6 @@ from modules.nav import SideBarLinks
 
 st.set_page_config(layout = 'wide')
 
-API_BASE_URL = "http://localhost:8501/"
-
 # Show appropriate sidebar links for the role of the currently logged in user
 SideBarLinks()
 
@@ -3,28 +3,27 @@ logger = logging.getLogger(__name__)
 import requests
 import streamlit as st
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 st.set_page_config(layout= 'wide')
 
-API_BASE_URL = "http://localhost:4000"
-
 # Show appropriate sidebar links for the role of the currently logged in user
 SideBarLinks()
 
 def get_customer_closets(customer_id):
     try:
-        response = requests.get(f"{API_BASE_URL}/customer/{customer_id}/closets")
+        response = api.cached_get(f"/customer/{customer_id}/closets")
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
-        st.error(f"❌ Cannot connect to backend at {API_BASE_URL}")
-        return []
+        st.error(f"❌ Cannot connect to backend at {api.API_BASE_URL}")
+        return {}
     except requests.exceptions.HTTPError as e:
         st.error(f"❌ HTTP Error")
-        return []
+        return {}
     except Exception as e:
         st.error(f"❌ error")
-        return []
+        return {}
     
 
 if 'customer_id' not in st.session_state:
@@ -36,9 +35,9 @@ if 'customer_id' not in st.session_state:
 # Gets overall consumer closet data:
 closets = get_customer_closets(st.session_state['customer_id'])
 
-# For closet summary:
-closet_size = sum(c.get('item_count', 0) for c in closets)
-outfits_count = sum(c.get('outfit_count', 0) for c in closets)
+# For closet summary ("outfits" only lists outfits whose items are all in the closet):
+closet_size = len(closets.get('items', []))
+outfits_count = len(closets.get('outfits', []))
 
 st.title(f"{st.session_state['first_name']}'s Profile")
 st.markdown("Manage your account settings and view your closet statistics.")
@@ -61,8 +60,8 @@ with col2:
     st.markdown(f"**Email:** {st.session_state.email}")
 
     st.subheader("Closet Statistics")
-    st.progress(closet_size / 100, text=f"{closet_size} items in closet (100 max)")
-    st.markdown(f"**Outfits Generated:** {outfits_count}")
+    st.progress(min(closet_size / 100, 1.0), text=f"{closet_size} items in closet (100 max)")
+    st.markdown(f"**Complete Outfits:** {outfits_count}")
 
 st.write("---")
 
@@ -4,21 +4,20 @@ import streamlit as st
 import time
 import requests
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 st.set_page_config(layout='wide')
 
-API_BASE_URL = "http://web-api:4000"
-
 # API retrieval functions: 
 
 # 1) get the customer's wishlist
 def get_customer_wishlist(customer_id):
     try: 
-        response = requests.get(f"{API_BASE_URL}/customer/{customer_id}/wishlists", timeout=5)
+        response = api.cached_get(f"/customer/{customer_id}/wishlists", timeout=5)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
-        st.error(f"❌ Cannot connect to backend at {API_BASE_URL}. Is your Flask server running?")
+        st.error(f"❌ Cannot connect to backend at {api.API_BASE_URL}. Is your Flask server running?")
         return None
     except requests.exceptions.Timeout:
         st.error(f"❌ Request timed out. Backend may be slow or not responding.")
@@ -36,9 +35,7 @@ def get_customer_wishlist(customer_id):
 # 2) add a clothing item to the wishlist
 def add_item_to_wishlist(customer_id, wishlist_id, item_id):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/customer/{customer_id}/wishlists/{wishlist_id}/items/{item_id}"
-        )
+        response = api.add_item_to_wishlist(customer_id, wishlist_id, item_id)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
@@ -54,10 +51,7 @@ def add_item_to_wishlist(customer_id, wishlist_id, item_id):
 # 3) create a new clothing item
 def create_clothing_item(item_data):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/items",
-            json=item_data
-        )
+        response = api.create_clothing_item(item_data)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as e:
@@ -70,9 +64,7 @@ def create_clothing_item(item_data):
 # 4) move item from wishlist to closet
 def move_to_closet(customer_id, closet_id, item_id):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/customer/{customer_id}/closets/{closet_id}/item/{item_id}"
-        )
+        response = api.add_item_to_closet(customer_id, closet_id, item_id)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.HTTPError as e:
@@ -206,6 +198,9 @@ if wishlist_data:
         # Show aesthetic matches if available
         if aesthetic_matches:
             st.info(f"✨ {len(aesthetic_matches)} items match your closet's aesthetic!")
+            # matches come strongest first
+            for match in aesthetic_matches[:3]:
+                st.caption(f"**{match['Name']}** shares {', '.join(match['SharedAesthetics'])}")
 
         st.divider()
 
@@ -343,5 +338,6 @@ with st.sidebar:
 
     st.markdown("---")
     if st.button("🔄 Refresh Data"):
+        api.invalidate(f"/customer/{st.session_state['customer_id']}/wishlists")
         time.sleep(1.5)
         st.rerun()
\ No newline at end of file
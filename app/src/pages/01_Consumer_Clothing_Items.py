@@ -4,22 +4,21 @@ import streamlit as st
 import requests
 import time
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 st.set_page_config(layout= 'wide')
 
-API_BASE_URL = "http://web-api:4000"
-
 # API retrival functions: 
 
 # 1) get the customer's closet
 
 def get_customer_closet(customer_id):
     try: 
-        response = requests.get(f"{API_BASE_URL}/customer/{customer_id}/closets", timeout=5)
+        response = api.cached_get(f"/customer/{customer_id}/closets", timeout=5)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
-        st.error(f"❌ Cannot connect to backend at {API_BASE_URL}. Is your Flask server running?")
+        st.error(f"❌ Cannot connect to backend at {api.API_BASE_URL}. Is your Flask server running?")
         return None
     except requests.exceptions.Timeout:
         st.error(f"❌ Request timed out. Backend may be slow or not responding.")
@@ -38,9 +37,7 @@ def get_customer_closet(customer_id):
 # 2) add a clothing item to the closet
 def add_item_to_closet(customer_id, closet_id, item_id):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/customer/{customer_id}/closets/{closet_id}/item/{item_id}"
-        )
+        response = api.add_item_to_closet(customer_id, closet_id, item_id)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
@@ -56,10 +53,7 @@ def add_item_to_closet(customer_id, closet_id, item_id):
 # 3) creates a new clothing item with given information by the user
 def create_clothing_item(item_data):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/items",
-            json=item_data
-        )
+        response = api.create_clothing_item(item_data)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
@@ -374,5 +368,6 @@ with st.sidebar:
 
     st.markdown("---")
     if st.button("🔄 Refresh Data"):
+        api.invalidate(f"/customer/{st.session_state['customer_id']}/closets")
         time.sleep(1.5)
         st.rerun()
\ No newline at end of file
@@ -4,21 +4,20 @@ import streamlit as st
 import requests
 import time
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 st.set_page_config(layout= 'wide')
 
-API_BASE_URL = "http://web-api:4000"
-
 # API retrival functions: 
 
-# 1) get the customer's closet
-def get_customer_closet(customer_id):
+# 1) get the customer's outfits, already grouped by the API
+def get_closet_overview(customer_id):
     try: 
-        response = requests.get(f"{API_BASE_URL}/customer/{customer_id}/closets", timeout=5)
+        response = api.cached_get(f"/customer/{customer_id}/closet-overview", timeout=5)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
-        st.error(f"❌ Cannot connect to backend at {API_BASE_URL}. Is your Flask server running?")
+        st.error(f"❌ Cannot connect to backend at {api.API_BASE_URL}. Is your Flask server running?")
         return None
     except requests.exceptions.Timeout:
         st.error(f"❌ Request timed out. Backend may be slow or not responding.")
@@ -34,12 +33,21 @@ def get_customer_closet(customer_id):
         return None
     
 
-# 2) add an outfit to the closet
+# 2) outfits wearable from the closet, and outfits missing one or two items
+def get_wearable_outfits(customer_id):
+    try:
+        response = api.cached_get(f"/customer/{customer_id}/outfits/wearable", params={"missing": 2}, timeout=5)
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        logger.warning(f"could not load wearable outfits: {e}")
+        return None
+
+
+# 3) add an outfit to the closet
 def add_closet_outfit(customer_id, closet_id, outfit_id):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/customer/{customer_id}/closets/{closet_id}/outfit/{outfit_id}"
-        )
+        response = api.add_outfit_to_closet(customer_id, closet_id, outfit_id)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
@@ -62,13 +70,10 @@ def add_closet_outfit(customer_id, closet_id, outfit_id):
         st.error(f"❌ Error")
         return None
 
-# 3) adds a clothing item to an outfit.
+# 4) adds a clothing item to an outfit.
 def create_outfit(outfit_data):
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/outfits",
-            json=outfit_data
-        )
+        response = api.create_outfit(outfit_data)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
@@ -81,13 +86,10 @@ def create_outfit(outfit_data):
         st.error(f"❌ Error")
         return None
 
-# 4) delete an outfit
-def delete_outfit(outfit_id):
+# 5) delete an outfit
+def delete_outfit(customer_id, outfit_id):
     try:
-        response = requests.delete(
-            f"{API_BASE_URL}/outfits/{outfit_id}",
-            timeout=5
-        )
+        response = api.delete_outfit(customer_id, outfit_id)
         response.raise_for_status()
         try:
             return response.json()
@@ -168,7 +170,7 @@ st.divider()
 
 
 # need to get the data:
-closet_data = get_customer_closet(st.session_state['customer_id'])
+closet_data = get_closet_overview(st.session_state['customer_id'])
 
 if closet_data:
     outfits = closet_data.get('outfits', [])
@@ -215,27 +217,18 @@ if closet_data:
     else:
         st.subheader(f"👔 Total Outfits: {len(outfits)}")
 
-        # group outfit info and outfits by OutfitID (each outfit w its corresponding items)
-        outfit_dict = {}
-        for outfit in outfits:
-            outfit_id = outfit['OutfitID']
-            if outfit_id not in outfit_dict:
-                outfit_dict[outfit_id] = {
-                    'name': outfit['OutfitName'],
-                    'items': []
-                }
-            outfit_dict[outfit_id]['items'].append(outfit['ItemName'])
-
         st.divider()
 
-        # display the outfits:
-        if not outfit_dict:
+        # display the outfits (the API returns each outfit with its items):
+        if not outfits:
             st.warning("No outfits to display.")
         else:
-            st.markdown(f"**Showing {len(outfit_dict)} outfits**")
+            st.markdown(f"**Showing {len(outfits)} outfits**")
             cols = st.columns(2)
 
-            for idx, (outfit_id, outfit_data) in enumerate(outfit_dict.items()):
+            for idx, outfit in enumerate(outfits):
+                outfit_id = outfit['OutfitID']
+                outfit_data = {'name': outfit['OutfitName'], 'items': outfit['Items']}
                 with cols[idx % 2]:
                     with st.container(border=True):
                         header_col1, header_col2 = st.columns([4, 1])
@@ -261,7 +254,7 @@ if closet_data:
                         with header_col2:
                             if st.button("🗑️ Delete", key=f"delete_{outfit_id}", help="Delete Outfit"):
                                 if st.session_state.get(f'confirm_delete_{outfit_id}'):
-                                    result = delete_outfit(outfit_id)
+                                    result = delete_outfit(st.session_state['customer_id'], outfit_id)
                                     if result:
                                         st.success("✅ Outfit deleted!")
                                         time.sleep(1.5)
@@ -280,6 +273,19 @@ if closet_data:
 
 
             st.divider()
+
+            # what can be worn right now, and what is one or two items away
+            wearable = get_wearable_outfits(st.session_state['customer_id'])
+            if wearable:
+                st.subheader(f"✅ Ready to Wear: {len(wearable['complete'])}")
+                for outfit in wearable['complete']:
+                    st.markdown(f"- **{outfit['OutfitName']}**: {', '.join(outfit['Items'])}")
+                if wearable['near_misses']:
+                    with st.expander(f"🧩 Almost There ({len(wearable['near_misses'])} outfits)"):
+                        for outfit in wearable['near_misses']:
+                            needed = ', '.join(item['Name'] for item in outfit['Missing'])
+                            st.markdown(f"- **{outfit['OutfitName']}**: needs {needed}")
+                st.divider()
             
             # add a new outfit section:
             with st.expander("➕ Add New Outfit"):
@@ -335,29 +341,23 @@ with st.sidebar:
         outfits = closet_data.get('outfits', [])
 
         if outfits:
-            unique_outfits = len(set([o['OutfitID'] for o in outfits]))
-            total_items_in_outfits = len(outfits)
+            totals = closet_data['totals']
+            st.metric("Total Outfits", totals['outfits'])
+            st.metric("Total Items in Outfits", totals['items_in_outfits'])
 
-            st.metric("Total Outfits", unique_outfits)
-            st.metric("Total Items in Outfits", total_items_in_outfits)
-
-            outfit_counts = {}
-            for outfit in outfits:
-                outfit_id = outfit['OutfitID']
-                outfit_name = outfit['OutfitName']
-                if outfit_id not in outfit_counts:
-                    outfit_counts[outfit_id] = {'name': outfit_name, 'count': 0}
-                outfit_counts[outfit_id]['count'] += 1
-            
-            if outfit_counts:
-                most_items_outfit = max(outfit_counts.items(), key=lambda x: x[1]['count'])
+            largest_outfit = closet_data['largest_outfit']
+            if largest_outfit:
                 st.markdown("**Largest Outfit**")
-                st.text(f"{most_items_outfit[1]['name']}")
-                st.text(f"({most_items_outfit[1]['count']} items)")
+                st.text(f"{largest_outfit['OutfitName']}")
+                st.text(f"({largest_outfit['ItemCount']} items)")
 
         else: 
             st.info("No outfits yet!")
 
     st.markdown("---")
     if st.button("🔄 Refresh Data"):
+        api.invalidate(
+            f"/customer/{st.session_state['customer_id']}/closet-overview",
+            f"/customer/{st.session_state['customer_id']}/outfits/wearable",
+        )
         st.rerun()
@@ -1,8 +1,10 @@
+import json
 import logging
+import random
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
-import requests
+from modules import api_client as api
 
 st.set_page_config(layout = 'wide')
 
@@ -13,16 +15,81 @@ st.title('App Administration Page')
 st.write('\n\n')
 st.write('## Model 1 Maintenance')
 
-st.button("Train Model 01", 
+if st.button("Train Model 01", 
             type = 'primary', 
-            use_container_width=True)
+            use_container_width=True):
+  resp = api.post('/prediction/train', timeout=600)
+  if resp.status_code == 201:
+    report = resp.json()
+    st.success(f"Promoted version {report['version']}: {[round(p, 4) for p in report['params']]}")
+    c1, c2, c3 = st.columns(3)
+    c1.metric('Training rows', f"{report['rows']:,}")
+    c2.metric('Time (s)', report['seconds'])
+    c3.metric('Peak RSS (MB)', report['max_rss_mb'])
+  else:
+    st.error(resp.json().get('error', 'Training failed'))
 
-st.button('Test Model 01', 
+if st.button('Test Model 01', 
             type = 'primary', 
-            use_container_width=True)
+            use_container_width=True):
+  resp = api.post('/prediction/test', timeout=600)
+  if resp.status_code == 200:
+    report = resp.json()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric('Holdout rows', f"{report['rows']:,}")
+    c2.metric('RMSE', report['rmse'])
+    c3.metric('MAE', report['mae'])
+    c4.metric('R²', report['r2'] if report['r2'] is not None else 'n/a')
+    st.caption(f"Version {report['version']} · {report['seconds']}s · peak RSS {report['max_rss_mb']} MB")
+  else:
+    st.error(resp.json().get('error', 'Testing failed'))
 
 if st.button('Model 1 - get predicted value for 10, 25', 
              type = 'primary',
              use_container_width=True):
-  results = requests.get('http://web-api:4000/prediction/10/25').json()
-  st.dataframe(results)
+  results = api.get('/prediction/10/25').json()
+  st.dataframe([results])
+
+if st.button('Model 1 - score a batch of 5,000 random inputs',
+             type = 'primary',
+             use_container_width=True):
+  rows = [[random.uniform(0, 100), random.uniform(0, 100)] for _ in range(5000)]
+  resp = api.post('/prediction/batch', json={'rows': rows}, timeout=30)
+  if resp.status_code == 200:
+    # NDJSON: {"predictions": [...]} lines, then a summary line
+    lines = [json.loads(line) for line in resp.text.splitlines() if line]
+    summary = lines[-1]
+    predictions = [p for line in lines[:-1] for p in line['predictions']]
+    c1, c2, c3 = st.columns(3)
+    c1.metric('Rows', summary['rows'])
+    c2.metric('Latency (ms)', summary['latency_ms'])
+    c3.metric('Rows / second', f"{summary['rows_per_second']:,}" if summary['rows_per_second'] else 'n/a')
+    st.dataframe([{'var01': r[0], 'var02': r[1], 'prediction': p} for r, p in zip(rows[:20], predictions)])
+  else:
+    st.error(resp.json().get('error', 'Batch prediction failed'))
+
+st.write('\n\n')
+st.write('## Model 1 Versions')
+
+resp = api.get('/prediction/models/model01')
+versions = resp.json().get('versions', []) if resp.status_code == 200 else []
+if versions:
+  st.dataframe([{'Version': v['Version'], 'Active': '✅' if v['Active'] else '',
+                 'Rows': (v['Metrics'] or {}).get('rows'), 'Created': v['CreatedAt']} for v in versions])
+  col1, col2 = st.columns(2)
+  with col1:
+    version = st.selectbox('Version', [v['Version'] for v in versions])
+    if st.button('Promote', use_container_width=True):
+      resp = api.post('/prediction/models/model01/promote', json={'version': version})
+      if resp.status_code == 200:
+        st.rerun()
+      st.error(resp.json().get('error', 'Promote failed'))
+  with col2:
+    st.write('\n')
+    if st.button('Roll back to previous version', use_container_width=True):
+      resp = api.post('/prediction/models/model01/rollback')
+      if resp.status_code == 200:
+        st.rerun()
+      st.error(resp.json().get('error', 'Rollback failed'))
+else:
+  st.info('No model versions registered yet')
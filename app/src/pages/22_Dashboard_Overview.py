@@ -2,7 +2,8 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
-import requests
+from modules import api_client as api
+from modules.fanout import fetch_all
 import pandas as pd
 import altair as alt
 
@@ -11,13 +12,16 @@ st.set_page_config(layout='wide')
 SideBarLinks()
 
 
-API_BASE_URL = "http://web-api:4000"
+USERS_PAGE_SIZE = 100
 
 
-def get_admin_users():
-    """GET /admin/users"""
+def get_admin_users(after=None):
+    """GET /admin/users?limit=&after= -> (success, page body or error text)"""
+    params = {"limit": USERS_PAGE_SIZE}
+    if after:
+        params["after"] = after
     try:
-        resp = requests.get(f"{API_BASE_URL}/admin/users", timeout=10)
+        resp = api.get("/admin/users", params=params, timeout=10)
         return (True, resp.json()) if resp.status_code == 200 else (False, resp.text)
     except Exception as e:
         return False, str(e)
@@ -25,14 +29,24 @@ def get_admin_users():
 def get_admin_logs():
     """GET /admin/logs"""
     try:
-        resp = requests.get(f"{API_BASE_URL}/admin/logs", timeout=10)
+        resp = api.get("/admin/logs", timeout=10)
         return (True, resp.json()) if resp.status_code == 200 else (False, resp.text)
     except Exception as e:
         return False, str(e)
 
 
-success_users, users_data = get_admin_users()
-success_logs, logs_data = get_admin_logs()
+# "after" cursors of the user pages already paged past, so Previous can step back
+if "user_cursors" not in st.session_state:
+    st.session_state["user_cursors"] = []
+user_cursors = st.session_state["user_cursors"]
+
+results = fetch_all({
+    "users": (get_admin_users, user_cursors[-1] if user_cursors else None),
+    "logs": (get_admin_logs,),
+}, default=(False, "the API did not respond in time"))
+success_users, users_page = results["users"]
+users_data = users_page["items"] if success_users else users_page
+success_logs, logs_data = results["logs"]
 
 
 st.title("Dashboard & Overview Page")
@@ -40,8 +54,9 @@ st.title("Dashboard & Overview Page")
 
 col1, col2, col3 = st.columns(3)
 with col1:
-    total_users = len(users_data) if success_users else 0
-    st.metric("👥 Total Users", total_users)
+    page_users = len(users_data) if success_users else 0
+    more = "+" if success_users and users_page["next_cursor"] else ""
+    st.metric("👥 Users (this page)", f"{page_users}{more}")
 with col2:
     busi_logs = len(logs_data.get('business_logs', [])) if success_logs else 0
     st.metric("🏢 Business Logs", busi_logs)
@@ -56,6 +71,16 @@ st.subheader("User Management")
 if success_users and users_data:
     df = pd.DataFrame(users_data)
     st.dataframe(df, use_container_width=True, hide_index=True)
+
+    prev_col, next_col = st.columns(2)
+    with prev_col:
+        if st.button("⬅️ Previous users", disabled=not user_cursors, use_container_width=True):
+            user_cursors.pop()
+            st.rerun()
+    with next_col:
+        if st.button("Next users ➡️", disabled=users_page["next_cursor"] is None, use_container_width=True):
+            user_cursors.append(users_page["next_cursor"])
+            st.rerun()
 else:
     st.error(f"Failed to load users: {users_data}")
 
@@ -2,30 +2,36 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
-import requests
+from modules import api_client as api
 
 
 st.set_page_config(layout='wide')
 SideBarLinks()
 
 
-API_BASE_URL = "http://web-api:4000"
+PAGE_SIZE = 25
 
 
 st.title('Business Client Management Page')
 
-def get_all_business():
-    """GET /business/users"""
+def get_business_page(after=None):
+    """GET /business/users?limit=&after= -> (success, businesses, next_cursor)"""
+    params = {"limit": PAGE_SIZE}
+    if after:
+        params["after"] = after
     try:
-        resp = requests.get(f"{API_BASE_URL}/business/users", timeout=10)
-        return (True, resp.json()) if resp.status_code == 200 else (False, [])
+        resp = api.get("/business/users", params=params, timeout=10)
+        if resp.status_code != 200:
+            return False, [], None
+        data = resp.json()
+        return True, data["items"], data["next_cursor"]
     except:
-        return False, []
+        return False, [], None
 
 def create_business(data):
     """POST /business/users"""
     try:
-        resp = requests.post(f"{API_BASE_URL}/business/users", json=data, timeout=10)
+        resp = api.post("/business/users", json=data, timeout=10)
         return (True, resp.json()) if resp.status_code == 201 else (False, resp.text)
     except Exception as e:
         return False, str(e)
@@ -33,7 +39,7 @@ def create_business(data):
 def delete_business(company_id):
     """DELETE /business/users/<int:company_id>"""
     try:
-        resp = requests.delete(f"{API_BASE_URL}/business/users/{company_id}", timeout=10)
+        resp = api.delete(f"/business/users/{company_id}", timeout=10)
         return (True, resp.json()) if resp.status_code == 200 else (False, resp.text)
     except Exception as e:
         return False, str(e)
@@ -43,9 +49,13 @@ if 'view_mode' not in st.session_state:
     st.session_state.view_mode = 'list'
 if 'selected_client' not in st.session_state:
     st.session_state.selected_client = None
+# "after" cursors of the pages already paged past, so Previous can step back
+if 'business_cursors' not in st.session_state:
+    st.session_state.business_cursors = []
 
 
-success, businesses = get_all_business()
+page_cursors = st.session_state.business_cursors
+success, businesses, next_cursor = get_business_page(page_cursors[-1] if page_cursors else None)
 
 
 if st.session_state.view_mode != 'list':
@@ -66,7 +76,7 @@ if st.session_state.view_mode == 'list':
             st.rerun()
     
     st.divider()
-    st.subheader(f"Business Clients ({len(businesses) if success else 0})")
+    st.subheader(f"Business Clients (page {len(page_cursors) + 1})")
     
     if success and businesses:
         for client in businesses:
@@ -87,6 +97,16 @@ if st.session_state.view_mode == 'list':
     else:
         st.warning("No businesses found or API unavailable")
 
+    prev_col, next_col = st.columns(2)
+    with prev_col:
+        if st.button("⬅️ Previous page", disabled=not page_cursors, use_container_width=True):
+            page_cursors.pop()
+            st.rerun()
+    with next_col:
+        if st.button("Next page ➡️", disabled=next_cursor is None, use_container_width=True):
+            page_cursors.append(next_cursor)
+            st.rerun()
+
 elif st.session_state.view_mode == 'profile':
     st.title('Business Client Profile')
     
@@ -2,36 +2,58 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
-import requests
+from modules import api_client as api
 
 
 st.set_page_config(layout='wide')
 SideBarLinks()
 
 
-API_BASE_URL = "http://web-api:4000"
-
-
-def get_top_wishlisted():
-    """GET /analytics/analytics/demand"""
+def get_top_wishlisted(k=10, category=None):
+    """GET /analytics/demand?k=&category="""
+    params = {"k": k}
+    if category:
+        params["category"] = category
     try:
-        resp = requests.get(f"{API_BASE_URL}/analytics/analytics/demand", timeout=10)
+        resp = api.cached_get("/analytics/demand", params=params, ttl=15, timeout=10)
         return (True, resp.json()) if resp.status_code == 200 else (False, [])
     except:
         return False, []
 
 
+def get_wishlist_matching(k=20):
+    """GET /analytics/matching?k= -> {"matched": [...], "unmatched": [...]}"""
+    try:
+        resp = api.cached_get("/analytics/matching", params={"k": k}, ttl=15, timeout=10)
+        return (True, resp.json()) if resp.status_code == 200 else (False, {})
+    except:
+        return False, {}
+
+
 st.title('Wishlist Matching Page')
 
 if 'view' not in st.session_state:
     st.session_state.view = 'main'
 
-if 'mapping_suggestions' not in st.session_state:
-    st.session_state.mapping_suggestions = [
-        {'item_name': 'White winter hood', 'wishlist_count': 36, 'business': 'Gucci', 'sku': '14Kp569', 'mapped': False},
-        {'item_name': 'Black leather jacket', 'wishlist_count': 28, 'business': 'Gap', 'sku': '22Lj891', 'mapped': False},
-        {'item_name': 'Blue denim jeans', 'wishlist_count': 24, 'business': 'Target Style', 'sku': '33Dj452', 'mapped': False},
-    ]
+match_success, matching = get_wishlist_matching()
+unmatched_items = matching.get('unmatched', []) if match_success else []
+
+# suggestions come from the wishlist <-> inventory index; the Map/Undo
+# state is kept per item for the session
+if 'mapped_items' not in st.session_state:
+    st.session_state.mapped_items = set()
+st.session_state.mapping_suggestions = [
+    {
+        'item_id': item['ItemID'],
+        'item_name': item.get('Name', 'Unknown'),
+        'wishlist_count': item.get('total_wishlists', 0),
+        'business': item['suppliers'][0]['CompanyName'],
+        'in_stock': item['suppliers'][0]['QuantityInStock'],
+        'other_suppliers': len(item['suppliers']) - 1,
+        'mapped': item['ItemID'] in st.session_state.mapped_items,
+    }
+    for item in (matching.get('matched', []) if match_success else [])
+]
 
 if 'mapping_history' not in st.session_state:
     st.session_state.mapping_history = []
@@ -62,18 +84,31 @@ if st.session_state.view == 'main':
     st.subheader('Statistics')
     c1, c2 = st.columns(2)
     c1.metric("Top Wishlisted Items", len(wishlisted_data) if success else 0)
-    unmatched_count = len([m for m in st.session_state.mapping_suggestions if not m['mapped']])
-    c2.metric("Unmatched Items", unmatched_count)
+    c2.metric("Unmatched Items", len(unmatched_items))
 
 
 elif st.session_state.view == 'top':
     back_button()
     st.title('Top Wishlisted')
     
-    if success and wishlisted_data:
-        for i, item in enumerate(wishlisted_data[:10]):
+    # categories present among the 100 most wishlisted items
+    _, ranked = get_top_wishlisted(100)
+    categories = sorted({item['Category'] for item in ranked if item.get('Category')})
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        category = st.selectbox("Category", ["All"] + categories)
+    with col2:
+        k = st.number_input("Show top", min_value=1, max_value=100, value=10)
+
+    if category == "All" and k == 10:
+        top_success, top_data = success, wishlisted_data
+    else:
+        top_success, top_data = get_top_wishlisted(k, None if category == "All" else category)
+
+    if top_success and top_data:
+        for i, item in enumerate(top_data):
             rank = ["🥇", "🥈", "🥉"][i] if i < 3 else f"#{i+1}"
-            st.write(f"{rank} **{item.get('Name', 'Unknown')}** — Wishlists: {item.get('total_wishlists', 0)}")
+            st.write(f"{rank} **{item.get('Name', 'Unknown')}** ({item.get('Category') or 'Uncategorized'}) — Wishlists: {item.get('total_wishlists', 0)}")
             st.divider()
     else:
         st.info("No wishlist data available")
@@ -83,14 +118,15 @@ elif st.session_state.view == 'unmatched':
     back_button()
     st.title('Unmatched Items')
     
-    unmatched = [m for m in st.session_state.mapping_suggestions if not m['mapped']]
-    if unmatched:
-        for item in unmatched:
-            st.write(f"**{item['item_name']}** — Wishlists: {item['wishlist_count']}")
-            st.caption("⚠️ Not mapped to any business SKU")
+    if not match_success:
+        st.info("No matching data available")
+    elif unmatched_items:
+        for item in unmatched_items:
+            st.write(f"**{item.get('Name', 'Unknown')}** — Wishlists: {item.get('total_wishlists', 0)}")
+            st.caption("⚠️ No business has this item in stock")
             st.divider()
     else:
-        st.success("✅ All items have been mapped!")
+        st.success("✅ Every top wishlisted item is in stock somewhere!")
 
 
 elif st.session_state.view == 'mapping':
@@ -99,10 +135,7 @@ elif st.session_state.view == 'mapping':
     
     if st.session_state.mapping_history:
         if st.button("↩️ Undo Last Mapping"):
-            last = st.session_state.mapping_history.pop()
-            for s in st.session_state.mapping_suggestions:
-                if s['item_name'] == last:
-                    s['mapped'] = False
+            st.session_state.mapped_items.discard(st.session_state.mapping_history.pop())
             st.rerun()
     
     unmatched = [s for s in st.session_state.mapping_suggestions if not s['mapped']]
@@ -113,8 +146,10 @@ elif st.session_state.view == 'mapping':
         for s in unmatched:
             with st.container(border=True):
                 st.write(f"**Item:** {s['item_name']}")
-                st.write(f"**Business:** {s['business']} | **SKU:** {s['sku']}")
-                if st.button("Map", key=s['item_name'], use_container_width=True, type="primary"):
-                    s['mapped'] = True
-                    st.session_state.mapping_history.append(s['item_name'])
+                st.write(f"**Business:** {s['business']} | **In stock:** {s['in_stock']} | **Wishlists:** {s['wishlist_count']}")
+                if s['other_suppliers']:
+                    st.caption(f"Also stocked by {s['other_suppliers']} other business(es)")
+                if st.button("Map", key=f"map_{s['item_id']}", use_container_width=True, type="primary"):
+                    st.session_state.mapped_items.add(s['item_id'])
+                    st.session_state.mapping_history.append(s['item_id'])
                     st.rerun()
\ No newline at end of file
@@ -2,7 +2,8 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
-import requests
+from modules import api_client as api
+from modules.fanout import fetch_all
 from datetime import datetime
 
 
@@ -10,22 +11,19 @@ st.set_page_config(layout='wide')
 SideBarLinks()
 
 
-API_BASE_URL = "http://localhost:4000/"
-
-
 def get_customer_notifications(customer_id):
-    """GET /customer/customer/<int:customer_id>/notifications"""
+    """GET /customer/<int:customer_id>/notifications"""
     try:
-        resp = requests.get(f"{API_BASE_URL}/customer/customer/{customer_id}/notifications", timeout=10)
+        resp = api.get(f"/customer/{customer_id}/notifications", timeout=10)
         return (True, resp.json()) if resp.status_code == 200 else (False, resp.text)
     except Exception as e:
         return False, str(e)
 
 def send_customer_notification(customer_id, message):
-    """POST /customer/customer/<int:customer_id>/notifications"""
+    """POST /customer/<int:customer_id>/notifications"""
     try:
-        resp = requests.post(
-            f"{API_BASE_URL}/customer/customer/{customer_id}/notifications",
+        resp = api.post(
+            f"/customer/{customer_id}/notifications",
             json={"message": message, "status": "Unread"}, timeout=10
         )
         return (True, resp.json()) if resp.status_code in [200, 201] else (False, resp.text)
@@ -33,18 +31,18 @@ def send_customer_notification(customer_id, message):
         return False, str(e)
 
 def get_business_notifications(business_id):
-    """GET /business/business/<int:business_id>/notifications"""
+    """GET /business/<int:business_id>/notifications"""
     try:
-        resp = requests.get(f"{API_BASE_URL}/business/business/{business_id}/notifications", timeout=10)
+        resp = api.get(f"/business/{business_id}/notifications", timeout=10)
         return (True, resp.json()) if resp.status_code == 200 else (False, resp.text)
     except Exception as e:
         return False, str(e)
 
 def send_business_notification(business_id, message):
-    """POST /business/business/<int:business_id>/notifications"""
+    """POST /business/<int:business_id>/notifications"""
     try:
-        resp = requests.post(
-            f"{API_BASE_URL}/business/business/{business_id}/notifications",
+        resp = api.post(
+            f"/business/{business_id}/notifications",
             json={"message": message, "status": "Unread"}, timeout=10
         )
         return (True, resp.json()) if resp.status_code in [200, 201] else (False, resp.text)
@@ -52,27 +50,32 @@ def send_business_notification(business_id, message):
         return False, str(e)
 
 def delete_business_notification(business_id, notif_id):
-    """DELETE /business/business/<int:business_id>/notifications/<int:notification_id>"""
+    """DELETE /business/<int:business_id>/notifications/<int:notification_id>"""
     try:
-        resp = requests.delete(f"{API_BASE_URL}/business/business/{business_id}/notifications/{notif_id}", timeout=10)
+        resp = api.delete(f"/business/{business_id}/notifications/{notif_id}", timeout=10)
         return (True, resp.json()) if resp.status_code == 200 else (False, resp.text)
     except Exception as e:
         return False, str(e)
 
 def get_admin_users():
-    """GET /general/admin/users - for dropdown"""
+    """GET /admin/users - first page of users for the dropdown"""
     try:
-        resp = requests.get(f"{API_BASE_URL}/general/admin/users", timeout=10)
-        return (True, resp.json()) if resp.status_code == 200 else (False, [])
+        resp = api.get("/admin/users", params={"limit": 200}, timeout=10)
+        return (True, resp.json()["items"]) if resp.status_code == 200 else (False, [])
     except:
         return False, []
 
 
 customer_id = 10
 business_id = 10
-success_cust, cust_notifs = get_customer_notifications(customer_id)
-success_busi, busi_notifs = get_business_notifications(business_id)
-_, users_data = get_admin_users()
+results = fetch_all({
+    "customer": (get_customer_notifications, customer_id),
+    "business": (get_business_notifications, business_id),
+    "users": (get_admin_users,),
+}, default=(False, []))
+success_cust, cust_notifs = results["customer"]
+success_busi, busi_notifs = results["business"]
+_, users_data = results["users"]
 
 
 st.title("Notifications & Alerts Page")
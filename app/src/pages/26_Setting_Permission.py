@@ -2,16 +2,12 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
-import requests
 
 
 st.set_page_config(layout='wide')
 SideBarLinks()
 
 
-API_BASE_URL = "http://web-api:4000"
-
-
 if 'admins' not in st.session_state:
     st.session_state.admins = [
         {'name': 'Lucas Fu', 'user_id': '16022006', 'role': 'Super Admin'},
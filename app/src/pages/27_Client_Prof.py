@@ -2,6 +2,7 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
+from modules import api_client as api
 import requests
 
 st.set_page_config(layout='wide')
@@ -55,8 +56,6 @@ if 'reset_form' not in st.session_state:
 if 'form_key_counter' not in st.session_state:
     st.session_state.form_key_counter = 0
 
-# API endpoint
-API_URL = "http://web-api:4000/ngo/ngos"
 
 # Success dialog
 @st.dialog("Success")
@@ -208,6 +207,7 @@ elif st.session_state.view_mode == 'add':
         company_id = st.number_input("Company ID *", min_value=100000, max_value=999999, value=160206)
         business_type = st.text_input("Business Type *")
         contact_name = st.text_input("Contact Name *")
+        contact_email = st.text_input("Contact Email *")
         street = st.text_input("Address - Street *")
         city = st.text_input("Address - City *")
         state = st.text_input("Address - State *")
@@ -219,7 +219,7 @@ elif st.session_state.view_mode == 'add':
         
         if submitted:
             # Validate required fields
-            if not all([name, company_id, business_type, contact_name, street, city, state, country, zip_code]):
+            if not all([name, company_id, business_type, contact_name, contact_email, street, city, state, country, zip_code]):
                 st.error("Please fill in all required fields marked with *")
             else:
                 # Prepare the data for API
@@ -228,6 +228,7 @@ elif st.session_state.view_mode == 'add':
                     "Company ID": company_id,
                     "Business Type": business_type,
                     "Contact Name": contact_name,
+                    "Contact Email": contact_email,
                     "Street": street,
                     "City": city,
                     "State": state,
@@ -237,7 +238,17 @@ elif st.session_state.view_mode == 'add':
                 
                 try:
                     # Send POST request to API
-                    response = requests.post(API_URL, json=ngo_data)
+                    # clients are Business rows. The API assigns the CompanyID, and Business
+                    # has no columns for the business type or contact name, so those stay in the page
+                    response = api.post("/business/users", json={
+                        "company_name": ngo_data["Company Name"],
+                        "contact_email": ngo_data["Contact Email"],
+                        "street": ngo_data["Street"],
+                        "city": ngo_data["City"],
+                        "state": ngo_data["State"],
+                        "zip": ngo_data["Zip"],
+                        "country": ngo_data["Country"],
+                    })
                     
                     if response.status_code == 201:
                         # Add to session state
@@ -2,6 +2,7 @@ import streamlit as st
 import requests
 from streamlit_extras.app_logo import add_logo
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 # Initialize sidebar
 SideBarLinks()
@@ -44,8 +45,6 @@ if st.session_state.reset_form:
     st.session_state.form_key_counter += 1
     st.session_state.reset_form = False
 
-# API endpoint
-API_URL = "http://web-api:4000/ngo/ngos"
 
 # Create a form for NGO details with dynamic key to force reset
 with st.form(f"add_ngo_form_{st.session_state.form_key_counter}"):
@@ -56,6 +55,7 @@ with st.form(f"add_ngo_form_{st.session_state.form_key_counter}"):
     company_id = st.number_input("Company ID *", min_value=100000, max_value=999999, value=160206)
     business_type = st.text_input("Business Type *")
     contact_name = st.text_input("Contact Name *")
+    contact_email = st.text_input("Contact Email *")
     street = st.text_input("Address - Street *")
     city = st.text_input("Address - City *")
     state = st.text_input("Address - State *")
@@ -68,7 +68,7 @@ with st.form(f"add_ngo_form_{st.session_state.form_key_counter}"):
 
     if submitted:
         # Validate required fields
-        if not all([name, company_id, business_type, contact_name, street, city, state, country, zip_code]):
+        if not all([name, company_id, business_type, contact_name, contact_email, street, city, state, country, zip_code]):
             st.error("Please fill in all required fields marked with *")
         else:
             # Prepare the data for API
@@ -77,6 +77,7 @@ with st.form(f"add_ngo_form_{st.session_state.form_key_counter}"):
                 "Company ID":  company_id,
                 "Business Type": business_type,
                 "Contact Name": contact_name,
+                "Contact Email": contact_email,
                 "Street": street,
                 "City": city,
                 "State": state,
@@ -86,7 +87,17 @@ with st.form(f"add_ngo_form_{st.session_state.form_key_counter}"):
 
             try:
                 # Send POST request to API
-                response = requests.post(API_URL, json=ngo_data)
+                # clients are Business rows. The API assigns the CompanyID, and Business
+                # has no columns for the business type or contact name, so those stay in the page
+                response = api.post("/business/users", json={
+                    "company_name": ngo_data["Company Name"],
+                    "contact_email": ngo_data["Contact Email"],
+                    "street": ngo_data["Street"],
+                    "city": ngo_data["City"],
+                    "state": ngo_data["State"],
+                    "zip": ngo_data["Zip"],
+                    "country": ngo_data["Country"],
+                })
 
                 if response.status_code == 201:
                     # Store NGO name and show modal
@@ -5,8 +5,6 @@ from modules.nav import SideBarLinks
 
 st.set_page_config(layout = 'wide')
 
-API_BASE_URL=""
-
 # Show sidebar links for the role of the user
 SideBarLinks()
 
@@ -2,14 +2,30 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
+from modules import api_client as api
+from modules.fanout import fetch_all
 
 st.set_page_config(layout='wide')
 
-API_BASE_URL = ""
-
 # Show appropriate sidebar links for the role of the currently logged in user
 SideBarLinks()
 
+# each period is compared with the period right before it
+PERIOD_WINDOWS = {'This Week': '7d', 'This Month': '30d', 'This Year': '365d'}
+
+
+def get_growth(by, window, limit):
+    """GET /analytics/growth?by=&window=&limit= -> list of {Key, Name, Current, Previous, GrowthPercent}"""
+    try:
+        resp = api.cached_get("/analytics/growth", params={"by": by, "window": window, "limit": limit}, timeout=10)
+        return resp.json()["results"] if resp.status_code == 200 else []
+    except:
+        return []
+
+
+def growth_label(row):
+    return "new" if row['GrowthPercent'] is None else f"{row['GrowthPercent']:+.0f}%"
+
 # Initialize session state
 if 'time_period' not in st.session_state:
     st.session_state.time_period = 'This Week'
@@ -32,33 +48,36 @@ for i, period in enumerate(time_periods):
 
 st.write('---')
 
+window = PERIOD_WINDOWS[st.session_state.time_period]
+results = fetch_all({
+    "items": (get_growth, "item", window, 5),
+    "categories": (get_growth, "category", window, 10),
+    "aesthetics": (get_growth, "aesthetic", window, 3),
+}, default=[])
+
 col1, col2 = st.columns(2)
 
 # Top Trending Items Section
 with col1:
     st.subheader("Top Trending Items")
     
-    items = [
-        {"rank": 1, "name": "Oversized Blazers", "inc": "245%", "searches": "15,423", "wish": "3,200"},
-        {"rank": 2, "name": "Wide Leg Jeans", "inc": "198%", "searches": "12,890", "wish": "2,800"},
-        {"rank": 3, "name": "Platform Sneakers", "inc": "156%", "searches": "9,567", "wish": "2,100"},
-        {"rank": 4, "name": "Crop Cardigans", "inc": "134%", "searches": "8,234", "wish": "1,900"},
-        {"rank": 5, "name": "Maxi Skirts", "inc": "121%", "searches": "7,890", "wish": "1,700"}
-    ]
-    
-    for item in items:
-        with st.expander(f"**{item['rank']}. {item['name']}** - ↑ {item['inc']}"):
-            st.write(f"Searches: {item['searches']} | Wishlisted: {item['wish']}")
-            if st.button(f"View Details", key=f"trend_{item['rank']}"):
-                st.toast(f"Viewing {item['name']}", icon='🔥')
+    if not results["items"]:
+        st.info("No engagement recorded in this period")
+
+    for rank, item in enumerate(results["items"], start=1):
+        with st.expander(f"**{rank}. {item['Name']}** - {growth_label(item)}"):
+            st.write(f"Engagement: {item['Current']:,} this period | {item['Previous']:,} the period before")
+            if st.button(f"View Details", key=f"trend_{rank}"):
+                st.toast(f"Viewing {item['Name']}", icon='🔥')
 
 # Trending By Category
 with col2:
     st.subheader("Trending by Category")
     
+    # growth in percent; categories with no engagement the period before have no rate
     categories = {
-        "Outerwear": 89, "Bottoms": 76, "Shoes": 65, "Tops": 54,
-        "Dresses": 43, "Accessories": 38, "Jewelry": 27, "Bags": 22
+        row['Name'] or 'Uncategorized': row['GrowthPercent']
+        for row in results["categories"] if row['GrowthPercent'] is not None
     }
     
     st.bar_chart(categories)
@@ -66,13 +85,9 @@ with col2:
     st.write('')
     st.subheader("Rising Stars 🌟")
     
-    stars = [
-        {"name": "Y2K Aesthetic", "inc": "312%"},
-        {"name": "Cottagecore", "inc": "267%"},
-        {"name": "Dark Academia", "inc": "189%"}
-    ]
+    stars = results["aesthetics"]
     
     star_cols = st.columns(3)
     for i, star in enumerate(stars):
         with star_cols[i]:
-            st.metric(label=star['name'], value=f"↑ {star['inc']}")
\ No newline at end of file
+            st.metric(label=star['Name'], value=growth_label(star))
\ No newline at end of file
@@ -2,14 +2,26 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 st.set_page_config(layout='wide')
 
-API_BASE_URL = ""
-
 # Show appropriate sidebar links for the role of the currently logged in user
 SideBarLinks()
 
+
+def get_demand(k):
+    """GET /analytics/demand?k="""
+    try:
+        resp = api.cached_get("/analytics/demand", params={"k": k}, ttl=15, timeout=10)
+        return resp.json() if resp.status_code == 200 else []
+    except:
+        return []
+
+
+# the 100 most wishlisted items feed both the list and the category chart
+demand = get_demand(100)
+
 st.title("Wish Lists")
 st.write('')
 
@@ -37,18 +49,14 @@ with col1:
     st.write('')
     st.subheader("Most Wishlisted Items")
     
-    items = [
-        {"name": "Vintage Denim Jacket", "brand": "American Eagle", "users": "1,234"},
-        {"name": "White Platform Sneakers", "brand": "Nike", "users": "1,098"},
-        {"name": "Oversized Blazer Black", "brand": "Zara", "users": "987"},
-        {"name": "Floral Maxi Dress", "brand": "H&M", "users": "856"}
-    ]
-    
-    for idx, item in enumerate(items):
-        with st.expander(f"**{item['name']}**"):
-            st.write(f"{item['brand']} | {item['users']} users")
+    if not demand:
+        st.info("No wishlist data available")
+
+    for idx, item in enumerate(demand[:4]):
+        with st.expander(f"**{item['Name']}**"):
+            st.write(f"{item.get('Category') or 'Uncategorized'} | {item['total_wishlists']:,} wishlists")
             if st.button(f"View Details", key=f"item_{idx}"):
-                st.toast(f"Viewing {item['name']}", icon='👀')
+                st.toast(f"Viewing {item['Name']}", icon='👀')
 
 # Wishlist Matching Opportunities
 with col2:
@@ -70,7 +78,10 @@ with col2:
     
     st.subheader("Wishlist Analytics")
     
-    st.write("**Wishlist by Category**")
-    category_data = {"Tops": 32, "Bottoms": 28, "Shoes": 24, "Accessories": 16}
+    st.write("**Wishlist by Category** (top 100 items)")
+    category_data = {}
+    for item in demand:
+        category = item.get('Category') or 'Uncategorized'
+        category_data[category] = category_data.get(category, 0) + item['total_wishlists']
     st.bar_chart(category_data)
     st.write("Avg items per wishlist: **12.1**")
\ No newline at end of file
@@ -3,66 +3,44 @@ logger = logging.getLogger(__name__)
 
 import streamlit as st
 import pandas as pd
-import requests
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 st.set_page_config(layout="wide")
 
-API_BASE = "http://web-api:4000"
-
 SideBarLinks()
 
-<<<<<<< HEAD
-=======
-# Session defaults
-if "first_name" not in st.session_state:
-    st.session_state["first_name"] = "Rebecca"
-
-if "business_name" not in st.session_state:
-    st.session_state["business_name"] = "Rebecca's Vintage Closet"
-
-if "business_id" not in st.session_state:
-    st.session_state["business_id"] = 40
-
-business_id = st.session_state["business_id"]
-
-st.title("📦 Full Inventory")
-st.caption(f"All items for {st.session_state['business_name']}")
-st.write("---")
+INVENTORY_COLUMNS = [
+    "ItemID",
+    "Name",
+    "Category",
+    "Price",
+    "QuantityInStock",
+    "UnitsSold",
+]
+PAGE_SIZE = 50
 
 
->>>>>>> f7bf05309e72aa083d4bb223b93e934c60f4f514
 # Helpers
-def load_inventory_df(business_id: int) -> pd.DataFrame:
-    url = f"{API_BASE}/business/{business_id}/inventory"
+def load_inventory_page(business_id: int, after=None):
+    """
+    Loads one page of GET /business/{business_id}/inventory.
+    Returns (DataFrame, next_cursor); next_cursor is None on the last page.
+    """
+    url = f"/business/{business_id}/inventory"
+    params = {"limit": PAGE_SIZE}
+    if after:
+        params["after"] = after
     try:
-        resp = requests.get(url, timeout=5)
+        resp = api.get(url, params=params, timeout=5)
         resp.raise_for_status()
         data = resp.json()
-        if not data:
-            return pd.DataFrame(
-                columns=[
-                    "ItemID",
-                    "Name",
-                    "Category",
-                    "Price",
-                    "QuantityInStock",
-                    "UnitsSold",
-                ]
-            )
-        return pd.DataFrame(data)
+        if not data["items"]:
+            return pd.DataFrame(columns=INVENTORY_COLUMNS), None
+        return pd.DataFrame(data["items"]), data["next_cursor"]
     except Exception as e:
         st.error(f"Could not load inventory from the API: {e}")
-        return pd.DataFrame(
-            columns=[
-                "ItemID",
-                "Name",
-                "Category",
-                "Price",
-                "QuantityInStock",
-                "UnitsSold",
-            ]
-        )
+        return pd.DataFrame(columns=INVENTORY_COLUMNS), None
 
 
 def add_inventory_item(
@@ -73,7 +51,7 @@ def add_inventory_item(
     ethically_sourced: bool,
 ):
     url = (
-        f"{API_BASE}/business/"
+        f"/business/"
         f"{business_id}/inventory/{inventory_id}/item/{clothing_item_id}"
     )
     payload = {
@@ -81,7 +59,7 @@ def add_inventory_item(
         "QuantityInStock": int(qty_in_stock),
     }
     try:
-        resp = requests.post(url, json=payload, timeout=5)
+        resp = api.post(url, json=payload, timeout=5)
         if resp.status_code == 201:
             return True, "Item added to inventory."
         else:
@@ -94,9 +72,9 @@ def add_inventory_item(
 
 
 def delete_inventory_item(business_id: int, clothing_item_id: int):
-    url = f"{API_BASE}/business/{business_id}/inventory/{clothing_item_id}"
+    url = f"/business/{business_id}/inventory/{clothing_item_id}"
     try:
-        resp = requests.delete(url, timeout=5)
+        resp = api.delete(url, timeout=5)
         if resp.status_code == 200:
             return True, "Item removed from inventory."
         else:
@@ -124,8 +102,19 @@ st.title("📦 Full Inventory")
 st.caption(f"All items for {st.session_state['business_name']}")
 st.write("---")
 
-# Load current inventory
-inv_df = load_inventory_df(business_id)
+# Load the current page of inventory. inventory_cursors holds the "after"
+# cursor of every page we have paged past, so Previous can step back.
+if "inventory_cursors" not in st.session_state:
+    st.session_state["inventory_cursors"] = []
+
+page_cursors = st.session_state["inventory_cursors"]
+inv_df, next_cursor = load_inventory_page(
+    business_id, after=page_cursors[-1] if page_cursors else None
+)
+if inv_df.empty and page_cursors:
+    # the page we were on emptied out (e.g. after deletes), start over
+    page_cursors.clear()
+    st.rerun()
 
 
 # Add existing ClothingItem to inventory
@@ -252,6 +241,18 @@ else:
             else:
                 st.error(msg)
 
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("⬅️ Previous page", disabled=not page_cursors, use_container_width=True):
+            page_cursors.pop()
+            st.rerun()
+    with page_col:
+        st.caption(f"Page {len(page_cursors) + 1} • {PAGE_SIZE} items per page")
+    with next_col:
+        if st.button("Next page ➡️", disabled=next_cursor is None, use_container_width=True):
+            page_cursors.append(next_cursor)
+            st.rerun()
+
     st.write("---")
     st.markdown("#### Raw inventory table")
     st.dataframe(
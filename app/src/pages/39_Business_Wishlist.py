@@ -1,35 +1,42 @@
 import streamlit as st
 import requests
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 SideBarLinks()
 
-API_BASE_URL = "http://web-api:4000"  
-
 def get_business_id() -> int:
     return st.session_state.get("business_id", 40)
 
 def get_wishlist_id() -> int:
     return st.session_state.get("wishlist_id", 507)
 
-def fetch_available_items(business_id: int):
+AVAILABLE_PAGE_SIZE = 25
+
+
+def fetch_available_items(business_id: int, after=None):
     """
-    Uses: GET /business/{business_id}/inventory/available
-    Returns catalog items that are NOT in the business's inventory.
+    Uses: GET /business/{business_id}/inventory/available?limit=&after=
+    Returns one page of catalog items that are NOT in the business's inventory,
+    the cursor of the next page and an error (if any).
     """
-    url = f"{API_BASE_URL}/business/{business_id}/inventory/available"
+    url = f"/business/{business_id}/inventory/available"
+    params = {"limit": AVAILABLE_PAGE_SIZE}
+    if after:
+        params["after"] = after
     try:
-        resp = requests.get(url, timeout=5)
+        resp = api.get(url, params=params, timeout=5)
         resp.raise_for_status()
-        return resp.json(), None
+        data = resp.json()
+        return data["items"], data["next_cursor"], None
     except requests.RequestException as e:
-        return [], str(e)
+        return [], None, str(e)
 
 
 def fetch_wishlist_items(business_id: int, wishlist_id: int):
-    url = f"{API_BASE_URL}/business/{business_id}/wishlists/{wishlist_id}"
+    url = f"/business/{business_id}/wishlists/{wishlist_id}"
     try:
-        resp = requests.get(url, timeout=5)
+        resp = api.get(url, timeout=5)
 
         if resp.status_code == 404:
             return [], f"Wishlist route not found (404) at {url}"
@@ -49,9 +56,9 @@ def add_item_to_wishlist(business_id: int, wishlist_id: int, item_id: int):
     """
     Uses: POST /business/{business_id}/wishlists/{wishlist_id}/item/{item_id}
     """
-    url = f"{API_BASE_URL}/business/{business_id}/wishlists/{wishlist_id}/item/{item_id}"
+    url = f"/business/{business_id}/wishlists/{wishlist_id}/item/{item_id}"
     try:
-        resp = requests.post(url, json={}, timeout=5)
+        resp = api.post(url, json={}, timeout=5)
         if resp.status_code >= 400:
             try:
                 data = resp.json()
@@ -67,9 +74,9 @@ def remove_item_from_wishlist(business_id: int, wishlist_id: int, item_id: int):
     """
     Uses: DELETE /business/{business_id}/wishlists/{wishlist_id}/item/{item_id}
     """
-    url = f"{API_BASE_URL}/business/{business_id}/wishlists/{wishlist_id}/item/{item_id}"
+    url = f"/business/{business_id}/wishlists/{wishlist_id}/item/{item_id}"
     try:
-        resp = requests.delete(url, timeout=5)
+        resp = api.delete(url, timeout=5)
         if resp.status_code >= 400:
             try:
                 data = resp.json()
@@ -99,7 +106,14 @@ st.caption(
     "(you can set these in session_state from your home/login page)."
 )
 
-available_items, avail_err = fetch_available_items(business_id)
+# "after" cursors of the catalog pages already paged past
+if "available_cursors" not in st.session_state:
+    st.session_state["available_cursors"] = []
+available_cursors = st.session_state["available_cursors"]
+
+available_items, available_next, avail_err = fetch_available_items(
+    business_id, available_cursors[-1] if available_cursors else None
+)
 wishlist_items, wishlist_err = fetch_wishlist_items(business_id, wishlist_id)
 
 if avail_err:
@@ -140,6 +154,16 @@ with left:
                     else:
                         st.error(f"Could not add item to wishlist: {err}")
 
+    prev_col, next_col = st.columns(2)
+    with prev_col:
+        if st.button("⬅️ Previous", disabled=not available_cursors, use_container_width=True):
+            available_cursors.pop()
+            st.rerun()
+    with next_col:
+        if st.button("Next ➡️", disabled=available_next is None, use_container_width=True):
+            available_cursors.append(available_next)
+            st.rerun()
+
 # current wishlist contents 
 with right:
     st.subheader("Current Wishlist Items")
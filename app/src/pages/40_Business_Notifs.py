@@ -2,6 +2,7 @@ import streamlit as st
 import requests
 import pandas as pd
 from modules.nav import SideBarLinks
+from modules import api_client as api
 
 st.set_page_config(
     page_title="Business Notifications",
@@ -11,8 +12,6 @@ st.set_page_config(
 
 SideBarLinks()
 
-API_BASE = "http://web-api:4000"
-
 if "first_name" not in st.session_state:
     st.session_state["first_name"] = "Guest"
 
@@ -30,9 +29,9 @@ def fetch_notifications(business_id: int):
     """
     GET /business/<business_id>/notifications
     """
-    url = f"{API_BASE}/business/{business_id}/notifications"
+    url = f"/business/{business_id}/notifications"
     try:
-        resp = requests.get(url, timeout=5)
+        resp = api.get(url, timeout=5)
 
         if resp.status_code == 404:
             try:
@@ -54,10 +53,10 @@ def send_notification(business_id: int, message: str, status: str = "Sent"):
     POST /business/<business_id>/notifications
     body: { "message": str, "status": str }
     """
-    url = f"{API_BASE}/business/{business_id}/notifications"
+    url = f"/business/{business_id}/notifications"
     payload = {"message": message, "status": status}
     try:
-        resp = requests.post(url, json=payload, timeout=5)
+        resp = api.post(url, json=payload, timeout=5)
         if resp.status_code >= 400:
             try:
                 data = resp.json()
@@ -73,9 +72,9 @@ def delete_notification(business_id: int, notification_id: int):
     """
     DELETE /business/<business_id>/notifications/<notification_id>
     """
-    url = f"{API_BASE}/business/{business_id}/notifications/{notification_id}"
+    url = f"/business/{business_id}/notifications/{notification_id}"
     try:
-        resp = requests.delete(url, timeout=5)
+        resp = api.delete(url, timeout=5)
         if resp.status_code >= 400:
             try:
                 data = resp.json()
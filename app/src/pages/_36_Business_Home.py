@@ -2,14 +2,13 @@ import logging
 logger = logging.getLogger(__name__)
 import streamlit as st
 from modules.nav import SideBarLinks
+from modules import api_client as api
+from modules.fanout import fetch_all
 import pandas as pd
-import requests
 
 
 st.set_page_config(layout = 'wide')
 
-API_BASE = "http://web-api:4000"
-
 SideBarLinks()
 
 st.header(f"Welcome back to {st.session_state['first_name']} 👋")
@@ -20,38 +19,28 @@ st.write("")
 st.write("---")
 st.subheader("Inventory Performance")
 
-def load_inventory_df(business_id=40):
-    url = f"{API_BASE}/business/{business_id}/inventory"
-    
-    resp = requests.get(url, timeout=5)
-    resp.raise_for_status()  
-    
-    data = resp.json()
-    df = pd.DataFrame(data)
-    
-    df = df.rename(columns={
-        "ItemID": "Item ID",
-        "Name": "Item Name",
-        "Category": "Category",
-        "QuantityInStock": "Qty in Stock",
-        "UnitsSold": "Units Sold (30d)",
-    })
-    return df
+def load_business_home(business_id=40):
+    # inventory totals and the top/poor sellers, computed by the API
+    resp = api.get(f"/business/{business_id}/home", params={"top": 3}, timeout=5)
+    resp.raise_for_status()
+    return resp.json()
 
-inv_df = load_inventory_df()
+home = fetch_all({"home": (load_business_home,)})["home"]
 
-# sort for best and worst
+seller_columns = {
+    "Name": "Item Name",
+    "Category": "Category",
+    "UnitsSold": "Units Sold (30d)",
+    "QuantityInStock": "Qty in Stock",
+}
 
-if inv_df.empty or "Units Sold (30d)" not in inv_df.columns:
+if home is None:
+    st.warning("Inventory data is unavailable right now. Please try again shortly.")
+elif not home["inventory"]["items"]:
     st.info("No inventory data yet for this business. Add some items to the inventory first.")
 else:
-    # sort for best and worst
-    top_sellers = inv_df.sort_values(
-        by="Units Sold (30d)", ascending=False
-    ).head(3)
-    poor_sellers = inv_df.sort_values(
-        by="Units Sold (30d)", ascending=True
-    ).head(3)
+    top_sellers = pd.DataFrame(home["top_sellers"]).rename(columns=seller_columns)
+    poor_sellers = pd.DataFrame(home["poor_sellers"]).rename(columns=seller_columns)
 
     col_good, col_bad = st.columns(2)
 
@@ -557,4 +557,22 @@ INSERT INTO BusinessInventoryItemStorage
 VALUES
     (401, 657, TRUE, 25, 50, 830),  -- Combat Boots
     (402, 657, TRUE, 12, 30, 837),  -- High Waisted Leggings
-    (403, 657, FALSE, 5,  15, 826); -- Satin Slip Dressdocke
\ No newline at end of file
+    (403, 657, FALSE, 5,  15, 826); -- Satin Slip Dressdocke
+
+-- next free primary key per table, handed out in blocks by the API
+-- (see api/backend/db_connection/id_sequence.py)
+DROP TABLE IF EXISTS IdSequence;
+CREATE TABLE IdSequence (
+    SequenceName VARCHAR(64) PRIMARY KEY,
+    NextValue BIGINT NOT NULL
+);
+
+INSERT INTO IdSequence (SequenceName, NextValue)
+SELECT 'Outfit', COALESCE(MAX(OutfitID), 400) + 1 FROM Outfit
+UNION ALL SELECT 'ClothingItem', COALESCE(MAX(ItemID), 400) + 1 FROM ClothingItem
+UNION ALL SELECT 'Business', COALESCE(MAX(CompanyID), 40) + 1 FROM Business
+UNION ALL SELECT 'BusinessNotification', COALESCE(MAX(NotificationID), 400) + 1 FROM BusinessNotification
+UNION ALL SELECT 'CustomerNotification', COALESCE(MAX(NotificationID), 400) + 1 FROM CustomerNotification
+UNION ALL SELECT 'BusinessInventoryItemStorage', COALESCE(MAX(ItemID), 400) + 1 FROM BusinessInventoryItemStorage
+UNION ALL SELECT 'BusinessWishlistClothingItem', COALESCE(MAX(ItemID), 400) + 1 FROM BusinessWishlistClothingItem
+UNION ALL SELECT 'CustWishListClothingItem', COALESCE(MAX(ItemID), 400) + 1 FROM CustWishListClothingItem;
@@ -0,0 +1,51 @@
+#!/bin/bash
+#------------------------------------------------------------
+# Applies the versioned migrations in ./migrations in order.
+#
+# The mysql image runs this automatically after clueless_db.sql
+# when the container is first created. To upgrade a database
+# that already exists, run it by hand inside the db container:
+#
+#   docker compose exec db bash /docker-entrypoint-initdb.d/migrate.sh
+#
+# Files are named V<version>__<description>.sql. Each applied
+# version is recorded in SchemaMigrations so it only runs once.
+#------------------------------------------------------------
+
+MIGRATIONS_DIR="$(dirname "${BASH_SOURCE[0]}")/migrations"
+
+run_sql() {
+    # inside the image's init step the entrypoint provides docker_process_sql
+    if declare -F docker_process_sql > /dev/null; then
+        docker_process_sql --database=Clueless "$@"
+    else
+        mysql -uroot -p"${MYSQL_ROOT_PASSWORD}" Clueless "$@"
+    fi
+}
+
+run_sql -e "CREATE TABLE IF NOT EXISTS SchemaMigrations (
+    Version INT PRIMARY KEY,
+    Description VARCHAR(255),
+    AppliedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);"
+
+for migration in $(ls "$MIGRATIONS_DIR"/V*__*.sql | sort -V); do
+    name="$(basename "$migration" .sql)"
+    version="$(echo "$name" | sed -E 's/^V0*([0-9]+)__.*/\1/')"
+    description="$(echo "$name" | sed -E 's/^V[0-9]+__//; s/_/ /g')"
+
+    applied="$(run_sql -N -e "SELECT COUNT(*) FROM SchemaMigrations WHERE Version = ${version};")"
+    if [ "$applied" != "0" ]; then
+        echo "migrate.sh: V${version} already applied, skipping"
+        continue
+    fi
+
+    echo "migrate.sh: applying ${name}"
+    # the version is recorded in the same client session, after the last
+    # statement; mysql stops at the first error, so a failed migration is
+    # never recorded and runs again next time
+    if ! { cat "$migration"; echo; echo "INSERT INTO SchemaMigrations (Version, Description) VALUES (${version}, '${description}');"; } | run_sql; then
+        echo "migrate.sh: ${name} failed, stopping" >&2
+        exit 1
+    fi
+done
@@ -0,0 +1,33 @@
+-- V001: secondary indexes for the foreign-key lookups made by clueless_routes.py
+--
+-- InnoDB already builds a single-column index for each FOREIGN KEY, so
+-- these are composite indexes led by the filtered column and extended
+-- with the join/sort columns the routes use next. MySQL drops the
+-- implicit FK index once an index like these can serve the constraint.
+USE Clueless;
+
+-- closets / wishlists / notifications looked up by owner
+CREATE INDEX idx_customercloset_customer ON CustomerCloset (CustomerID, ClosetID);
+CREATE INDEX idx_customerwishlist_customer ON CustomerWishlist (CustomerID, WishlistID);
+CREATE INDEX idx_customernotification_customer ON CustomerNotification (CustomerID, Status, NotificationID);
+CREATE INDEX idx_businessnotification_company ON BusinessNotification (CompanyID, Status);
+CREATE INDEX idx_businessinventory_company ON BusinessInventory (CompanyID, InventoryID);
+CREATE INDEX idx_businesswishlist_company ON BusinessWishlist (CompanyID, WishlistID);
+
+-- bridge tables whose primary key does not lead with the joined column
+CREATE INDEX idx_biis_clothingitem ON BusinessInventoryItemStorage (ClothingItemID, InventoryID);
+CREATE INDEX idx_biis_inventory ON BusinessInventoryItemStorage (InventoryID, ClothingItemID);
+CREATE INDEX idx_cwci_clothingitem ON CustWishListClothingItem (ClothingItemID, WishlistID);
+CREATE INDEX idx_cwci_wishlist ON CustWishListClothingItem (WishlistID, ClothingItemID);
+CREATE INDEX idx_bwci_wishlist ON BusinessWishlistClothingItem (WishlistID, ClothingItemID);
+CREATE INDEX idx_cima_clothingitem ON ClothingItemMatchedAesthetic (ClothingItemID, AestheticID);
+CREATE INDEX idx_oma_outfit ON OutfitMatchedAesthetic (OutfitID, AestheticID);
+CREATE INDEX idx_coci_outfit ON CustomerOutfitsOfClothingItems (OutfitID, ClothingItemID);
+CREATE INDEX idx_ccci_closet ON CustomerClosetClothingItems (ClosetID, ClothingItemID, NumberofWears);
+CREATE INDEX idx_cco_outfit ON CustomerClosetOutfits (OutfitID, ClosetID);
+
+-- sort / filter columns on listing routes
+CREATE INDEX idx_business_name ON Business (CompanyName, CompanyID);
+CREATE INDEX idx_clothingitem_popularity ON ClothingItem (PopularityPercentage);
+CREATE INDEX idx_aesthetic_popularity ON Aesthetic (PopularityPercent);
+CREATE INDEX idx_techteam_name ON TechTeam (Name);
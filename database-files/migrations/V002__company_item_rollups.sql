@@ -0,0 +1,38 @@
+-- V002: per (company, item) ownership and wear rollups for /analytics/items/<company_id>
+--
+-- One row for every clothing item a business stocks. OwnerCount is the
+-- number of closets holding the item and TotalWears the sum of their
+-- NumberofWears, so the analytics route reads one company's rows from
+-- an index instead of joining every closet on each call. The routes
+-- keep the rows current (see api/backend/analytics/rollups.py); run
+--   python -m backend.analytics.rollups --rebuild
+-- from the api folder to recompute them after bulk loads.
+USE Clueless;
+
+CREATE TABLE IF NOT EXISTS CompanyItemRollup (
+    CompanyID INT NOT NULL,
+    ItemID INT NOT NULL,
+    OwnerCount INT NOT NULL DEFAULT 0,
+    TotalWears INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (CompanyID, ItemID),
+    INDEX idx_rollup_item (ItemID),
+    INDEX idx_rollup_owned (CompanyID, OwnerCount),
+    INDEX idx_rollup_worn (CompanyID, TotalWears),
+    FOREIGN KEY (CompanyID) REFERENCES Business(CompanyID),
+    FOREIGN KEY (ItemID) REFERENCES ClothingItem(ItemID)
+);
+
+-- backfill from the existing closets and inventories
+INSERT INTO CompanyItemRollup (CompanyID, ItemID, OwnerCount, TotalWears)
+SELECT stocked.CompanyID, stocked.ItemID,
+       COALESCE(owned.OwnerCount, 0), COALESCE(owned.TotalWears, 0)
+FROM (
+    SELECT DISTINCT BI.CompanyID, BIIS.ClothingItemID AS ItemID
+    FROM BusinessInventoryItemStorage BIIS
+    JOIN BusinessInventory BI ON BIIS.InventoryID = BI.InventoryID
+) stocked
+LEFT JOIN (
+    SELECT ClothingItemID, COUNT(*) AS OwnerCount, SUM(NumberofWears) AS TotalWears
+    FROM CustomerClosetClothingItems
+    GROUP BY ClothingItemID
+) owned ON owned.ClothingItemID = stocked.ItemID;
@@ -0,0 +1,21 @@
+-- V003: per-item wishlist counters for /analytics/demand
+--
+-- WishlistCount is the number of customer wishlist entries holding the
+-- item. The customer wishlist add/remove routes keep it current (see
+-- api/backend/analytics/demand.py), so the demand route never groups
+-- CustWishListClothingItem. Items nobody wishlists have no row.
+USE Clueless;
+
+CREATE TABLE IF NOT EXISTS ItemWishlistDemand (
+    ItemID INT PRIMARY KEY,
+    WishlistCount INT NOT NULL DEFAULT 0,
+    INDEX idx_demand_count (WishlistCount, ItemID),
+    FOREIGN KEY (ItemID) REFERENCES ClothingItem(ItemID)
+);
+
+-- backfill from the existing wishlists
+INSERT INTO ItemWishlistDemand (ItemID, WishlistCount)
+SELECT ClothingItemID, COUNT(*)
+FROM CustWishListClothingItem
+WHERE ClothingItemID IS NOT NULL
+GROUP BY ClothingItemID;
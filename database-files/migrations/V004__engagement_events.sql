@@ -0,0 +1,30 @@
+-- V004: engagement events and their time-bucketed counts for /analytics/growth
+--
+-- EngagementEvent is append-only: one row per wishlist add, closet add,
+-- wear or view, stamped in UTC. Every insert also bumps the matching
+-- hour, day and week rows of EngagementBucket in the same transaction
+-- (see api/backend/analytics/engagement.py), and the growth route reads
+-- only the buckets. Weeks start on Monday.
+USE Clueless;
+
+CREATE TABLE IF NOT EXISTS EngagementEvent (
+    EventID BIGINT AUTO_INCREMENT PRIMARY KEY,
+    EventType ENUM('wishlist_add', 'closet_add', 'wear', 'view') NOT NULL,
+    ClothingItemID INT NOT NULL,
+    CustomerID INT,
+    OccurredAt DATETIME NOT NULL,
+    INDEX idx_event_time (OccurredAt),
+    FOREIGN KEY (ClothingItemID) REFERENCES ClothingItem(ItemID),
+    FOREIGN KEY (CustomerID) REFERENCES Customer(CustomerID)
+);
+
+CREATE TABLE IF NOT EXISTS EngagementBucket (
+    Granularity ENUM('hour', 'day', 'week') NOT NULL,
+    BucketStart DATETIME NOT NULL,
+    ClothingItemID INT NOT NULL,
+    EventType ENUM('wishlist_add', 'closet_add', 'wear', 'view') NOT NULL,
+    EventCount INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (Granularity, BucketStart, ClothingItemID, EventType),
+    INDEX idx_bucket_item (ClothingItemID, Granularity, BucketStart),
+    FOREIGN KEY (ClothingItemID) REFERENCES ClothingItem(ItemID)
+);
@@ -0,0 +1,18 @@
+-- V005: parameter history for the example regression in api/backend/ml_models/model01.py
+--
+-- beta_vals is the JSON list [intercept, beta_1, beta_2]. Since V006
+-- trained parameters live in the model registry (ModelArtifact and
+-- ActiveModel); the API reads this table only once, when warm_up()
+-- imports the newest row as the first registered model01 version.
+USE Clueless;
+
+CREATE TABLE IF NOT EXISTS model1_params (
+    sequence_number INT AUTO_INCREMENT PRIMARY KEY,
+    beta_vals VARCHAR(255) NOT NULL,
+    CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- starting parameters so /prediction works before the first training run
+INSERT INTO model1_params (beta_vals)
+SELECT '[0.124, 0.0012, 0.933]'
+WHERE NOT EXISTS (SELECT 1 FROM model1_params);
@@ -0,0 +1,28 @@
+-- V006: model artifact registry (see api/backend/ml_models/registry.py)
+--
+-- The artifacts themselves are .npy files under the API's MODEL_DIR,
+-- one per (ModelName, Version); these tables hold their metadata and
+-- which version each model serves. Promoting or rolling back is a
+-- single-row write to ActiveModel, so every API worker switches to the
+-- new version at once the next time it probes the table.
+USE Clueless;
+
+CREATE TABLE IF NOT EXISTS ModelArtifact (
+    ModelName VARCHAR(50) NOT NULL,
+    Version INT NOT NULL,
+    Path VARCHAR(255) NOT NULL,
+    Sha256 CHAR(64) NOT NULL,
+    DType VARCHAR(20) NOT NULL,
+    Shape VARCHAR(100) NOT NULL,
+    Metrics TEXT,
+    CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (ModelName, Version)
+);
+
+CREATE TABLE IF NOT EXISTS ActiveModel (
+    ModelName VARCHAR(50) PRIMARY KEY,
+    Version INT NOT NULL,
+    PreviousVersion INT,
+    PromotedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (ModelName, Version) REFERENCES ModelArtifact(ModelName, Version)
+);
@@ -0,0 +1,22 @@
+-- V007: history of the popularity scoring job (api/backend/analytics/popularity.py)
+--
+-- The job rewrites ClothingItem.PopularityPercentage,
+-- Business.PopularityPercentage and Aesthetic.PopularityPercent from
+-- closet ownership, wears, wishlist entries and units sold. Each run
+-- adds a row here. An incremental run rescores only the items with
+-- engagement events since the previous run's StartedAt, on the scales
+-- of the last full run (Scales, JSON).
+USE Clueless;
+
+CREATE TABLE IF NOT EXISTS PopularityRun (
+    RunID INT AUTO_INCREMENT PRIMARY KEY,
+    Mode ENUM('full', 'incremental') NOT NULL,
+    StartedAt DATETIME NOT NULL,
+    FinishedAt DATETIME NOT NULL,
+    ItemsScored INT NOT NULL DEFAULT 0,
+    ItemsUpdated INT NOT NULL DEFAULT 0,
+    BusinessesUpdated INT NOT NULL DEFAULT 0,
+    AestheticsUpdated INT NOT NULL DEFAULT 0,
+    Scales TEXT NOT NULL,
+    INDEX idx_popularity_mode (Mode, RunID)
+);
@@ -0,0 +1,18 @@
+-- V008: items and businesses whose popularity signals changed since the
+-- last popularity run (api/backend/analytics/popularity.py)
+--
+-- Every route that changes a signal (closet add, wear, wishlist add or
+-- removal, stocking or unstocking an item) marks the item, and for
+-- inventory changes the business, in the same transaction. An
+-- incremental run rescores the marked rows and then deletes the marks
+-- older than its start. Businesses are marked directly because an
+-- unstocked item no longer links back to the business that sold it.
+USE Clueless;
+
+CREATE TABLE IF NOT EXISTS PopularityDirty (
+    Kind ENUM('item', 'business') NOT NULL,
+    ID INT NOT NULL,
+    MarkedAt DATETIME NOT NULL,
+    PRIMARY KEY (Kind, ID),
+    INDEX idx_dirty_marked (MarkedAt)
+);